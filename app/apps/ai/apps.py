@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class AiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.ai"
+
+    def ready(self):
+        from apps.ai.models import FoodResult
+        from apps.utils.pagination import track_counts
+
+        # 목록 개수 캐시 무효화
+        track_counts(FoodResult)
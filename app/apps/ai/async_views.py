@@ -0,0 +1,215 @@
+from apps.ai.resumable import (
+    Generation,
+    parse_last_event_id,
+    replay_async,
+    sse_response,
+    use_resumable,
+)
+from apps.ai.serializers import (
+    FoodRequestSerializer,
+    HealthRequestSerializer,
+    RecipeRequestSerializer,
+)
+from apps.ai.service import (
+    stream_food_prompt,
+    stream_health_prompt,
+    stream_recipe_prompt,
+)
+from apps.ai.stream_parser import use_typed_events
+from apps.ai.utils import stream_response_async, validate_ingredients
+from apps.log.views import get_client_ip
+from apps.utils.authentication import (
+    IsAuthenticatedJWTAuthentication,
+    RedisJWTAuthentication,
+)
+from apps.utils.throttle import BurstRateThrottle, SustainedRateThrottle
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import status
+from rest_framework.exceptions import APIException, PermissionDenied, Throttled
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+
+
+class AsyncAPIView(View):
+    """
+    ASGI 전용 비동기 뷰 베이스
+
+    DRF APIView는 동기 뷰라 스트림이 끝날 때까지 워커를 점유하므로,
+    인증/권한/쓰로틀은 DRF 클래스를 그대로 쓰되 응답은 비동기로 처리합니다.
+    """
+
+    authentication_classes = [RedisJWTAuthentication]
+    permission_classes = [IsAuthenticatedJWTAuthentication]
+    throttle_classes = []
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # JWT 인증 API이므로 CSRF 검사 제외 (APIView와 동일)
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    def initial(self, request):
+        """DRF 인증/권한/쓰로틀 검사 후 DRF Request 반환 (DB/Redis 접근 - 동기)"""
+        drf_request = Request(
+            request,
+            parsers=[JSONParser()],
+            authenticators=[auth() for auth in self.authentication_classes],
+        )
+        for permission in self.permission_classes:
+            if not permission().has_permission(drf_request, self):
+                raise PermissionDenied()
+        for throttle_class in self.throttle_classes:
+            throttle = throttle_class()
+            if not throttle.allow_request(drf_request, self):
+                raise Throttled(throttle.wait())
+        # 본문 파싱도 여기서 끝내 둠
+        drf_request.data
+        return drf_request
+
+    async def authenticate(self, request):
+        """
+        (DRF Request, 에러 응답) - 인증/권한/쓰로틀 검사에 실패하면 DRF Request 는 None
+        """
+        try:
+            return await sync_to_async(self.initial)(request), None
+        except APIException as e:
+            return None, JsonResponse(
+                {"detail": str(e.detail), "code": e.get_codes()},
+                status=e.status_code,
+            )
+
+
+class AsyncStreamingRecommendationView(AsyncAPIView):
+    """ASGI 전용 스트리밍 추천 베이스 뷰 (검증은 DRF 시리얼라이저 사용)"""
+
+    serializer_class = None
+    throttle_classes = [SustainedRateThrottle, BurstRateThrottle]
+
+    async def post(self, request):
+        drf_request, error_response = await self.authenticate(request)
+        if error_response is not None:
+            return error_response
+
+        serializer = self.serializer_class(data=drf_request.data)
+        if not serializer.is_valid():
+            return JsonResponse(
+                {"error": serializer.errors, "code": "invalid_data"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        validated_data = serializer.validated_data
+        error_response = await self.validate(validated_data, drf_request.user)
+        if error_response is not None:
+            return error_response
+
+        # AI 요청 데이터 DB저장
+        ai_request = await sync_to_async(serializer.save)(user=drf_request.user)
+
+        frames = stream_response_async(
+            self.get_prompt(validated_data),
+            drf_request.user,
+            get_client_ip(request),
+            ai_request,
+            typed=use_typed_events(request),
+        )
+        # ?resumable=true 면 Redis Stream 에 기록하며 전송 (끊겨도 생성은 계속 기록)
+        if not use_resumable(request):
+            return sse_response(frames)
+        generation = await sync_to_async(Generation.start)(drf_request.user)
+        return sse_response(generation.record_async(frames), generation)
+
+    async def validate(self, validated_data, user):
+        """추가 검증 (실패 시 에러 응답 반환)"""
+        return None
+
+    def get_prompt(self, validated_data):
+        raise NotImplementedError
+
+
+class AsyncRecipeRecommendationView(AsyncStreamingRecommendationView):
+    """보유 식재료 기반 요리 추천 (비동기 스트리밍)"""
+
+    serializer_class = RecipeRequestSerializer
+
+    async def validate(self, validated_data, user):
+        is_valid, invalid_items = await sync_to_async(validate_ingredients)(
+            validated_data.get("ingredients", []), user
+        )
+        if not is_valid:
+            return JsonResponse(
+                {
+                    "error": "저는 식재료만 인식할 수 있어요🥲 식재료만 입력해주세요!",
+                    "invalid_items": invalid_items,
+                    "code": "invalid_ingredients",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return None
+
+    def get_prompt(self, validated_data):
+        return stream_recipe_prompt(validated_data)
+
+
+class AsyncHealthBasedRecommendationView(AsyncStreamingRecommendationView):
+    """건강 목표 기반 식단 추천 (비동기 스트리밍)"""
+
+    serializer_class = HealthRequestSerializer
+
+    def get_prompt(self, validated_data):
+        return stream_health_prompt(
+            validated_data,
+            validated_data.get("allergies", []),
+            validated_data.get("disliked_foods", []),
+        )
+
+
+class AsyncFoodRecommendationView(AsyncStreamingRecommendationView):
+    """사용자 선호도 기반 음식 추천 (비동기 스트리밍)"""
+
+    serializer_class = FoodRequestSerializer
+
+    def get_prompt(self, validated_data):
+        return stream_food_prompt(
+            validated_data.get("cuisine_type", ""),
+            validated_data.get("food_base", ""),
+            validated_data.get("taste", ""),
+            validated_data.get("dietary_type", ""),
+            validated_data.get("last_meal", ""),
+        )
+
+
+class AsyncStreamResumeView(AsyncAPIView):
+    """
+    끊긴 스트리밍 응답 이어받기 (?resumable=true 로 시작한 스트림)
+
+    `Last-Event-ID` 헤더(또는 `?last_event_id=`)의 이벤트 이후 프레임을 다시 보내고,
+    생성이 진행 중이면 이어서 전송합니다. (Gemini 를 다시 호출하지 않음)
+    새 프레임을 기다리는 동안 워커를 점유하지 않도록 비동기로 처리합니다.
+    """
+
+    async def get(self, request, generation_id):
+        drf_request, error_response = await self.authenticate(request)
+        if error_response is not None:
+            return error_response
+
+        owner = await sync_to_async(Generation.get_owner)(generation_id)
+        if owner != str(drf_request.user.pk):
+            return JsonResponse(
+                {"error": "스트림이 없거나 만료되었습니다.", "code": "not_found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        try:
+            after = parse_last_event_id(
+                request.headers.get("Last-Event-ID")
+                or request.GET.get("last_event_id"),
+                generation_id,
+            )
+        except ValueError:
+            return JsonResponse(
+                {"error": "잘못된 Last-Event-ID 입니다.", "code": "invalid_data"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return sse_response(replay_async(generation_id, after))
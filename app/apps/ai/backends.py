@@ -0,0 +1,367 @@
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+
+import google.generativeai as genai
+from django.conf import settings
+from django.utils.module_loading import import_string
+from google.api_core import exceptions as google_exceptions
+
+logger = logging.getLogger(__name__)
+
+# Google Gemini API 설정
+genai.configure(api_key=settings.GEMINI_API_KEY)
+model = genai.GenerativeModel("gemini-1.5-flash")
+
+# settings.AI_LLM_BACKEND 별칭 (그 외 값은 클래스 경로로 취급)
+BACKENDS = {
+    "gemini": "apps.ai.backends.GeminiBackend",
+    "stub": "apps.ai.stub.StubBackend",
+    "record": "apps.ai.recording.RecordingBackend",
+    "replay": "apps.ai.recording.ReplayBackend",
+}
+
+
+class LLMBackend:
+    """
+    LLM 백엔드 인터페이스
+
+    응답/청크는 Gemini 응답처럼 .text 와 (선택) .usage_metadata 를 가진 객체입니다.
+    timeout 은 시도 1회의 최대 시간(초)입니다. (스트리밍은 첫 청크까지의 시간)
+    """
+
+    def generate(self, prompt, timeout):
+        raise NotImplementedError
+
+    def stream(self, prompt, timeout):
+        """청크 이터레이터 반환"""
+        raise NotImplementedError
+
+    async def stream_async(self, prompt, timeout):
+        """청크 비동기 이터레이터 (async generator)"""
+        raise NotImplementedError
+        yield
+
+
+def get_stream_option(name, default):
+    return getattr(settings, f"AI_CLIENT_STREAM_{name}", default)
+
+
+class GeminiBackend(LLMBackend):
+    """
+    실제 Gemini API 호출 (시도별 timeout 적용)
+
+    스트리밍은 gRPC 호출 전체에 AI_CLIENT_STREAM_BUDGET 을 주고, 첫 청크는 timeout,
+    이후 청크 사이는 AI_CLIENT_STREAM_IDLE_TIMEOUT 안에 도착해야 합니다.
+    (생성이 길어도 청크가 계속 오는 스트림은 끊지 않음)
+    """
+
+    def generate(self, prompt, timeout):
+        return model.generate_content(prompt, request_options={"timeout": timeout})
+
+    def stream(self, prompt, timeout):
+        # SDK 는 첫 청크를 받은 뒤 응답을 반환하므로 첫 청크 대기는 별도 스레드에서 제한
+        response = wait_first_chunk(
+            lambda: model.generate_content(
+                prompt,
+                stream=True,
+                request_options={"timeout": get_stream_option("BUDGET", 120)},
+            ),
+            timeout,
+        )
+        upstream = register_upstream(response)
+        watchdog = ChunkWatchdog(lambda: close_upstream(response))
+        chunks = iter(response)
+        try:
+            while True:
+                # 첫 청크는 응답에 이미 들어 있음
+                watchdog.arm(get_stream_option("IDLE_TIMEOUT", 15))
+                try:
+                    chunk = next(chunks)
+                except StopIteration:
+                    break
+                except Exception as e:
+                    if watchdog.expired:
+                        raise google_exceptions.DeadlineExceeded(
+                            "stream idle timeout"
+                        ) from e
+                    if upstream is not None and upstream.cancelled:
+                        raise UpstreamCancelled() from e
+                    raise
+                finally:
+                    watchdog.disarm()
+                yield chunk
+            if watchdog.expired:
+                raise google_exceptions.DeadlineExceeded("stream idle timeout")
+            if upstream is not None and upstream.cancelled:
+                raise UpstreamCancelled()
+        finally:
+            watchdog.stop()
+            # 중간에 닫히면(클라이언트 연결 끊김) 남은 생성을 받지 않도록 스트림 종료
+            close_upstream(response)
+
+    async def stream_async(self, prompt, timeout):
+        try:
+            response = await asyncio.wait_for(
+                model.generate_content_async(
+                    prompt,
+                    stream=True,
+                    request_options={"timeout": get_stream_option("BUDGET", 120)},
+                ),
+                timeout,
+            )
+        except asyncio.TimeoutError as e:
+            raise google_exceptions.DeadlineExceeded("first chunk timeout") from e
+        chunks = aiter(response)
+        try:
+            while True:
+                try:
+                    chunk = await asyncio.wait_for(
+                        anext(chunks), get_stream_option("IDLE_TIMEOUT", 15)
+                    )
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError as e:
+                    raise google_exceptions.DeadlineExceeded(
+                        "stream idle timeout"
+                    ) from e
+                yield chunk
+        finally:
+            close_upstream(response)
+
+
+def wait_first_chunk(open_stream, timeout):
+    """
+    스트리밍 응답을 열고 첫 청크까지 timeout 초만 기다림
+
+    넘기면 DeadlineExceeded (재시도 대상)를 내고, 늦게 열린 응답은 바로 닫습니다.
+    """
+    done = threading.Event()
+    lock = threading.Lock()
+    box = {}
+
+    def run():
+        try:
+            box["response"] = open_stream()
+        except Exception as e:
+            box["error"] = e
+        with lock:
+            abandoned = box.get("abandoned")
+            done.set()
+        if abandoned and "response" in box:
+            close_upstream(box["response"])
+
+    threading.Thread(target=run, daemon=True).start()
+    done.wait(timeout)
+    with lock:
+        if not done.is_set():
+            box["abandoned"] = True
+            raise google_exceptions.DeadlineExceeded("first chunk timeout")
+    if "error" in box:
+        raise box["error"]
+    return box["response"]
+
+
+class ChunkWatchdog:
+    """
+    청크를 기다리는 동안(arm ~ disarm)만 시간을 재고, 넘기면 on_timeout 호출
+
+    gRPC deadline 은 스트림 전체에 걸리므로 청크 사이 대기 시간은 여기서 제한합니다.
+    """
+
+    def __init__(self, on_timeout):
+        self.on_timeout = on_timeout
+        self.expired = False
+        self._deadline = None
+        self._stopped = False
+        self._cond = threading.Condition()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def arm(self, seconds):
+        with self._cond:
+            self._deadline = time.monotonic() + seconds
+            self._cond.notify()
+
+    def disarm(self):
+        with self._cond:
+            self._deadline = None
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+
+    def _run(self):
+        with self._cond:
+            while not self._stopped:
+                if self._deadline is None:
+                    self._cond.wait()
+                    continue
+                remaining = self._deadline - time.monotonic()
+                if remaining > 0:
+                    self._cond.wait(remaining)
+                    continue
+                self.expired = True
+                break
+        if self.expired:
+            self.on_timeout()
+
+
+def close_upstream(response):
+    """진행 중인 Gemini 스트리밍 응답 닫기 (gRPC 스트림은 cancel, 제너레이터는 close)"""
+    for target in (getattr(response, "_iterator", None), response):
+        for name in ("cancel", "close"):
+            method = getattr(target, name, None)
+            if callable(method):
+                method()
+                return
+
+
+class UpstreamCancelled(Exception):
+    """소비하는 쪽이 멈춰 업스트림 스트림을 닫음 (오류/재시도 대상 아님)"""
+
+
+# 읽기 스레드에서 열린 업스트림 응답을 등록할 UpstreamCancel (UpstreamCancel.bind)
+_upstream_cancel = ContextVar("ai_upstream_cancel", default=None)
+
+
+class UpstreamCancel:
+    """
+    다른 스레드에서 업스트림 스트리밍 응답을 바로 닫기 위한 등록 (paced 의 읽기 스레드용)
+
+    청크를 기다리며 막혀 있는 스레드의 제너레이터는 다른 스레드에서 닫을 수 없으므로,
+    백엔드가 연 응답을 등록해 두고 소비하는 쪽이 cancel() 로 gRPC 스트림을 직접 닫습니다.
+    guard 가 하나라도 False 면 닫지 않습니다. (같은 스트림을 읽는 다른 요청이 있는 경우 등)
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self._responses = []
+        self._guards = []
+        self._lock = threading.Lock()
+
+    def bind(self):
+        """현재 스레드(컨텍스트)에서 열리는 업스트림 응답을 이 객체에 등록"""
+        _upstream_cancel.set(self)
+
+    def add_response(self, response):
+        with self._lock:
+            self._responses.append(response)
+
+    def add_guard(self, guard):
+        with self._lock:
+            self._guards.append(guard)
+
+    def cancel(self):
+        """등록된 응답을 닫음 (닫았으면 True)"""
+        with self._lock:
+            if not self._responses or not all(guard() for guard in self._guards):
+                return False
+            self.cancelled = True
+            responses = list(self._responses)
+        for response in responses:
+            try:
+                close_upstream(response)
+            except Exception:
+                logger.warning("업스트림 스트림 닫기 실패", exc_info=True)
+        return True
+
+
+def register_upstream(response):
+    """열린 업스트림 응답 등록 (UpstreamCancel 이 없으면 None)"""
+    upstream = _upstream_cancel.get()
+    if upstream is not None:
+        upstream.add_response(response)
+    return upstream
+
+
+def guard_upstream(guard):
+    """guard() 가 False 인 동안 UpstreamCancel.cancel() 이 응답을 닫지 않도록 함"""
+    upstream = _upstream_cancel.get()
+    if upstream is not None:
+        upstream.add_guard(guard)
+
+
+class TextResponse:
+    """가짜/스텁 백엔드 응답"""
+
+    def __init__(self, text, usage_metadata=None):
+        self.text = text
+        self.usage_metadata = usage_metadata
+
+
+class FakeBackend(LLMBackend):
+    """
+    테스트용 가짜 백엔드
+
+    outcomes 항목을 호출 순서대로 재현합니다.
+    - 문자열: 응답 텍스트
+    - 예외 인스턴스: 해당 예외 발생
+    - (지연 초, 항목): 지연 후 처리 (timeout 보다 길면 DeadlineExceeded)
+    outcomes 를 다 쓰면 default 응답을 반환합니다.
+    """
+
+    def __init__(self, outcomes=(), default="{}", chunk_size=20):
+        self.outcomes = deque(outcomes)
+        self.default = default
+        self.chunk_size = chunk_size
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def _next(self):
+        with self._lock:
+            self.calls += 1
+            outcome = self.outcomes.popleft() if self.outcomes else self.default
+        if isinstance(outcome, tuple):
+            return outcome
+        return 0, outcome
+
+    def _resolve(self, outcome):
+        if isinstance(outcome, BaseException):
+            raise outcome
+        return outcome
+
+    def _chunks(self, text):
+        return [
+            TextResponse(text[i : i + self.chunk_size])
+            for i in range(0, len(text), self.chunk_size)
+        ]
+
+    def generate(self, prompt, timeout):
+        delay, outcome = self._next()
+        time.sleep(min(delay, timeout))
+        if delay > timeout:
+            raise google_exceptions.DeadlineExceeded("fake timeout")
+        return TextResponse(self._resolve(outcome))
+
+    def stream(self, prompt, timeout):
+        delay, outcome = self._next()
+        time.sleep(min(delay, timeout))
+        if delay > timeout:
+            raise google_exceptions.DeadlineExceeded("fake timeout")
+        return iter(self._chunks(self._resolve(outcome)))
+
+    async def stream_async(self, prompt, timeout):
+        delay, outcome = self._next()
+        await asyncio.sleep(min(delay, timeout))
+        if delay > timeout:
+            raise google_exceptions.DeadlineExceeded("fake timeout")
+        for chunk in self._chunks(self._resolve(outcome)):
+            yield chunk
+
+
+_backends = {}
+_backends_lock = threading.Lock()
+
+
+def get_backend(name=None):
+    """settings.AI_LLM_BACKEND 에 해당하는 백엔드 (이름별로 한 번만 생성)"""
+    name = name or getattr(settings, "AI_LLM_BACKEND", "gemini")
+    if name not in _backends:
+        with _backends_lock:
+            if name not in _backends:
+                _backends[name] = import_string(BACKENDS.get(name, name))()
+    return _backends[name]
@@ -0,0 +1,163 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from apps.ai.client import AIUnavailableError
+from apps.ai.jobs import REQUEST_MODELS
+from apps.ai.pool import take_food
+from apps.ai.usage import collect_usage
+from apps.ai.utils import (
+    AIResponseParseError,
+    generate_recommendation,
+    save_ai_results,
+    validate_ingredients,
+)
+from django.conf import settings
+from django.db import transaction
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_max_items():
+    return getattr(settings, "AI_BATCH_MAX_ITEMS", 10)
+
+
+def get_executor():
+    """배치 항목 동시 생성용 공유 스레드 풀"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=getattr(settings, "AI_BATCH_WORKERS", 4),
+                    thread_name_prefix="ai-batch",
+                )
+    return _executor
+
+
+def error_item(index, error, code, **extra):
+    return {"index": index, "success": False, "error": error, "code": code, **extra}
+
+
+def validate_items(items, user):
+    """
+    항목별 요청 데이터 검증
+
+    Returns:
+        tuple: ([(index, 요청 타입, validated_data)], {index: 오류 응답})
+    """
+    valid, errors = [], {}
+    for index, item in enumerate(items):
+        request_type = item.get("type") if isinstance(item, dict) else None
+        if request_type not in REQUEST_MODELS:
+            errors[index] = error_item(
+                index, "지원하지 않는 타입 요청 입니다", "no_type"
+            )
+            continue
+        serializer = REQUEST_MODELS[request_type][1](data=item.get("data") or {})
+        if not serializer.is_valid():
+            errors[index] = error_item(index, serializer.errors, "invalid_data")
+            continue
+        valid.append((index, request_type, serializer.validated_data))
+
+    recipes = [entry for entry in valid if entry[1] == "RECIPE"]
+    if len(recipes) > 1:
+        # 처음 보는 재료를 한 번에 판정해 저장해 두고 항목별로는 저장된 판정 사용
+        validate_ingredients(
+            [name for _, _, data in recipes for name in data["ingredients"]], user
+        )
+    for index, _, data in recipes:
+        is_valid, invalid_items = validate_ingredients(data["ingredients"], user)
+        if not is_valid:
+            errors[index] = error_item(
+                index,
+                "저는 식재료만 인식할 수 있어요🥲 식재료만 입력해주세요!",
+                "invalid_ingredients",
+                invalid_items=invalid_items,
+            )
+    return [entry for entry in valid if entry[0] not in errors], errors
+
+
+def generate_item(request_type, validated_data, user, use_cache):
+    """
+    항목 1건 생성 (스레드 풀에서 실행, 예외는 결과로 반환)
+
+    선택지 조합 음식 추천은 단건 요청과 같이 풀에서 먼저 꺼냅니다.
+    (같은 항목 여러 개가 캐시/single-flight 로 합쳐져 같은 음식만 나오지 않도록)
+    """
+    try:
+        with collect_usage() as usage:
+            data = None
+            if request_type == "FOOD" and use_cache:
+                data = take_food(validated_data)
+            if data is None:
+                data = generate_recommendation(
+                    request_type, validated_data, use_cache=use_cache, user=user
+                )
+    except Exception as e:
+        return None, None, e
+    return data, usage, None
+
+
+def run_batch(items, user, ip_address, use_cache=True):
+    """
+    여러 추천 요청을 한 번에 처리합니다.
+
+    - 요청 데이터는 항목별로 검증하고 유효한 요청만 타입별 bulk insert
+    - Gemini 호출은 스레드 풀에서 동시에 실행 (응답 캐시/single-flight 그대로 적용)
+    - 결과(FoodResult)와 활동 로그도 한 번에 저장
+
+    Returns:
+        list: 입력 순서대로 항목별 결과 또는 오류
+    """
+    valid, errors = validate_items(items, user)
+
+    requests = {}
+    with transaction.atomic():
+        for request_type, (request_model, _) in REQUEST_MODELS.items():
+            entries = [entry for entry in valid if entry[1] == request_type]
+            created = request_model.objects.bulk_create(
+                [request_model(user=user, **data) for _, _, data in entries]
+            )
+            requests.update(zip((index for index, _, _ in entries), created))
+
+    outcomes = list(
+        get_executor().map(
+            lambda entry: generate_item(entry[1], entry[2], user, use_cache), valid
+        )
+    )
+
+    succeeded = []
+    for (index, request_type, _), (data, usage, error) in zip(valid, outcomes):
+        if isinstance(error, AIResponseParseError):
+            errors[index] = error_item(
+                index,
+                "AI 응답을 파싱할 수 없습니다.",
+                "internal_error",
+                raw_response=error.raw_response,
+            )
+        elif isinstance(error, AIUnavailableError):
+            errors[index] = error_item(index, str(error), error.code)
+        elif error is not None:
+            errors[index] = error_item(index, str(error), "internal_error")
+        else:
+            succeeded.append((index, request_type, data, usage))
+
+    with transaction.atomic():
+        results = save_ai_results(
+            user,
+            ip_address,
+            [(requests[index], data, usage) for index, _, data, usage in succeeded],
+        )
+
+    responses = dict(errors)
+    for (index, request_type, data, _), result in zip(succeeded, results):
+        responses[index] = {
+            "index": index,
+            "success": True,
+            "type": request_type,
+            "request_id": str(requests[index].id),
+            "result_id": str(result.id),
+            "result": data,
+        }
+    return [responses[index] for index in range(len(items))]
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import time
+
+from apps.utils import metrics
+from django.conf import settings
+from django.core.cache import cache
+
+# 프롬프트 형식이 바뀌면 올려서 이전 캐시를 무효화
+CACHE_VERSION = 1
+
+DEFAULT_TTL = {"RECIPE": 60 * 60 * 6, "HEALTH": 60 * 60, "FOOD": 60 * 30}
+
+
+def use_response_cache(request):
+    """?cache=false 로 요청 단위 캐시 우회"""
+    return request.query_params.get("cache", "true").lower() != "false"
+
+
+def get_ttl(request_type):
+    ttl = getattr(settings, "AI_RESPONSE_CACHE_TTL", DEFAULT_TTL)
+    return ttl.get(request_type, 0)
+
+
+def normalize_value(value):
+    """같은 의미의 입력이 같은 키가 되도록 정규화"""
+    if isinstance(value, str):
+        return " ".join(value.split()).lower()
+    if isinstance(value, (list, tuple)):
+        # 재료/알레르기 목록은 순서와 중복이 의미 없음
+        return sorted({normalize_value(item) for item in value if item})
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    return value
+
+
+def make_cache_key(request_type, validated_data):
+    canonical = json.dumps(
+        {key: normalize_value(value) for key, value in validated_data.items()},
+        sort_keys=True,
+        ensure_ascii=False,
+        separators=(",", ":"),
+    )
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return f"ai:response:v{CACHE_VERSION}:{request_type}:{digest}"
+
+
+def get_or_generate(request_type, validated_data, generate, use_cache=True):
+    """
+    검증된 요청 데이터 기준으로 AI 응답을 캐시합니다.
+
+    같은 키를 다른 요청이 생성 중이면 결과가 저장될 때까지 기다리고(stampede 방지),
+    대기 시간을 넘기면 직접 생성합니다.
+
+    Args:
+        request_type: RECIPE / HEALTH / FOOD
+        validated_data: 시리얼라이저 validated_data
+        generate: 캐시 미스 시 파싱된 응답(dict)을 반환하는 함수
+        use_cache: False면 캐시를 읽지도 쓰지도 않음
+
+    Returns:
+        tuple: (응답 데이터, 캐시 히트 여부)
+    """
+    ttl = get_ttl(request_type)
+    if not use_cache or ttl <= 0:
+        metrics.incr(f"ai_cache:{request_type}:bypass")
+        return generate(), False
+
+    key = make_cache_key(request_type, validated_data)
+    data = cache.get(key)
+    if data is not None:
+        metrics.incr(f"ai_cache:{request_type}:hit")
+        return data, True
+
+    lock_key = f"{key}:lock"
+    lock_timeout = getattr(settings, "AI_RESPONSE_CACHE_LOCK_TIMEOUT", 30)
+    if not cache.add(lock_key, 1, timeout=lock_timeout):
+        data = wait_for_result(key, lock_key)
+        if data is not None:
+            metrics.incr(f"ai_cache:{request_type}:hit")
+            return data, True
+
+    try:
+        data = generate()
+        cache.set(key, data, timeout=ttl)
+    finally:
+        cache.delete(lock_key)
+
+    metrics.incr(f"ai_cache:{request_type}:miss")
+    return data, False
+
+
+def wait_for_result(key, lock_key):
+    """먼저 생성 중인 요청의 결과를 기다림 (실패/시간 초과 시 None)"""
+    wait_timeout = getattr(settings, "AI_RESPONSE_CACHE_WAIT_TIMEOUT", 15)
+    deadline = time.monotonic() + wait_timeout
+    while time.monotonic() < deadline:
+        time.sleep(0.2)
+        data = cache.get(key)
+        if data is not None:
+            return data
+        # 생성하던 요청이 실패해서 락이 풀린 경우
+        if cache.get(lock_key) is None:
+            return cache.get(key)
+    return None
+
+
+def get_cache_stats():
+    names = [
+        f"ai_cache:{request_type}:{result}"
+        for request_type in DEFAULT_TTL
+        for result in ("hit", "miss", "bypass")
+    ]
+    return metrics.get_counters(*names)
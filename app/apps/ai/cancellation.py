@@ -0,0 +1,73 @@
+from apps.ai.prompts import estimate_tokens
+from apps.utils import metrics
+
+METRIC_PREFIX = "ai_stream"
+
+
+def get_metric_name(request_type, name):
+    return f"{METRIC_PREFIX}:{request_type}:{name}"
+
+
+def record_completed(request_type, seconds, text):
+    """끝까지 받은 스트림의 출력 토큰/시간 누적 (중단 시 절약량 추정 기준)"""
+    metrics.incr(get_metric_name(request_type, "completed"))
+    metrics.incr(
+        get_metric_name(request_type, "completed_tokens"), estimate_tokens(text)
+    )
+    metrics.incr(get_metric_name(request_type, "completed_ms"), round(seconds * 1000))
+
+
+def get_expected(request_type):
+    """완료된 스트림 평균 (출력 토큰, 소요 ms) - 기록이 없으면 None"""
+    counters = metrics.get_counters(
+        *(
+            get_metric_name(request_type, name)
+            for name in ("completed", "completed_tokens", "completed_ms")
+        )
+    )
+    completed, tokens, ms = counters.values()
+    if not completed:
+        return None
+    return tokens / completed, ms / completed
+
+
+def record_aborted(request_type, seconds, text):
+    """
+    클라이언트 연결이 끊겨 생성을 중단한 스트림 기록
+
+    절약량 = 완료된 스트림 평균 - 중단 시점까지 받은 양 (토큰은 추정치)
+
+    Returns:
+        dict: {"tokens_saved", "ms_saved"}
+    """
+    expected = get_expected(request_type)
+    tokens_saved = ms_saved = 0
+    if expected is not None:
+        produced = estimate_tokens(text) if text else 0
+        tokens_saved = max(round(expected[0]) - produced, 0)
+        ms_saved = max(round(expected[1] - seconds * 1000), 0)
+
+    metrics.incr(get_metric_name(request_type, "aborted"))
+    metrics.incr(get_metric_name(request_type, "tokens_saved"), tokens_saved)
+    metrics.incr(get_metric_name(request_type, "ms_saved"), ms_saved)
+    return {"tokens_saved": tokens_saved, "ms_saved": ms_saved}
+
+
+def get_cancellation_stats():
+    """요청 타입별 스트림 완료/중단 수와 중단으로 절약한 토큰/시간(초)"""
+    stats = {}
+    for request_type in ("RECIPE", "HEALTH", "FOOD"):
+        counters = metrics.get_counters(
+            *(
+                get_metric_name(request_type, name)
+                for name in ("completed", "aborted", "tokens_saved", "ms_saved")
+            )
+        )
+        completed, aborted, tokens_saved, ms_saved = counters.values()
+        stats[request_type] = {
+            "completed": completed,
+            "aborted": aborted,
+            "tokens_saved": tokens_saved,
+            "seconds_saved": round(ms_saved / 1000, 1),
+        }
+    return stats
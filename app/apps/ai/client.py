@@ -0,0 +1,284 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from apps.ai.backends import get_backend
+from apps.utils import metrics
+from django.conf import settings
+from django.core.cache import cache
+from google.api_core import exceptions as google_exceptions
+
+# 일시적인 장애로 보고 재시도하는 오류
+RETRYABLE_ERRORS = (
+    google_exceptions.DeadlineExceeded,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.TooManyRequests,
+    ConnectionError,
+    TimeoutError,
+)
+TIMEOUT_ERRORS = (google_exceptions.DeadlineExceeded, TimeoutError)
+
+
+def get_option(name, default):
+    return getattr(settings, f"AI_CLIENT_{name}", default)
+
+
+class AIUnavailableError(Exception):
+    """Gemini를 사용할 수 없어 요청을 처리하지 못한 경우 (503 응답)"""
+
+    code = "ai_unavailable"
+    message = "AI 서비스를 일시적으로 사용할 수 없습니다. 잠시 후 다시 시도해주세요."
+
+    def __init__(self, message=None):
+        super().__init__(message or self.message)
+
+
+class AICircuitOpenError(AIUnavailableError):
+    """최근 실패가 많아 호출하지 않고 바로 실패"""
+
+    code = "ai_circuit_open"
+
+
+class AIDeadlineExceededError(AIUnavailableError):
+    """요청 시간 예산 초과"""
+
+    code = "ai_timeout"
+    message = "AI 응답 시간이 초과되었습니다. 잠시 후 다시 시도해주세요."
+
+
+class Deadline:
+    """요청 1건의 전체 시간 예산 (재시도/대기 시간 포함)"""
+
+    def __init__(self, budget):
+        self.expires_at = time.monotonic() + budget
+
+    def remaining(self):
+        return max(0.0, self.expires_at - time.monotonic())
+
+
+class CircuitBreaker:
+    """
+    워커 간 공유되는 서킷 브레이커 (Django 캐시 = Redis)
+
+    연속 실패가 threshold 에 도달하면 reset_timeout 동안 호출을 막고,
+    이후 다시 실패하면(half-open) 바로 다시 막습니다.
+    """
+
+    def __init__(self, name="gemini"):
+        self.key = f"ai:breaker:{name}"
+
+    @property
+    def threshold(self):
+        return get_option("BREAKER_THRESHOLD", 5)
+
+    @property
+    def reset_timeout(self):
+        return get_option("BREAKER_RESET", 30)
+
+    def is_open(self):
+        return cache.get(f"{self.key}:open") is not None
+
+    def record_success(self):
+        cache.delete_many([f"{self.key}:failures", f"{self.key}:half_open"])
+
+    def record_failure(self):
+        failures_key = f"{self.key}:failures"
+        cache.add(failures_key, 0, timeout=self.reset_timeout * 2)
+        failures = cache.incr(failures_key)
+        if failures >= self.threshold or cache.get(f"{self.key}:half_open"):
+            self.open()
+
+    def open(self):
+        cache.set(f"{self.key}:open", 1, timeout=self.reset_timeout)
+        # 열림이 끝난 뒤 첫 실패에 바로 다시 열리도록 표시
+        cache.set(f"{self.key}:half_open", 1, timeout=self.reset_timeout * 4)
+        cache.delete(f"{self.key}:failures")
+        metrics.incr("ai_client:breaker_open")
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_executor():
+    """hedged 요청용 공유 스레드 풀"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=get_option("HEDGE_WORKERS", 8),
+                    thread_name_prefix="ai-hedge",
+                )
+    return _executor
+
+
+class ResilientClient:
+    """
+    Gemini 호출 래퍼
+
+    - 요청 시간 예산(Deadline)에서 시도별 timeout 계산
+    - 재시도 가능한 오류는 지터를 준 지수 백오프로 제한된 횟수만 재시도
+    - 서킷 브레이커가 열려 있으면 호출 없이 AICircuitOpenError
+    - (선택) 최근 지연 p95 를 넘기면 같은 요청을 한 번 더 보내 먼저 온 응답 사용
+    """
+
+    def __init__(self, backend=None, breaker=None):
+        self.backend = backend or get_backend()
+        self.breaker = breaker or CircuitBreaker()
+        self.latencies = deque(maxlen=200)
+
+    def new_deadline(self):
+        return Deadline(get_option("REQUEST_BUDGET", 30))
+
+    def generate(self, prompt, deadline=None):
+        return self.call(
+            lambda timeout: self.hedged_generate(prompt, timeout),
+            deadline or self.new_deadline(),
+        )
+
+    def stream(self, prompt, deadline=None):
+        """첫 청크를 받기 전까지만 재시도 (이미 보낸 청크는 되돌릴 수 없음)"""
+
+        def first_chunk(timeout):
+            chunks = iter(self.backend.stream(prompt, timeout))
+            return next(chunks, None), chunks
+
+        first, chunks = self.call(first_chunk, deadline or self.new_deadline())
+        if first is None:
+            return
+        yield first
+        try:
+            yield from chunks
+        except RETRYABLE_ERRORS as e:
+            self.breaker.record_failure()
+            metrics.incr("ai_client:failure")
+            raise AIUnavailableError() from e
+
+    async def stream_async(self, prompt, deadline=None):
+        """비동기 스트리밍 (재시도 없이 서킷 브레이커와 timeout 만 적용)"""
+        if self.breaker.is_open():
+            metrics.incr("ai_client:rejected")
+            raise AICircuitOpenError()
+
+        deadline = deadline or self.new_deadline()
+        timeout = min(get_option("ATTEMPT_TIMEOUT", 20), deadline.remaining())
+        metrics.incr("ai_client:call")
+        try:
+            async for chunk in self.backend.stream_async(prompt, timeout):
+                yield chunk
+        except RETRYABLE_ERRORS as e:
+            metrics.incr("ai_client:failure")
+            self.breaker.record_failure()
+            if isinstance(e, TIMEOUT_ERRORS):
+                raise AIDeadlineExceededError() from e
+            raise AIUnavailableError() from e
+        self.breaker.record_success()
+
+    def call(self, attempt, deadline):
+        if self.breaker.is_open():
+            metrics.incr("ai_client:rejected")
+            raise AICircuitOpenError()
+
+        max_retries = get_option("MAX_RETRIES", 2)
+        for retry in range(max_retries + 1):
+            timeout = min(get_option("ATTEMPT_TIMEOUT", 20), deadline.remaining())
+            if timeout <= 0:
+                raise AIDeadlineExceededError()
+
+            metrics.incr("ai_client:call")
+            started = time.monotonic()
+            try:
+                result = attempt(timeout)
+            except RETRYABLE_ERRORS as e:
+                metrics.incr("ai_client:failure")
+                self.breaker.record_failure()
+                error_class = (
+                    AIDeadlineExceededError
+                    if isinstance(e, TIMEOUT_ERRORS)
+                    else AIUnavailableError
+                )
+                if retry == max_retries or self.breaker.is_open():
+                    raise error_class() from e
+
+                # full jitter 백오프 (예산을 넘기면 재시도하지 않음)
+                delay = random.uniform(
+                    0, get_option("RETRY_BASE_DELAY", 0.5) * 2**retry
+                )
+                if delay >= deadline.remaining():
+                    raise error_class() from e
+                metrics.incr("ai_client:retry")
+                time.sleep(delay)
+                continue
+
+            self.breaker.record_success()
+            self.latencies.append(time.monotonic() - started)
+            return result
+
+    def hedge_delay(self):
+        """최근 지연 p95 (표본이 적으면 설정값)"""
+        samples = sorted(self.latencies)
+        if len(samples) < 20:
+            return get_option("HEDGE_DELAY", 2.0)
+        return samples[int(len(samples) * 0.95) - 1]
+
+    def hedged_generate(self, prompt, timeout):
+        delay = self.hedge_delay()
+        if not get_option("HEDGE_ENABLED", False) or delay >= timeout:
+            return self.backend.generate(prompt, timeout)
+
+        executor = get_executor()
+        primary = executor.submit(self.backend.generate, prompt, timeout)
+        done, _ = wait([primary], timeout=delay)
+        if done:
+            return primary.result()
+
+        # 느린 요청은 취소할 수 없어 timeout 까지 백그라운드에서 끝남
+        metrics.incr("ai_client:hedge")
+        hedge = executor.submit(self.backend.generate, prompt, timeout - delay)
+        expires_at = time.monotonic() + timeout - delay
+        pending, error = {primary, hedge}, None
+        while pending:
+            done, pending = wait(
+                pending,
+                timeout=max(0, expires_at - time.monotonic()),
+                return_when=FIRST_COMPLETED,
+            )
+            if not done:
+                break
+            for future in done:
+                if future.exception() is None:
+                    if future is hedge:
+                        metrics.incr("ai_client:hedge_win")
+                    return future.result()
+                error = future.exception()
+        raise error or TimeoutError("hedged request timed out")
+
+
+_client = None
+
+
+def get_client():
+    """프로세스 공용 클라이언트 (지연 통계/스레드 풀 공유, 백엔드 설정이 바뀌면 새로 생성)"""
+    global _client
+    backend = get_backend()
+    if _client is None or _client.backend is not backend:
+        _client = ResilientClient(backend=backend)
+    return _client
+
+
+def get_client_stats():
+    stats = metrics.get_counters(
+        "ai_client:call",
+        "ai_client:retry",
+        "ai_client:failure",
+        "ai_client:rejected",
+        "ai_client:breaker_open",
+        "ai_client:hedge",
+        "ai_client:hedge_win",
+    )
+    stats["breaker_open"] = get_client().breaker.is_open()
+    return stats
@@ -0,0 +1,86 @@
+import json
+from functools import lru_cache
+from pathlib import Path
+
+from apps.ai.models import IngredientVerdict
+from apps.utils import metrics
+from django.conf import settings
+
+DEFAULT_DICTIONARY_PATH = (
+    Path(__file__).resolve().parent / "data/ingredient_dictionary.json"
+)
+
+
+def normalize_ingredient(name):
+    return " ".join(name.split()).lower()
+
+
+@lru_cache(maxsize=1)
+def get_dictionary():
+    """번들된 식재료 사전 (한/영) - 프로세스당 한 번만 로드"""
+    path = getattr(settings, "AI_INGREDIENT_DICTIONARY_PATH", DEFAULT_DICTIONARY_PATH)
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return frozenset(normalize_ingredient(name) for name in data.get("food", []))
+
+
+def lookup_verdicts(names):
+    """
+    사전 -> 저장된 판정 순으로 식재료 여부를 조회합니다.
+
+    Args:
+        names (list): 정규화된 식재료 이름 목록
+
+    Returns:
+        dict: {이름: 식재료 여부} (판정 기록이 없는 이름은 포함되지 않음)
+    """
+    dictionary = get_dictionary()
+    verdicts = {name: True for name in names if name in dictionary}
+    metrics.incr("ingredients:dictionary_hit", len(verdicts))
+
+    remaining = [name for name in names if name not in verdicts]
+    if remaining:
+        stored = dict(
+            IngredientVerdict.objects.filter(name__in=remaining).values_list(
+                "name", "is_food"
+            )
+        )
+        metrics.incr("ingredients:store_hit", len(stored))
+        verdicts.update(stored)
+    return verdicts
+
+
+def save_model_verdicts(verdicts):
+    """Gemini 판정 결과를 저장해 다음 요청부터 재사용 (저장 길이를 넘는 이름은 제외)"""
+    max_length = IngredientVerdict._meta.get_field("name").max_length
+    IngredientVerdict.objects.bulk_create(
+        [
+            IngredientVerdict(name=name, is_food=is_food, source="MODEL")
+            for name, is_food in verdicts.items()
+            if len(name) <= max_length
+        ],
+        ignore_conflicts=True,
+    )
+
+
+def load_dictionary_verdicts():
+    """번들 사전을 판정 저장소에 적재 (이미 있는 이름은 건너뜀)"""
+    before = IngredientVerdict.objects.count()
+    IngredientVerdict.objects.bulk_create(
+        [
+            IngredientVerdict(name=name, is_food=True, source="DICTIONARY")
+            for name in sorted(get_dictionary())
+        ],
+        ignore_conflicts=True,
+    )
+    return IngredientVerdict.objects.count() - before
+
+
+def get_ingredient_stats():
+    return metrics.get_counters(
+        "ingredients:dictionary_hit",
+        "ingredients:store_hit",
+        "ingredients:model_lookup",
+        "ingredients:model_call",
+        "ingredients:model_skipped",
+    )
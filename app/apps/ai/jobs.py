@@ -0,0 +1,230 @@
+import json
+import logging
+import uuid
+
+from apps.ai.models import FoodRequest, RecipeRequest, UserHealthRequest
+from apps.ai.serializers import (
+    FoodRequestSerializer,
+    HealthRequestSerializer,
+    RecipeRequestSerializer,
+)
+from apps.ai.usage import collect_usage
+from apps.ai.utils import AIResponseParseError, generate_recommendation, save_ai_result
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUE_KEY = "ai:jobs:queue"
+JOB_PROCESSING_KEY = "ai:jobs:processing"  # 처리 중 (워커 비정상 종료 시 복구)
+JOB_DEAD_KEY = "ai:jobs:dead"  # 재시도 횟수 초과
+JOB_TTL = 60 * 60 * 24  # 작업 상태 보관 시간
+
+PENDING = "PENDING"
+RUNNING = "RUNNING"
+SUCCESS = "SUCCESS"
+FAILED = "FAILED"
+
+# 요청 타입별 요청 모델 / 요청 데이터 시리얼라이저
+REQUEST_MODELS = {
+    "RECIPE": (RecipeRequest, RecipeRequestSerializer),
+    "HEALTH": (UserHealthRequest, HealthRequestSerializer),
+    "FOOD": (FoodRequest, FoodRequestSerializer),
+}
+
+
+def use_job_mode(request):
+    """?async=true 면 백그라운드 작업으로 처리"""
+    return request.query_params.get("async", "false").lower() == "true"
+
+
+def get_job_key(job_id):
+    return f"ai:job:{job_id}"
+
+
+def get_job(job_id):
+    return cache.get(get_job_key(job_id))
+
+
+def update_job(job_id, **fields):
+    job = get_job(job_id) or {"job_id": str(job_id)}
+    job.update(fields, updated_at=timezone.now().isoformat())
+    cache.set(get_job_key(job_id), job, timeout=JOB_TTL)
+    return job
+
+
+def get_option(name, default):
+    return getattr(settings, f"AI_JOB_QUEUE_{name}", default)
+
+
+class RedisJobQueue:
+    """
+    Redis 리스트 기반 작업 큐 (run_ai_worker 커맨드가 소비)
+
+    꺼낸 작업은 처리 중 리스트로 옮겨 두었다가 끝나면 지우므로
+    워커가 중간에 죽어도 recover() 로 다시 처리할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.conn = get_redis_connection("default")
+
+    def push(self, payload):
+        self.conn.lpush(JOB_QUEUE_KEY, json.dumps(payload))
+
+    def pop(self, timeout=5):
+        """(원본 문자열, payload) 또는 None"""
+        raw = self.conn.brpoplpush(JOB_QUEUE_KEY, JOB_PROCESSING_KEY, timeout=timeout)
+        if raw is None:
+            return None
+        return raw, json.loads(raw)
+
+    def ack(self, raw):
+        self.conn.lrem(JOB_PROCESSING_KEY, 1, raw)
+
+    def retry(self, raw, payload, error=None):
+        """
+        재시도 횟수를 늘려 다시 넣음
+
+        최대 횟수를 넘으면 dead 리스트로 옮기고 작업을 FAILED 로 표시합니다.
+        """
+        payload = {**payload, "attempts": payload.get("attempts", 0) + 1}
+        retrying = payload["attempts"] < get_option("MAX_ATTEMPTS", 3)
+        pipe = self.conn.pipeline()
+        pipe.lrem(JOB_PROCESSING_KEY, 1, raw)
+        pipe.lpush(JOB_QUEUE_KEY if retrying else JOB_DEAD_KEY, json.dumps(payload))
+        pipe.execute()
+        update_job(
+            payload["job_id"],
+            status=PENDING if retrying else FAILED,
+            attempts=payload["attempts"],
+            error=error,
+        )
+        return retrying
+
+    def recover(self):
+        """
+        처리 중으로 남은 작업을 대기열로 되돌림 (워커 시작 시)
+
+        비정상 종료도 1회 실패로 세므로 워커를 계속 죽이는 작업은 dead 리스트로 갑니다.
+        """
+        moved = 0
+        while True:
+            raw = self.conn.lindex(JOB_PROCESSING_KEY, -1)
+            if raw is None:
+                return moved
+            self.retry(raw, json.loads(raw), error="워커가 처리 중에 종료되었습니다.")
+            moved += 1
+
+    def requeue_dead(self):
+        moved = 0
+        while True:
+            raw = self.conn.rpop(JOB_DEAD_KEY)
+            if raw is None:
+                return moved
+            payload = {**json.loads(raw), "attempts": 0}
+            update_job(payload["job_id"], status=PENDING, attempts=0, error=None)
+            self.push(payload)
+            moved += 1
+
+    def stats(self):
+        return {
+            "queued": self.conn.llen(JOB_QUEUE_KEY),
+            "processing": self.conn.llen(JOB_PROCESSING_KEY),
+            "dead": self.conn.llen(JOB_DEAD_KEY),
+        }
+
+
+class LocalJobQueue:
+    """테스트/로컬용: 큐에 넣는 즉시 같은 프로세스에서 실행"""
+
+    def push(self, payload):
+        run_job(payload)
+
+    def pop(self, timeout=5):
+        return None
+
+
+def get_job_queue():
+    if getattr(settings, "AI_JOB_BACKEND", "redis") == "local":
+        return LocalJobQueue()
+    return RedisJobQueue()
+
+
+def enqueue_recommendation(request_type, ai_request, user, ip_address, use_cache=True):
+    """
+    추천 생성 작업을 등록합니다.
+
+    Returns:
+        str: 작업 ID
+    """
+    job_id = str(uuid.uuid4())
+    update_job(
+        job_id,
+        status=PENDING,
+        request_type=request_type,
+        request_id=str(ai_request.pk),
+        user_id=str(user.pk),
+        result_id=None,
+        error=None,
+        created_at=timezone.now().isoformat(),
+    )
+    get_job_queue().push(
+        {
+            "job_id": job_id,
+            "request_type": request_type,
+            "request_id": str(ai_request.pk),
+            "ip_address": ip_address,
+            "use_cache": use_cache,
+        }
+    )
+    return job_id
+
+
+def run_job(payload, raise_errors=False):
+    """
+    작업 1건 실행: Gemini 호출 후 FoodResult 저장
+
+    raise_errors 가 True 면 응답 파싱 외의 오류를 그대로 올려 워커가 재시도하게 합니다.
+    """
+    job_id = payload["job_id"]
+    request_type = payload["request_type"]
+    update_job(job_id, status=RUNNING)
+
+    try:
+        request_model, request_serializer = REQUEST_MODELS[request_type]
+        ai_request = request_model.objects.select_related("user").get(
+            pk=payload["request_id"]
+        )
+        with collect_usage() as usage:
+            response_data = generate_recommendation(
+                request_type,
+                request_serializer(ai_request).data,
+                use_cache=payload.get("use_cache", True),
+                user=ai_request.user,
+            )
+        result = save_ai_result(
+            ai_request.user,
+            payload["ip_address"],
+            ai_request,
+            response_data,
+            usage=usage,
+        )
+    except AIResponseParseError as e:
+        update_job(
+            job_id,
+            status=FAILED,
+            error="AI 응답을 파싱할 수 없습니다.",
+            raw_response=e.raw_response,
+        )
+        return None
+    except Exception as e:
+        logger.exception("AI 작업 실패: %s", job_id)
+        if raise_errors:
+            raise
+        update_job(job_id, status=FAILED, error=str(e))
+        return None
+
+    update_job(job_id, status=SUCCESS, result_id=str(result.id))
+    return result
@@ -0,0 +1,56 @@
+import time
+
+from apps.ai.models import FoodResult
+from apps.ai.nutrition import NUTRITION_FIELDS, get_nutrition
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "기존 FoodResult 에 영양 정보 컬럼(calories/protein/carbs/fat) 채우기 "
+        "(청크 단위, 중단 후 다시 실행하면 남은 행부터 이어서 처리)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--limit", type=int, help="이번 실행에서 처리할 최대 행 수")
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="청크 사이 대기 시간(초, DB 부하 조절)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size, limit = options["batch_size"], options["limit"]
+        # 응답에 영양 정보가 없는 결과는 다시 실행해도 대상에 남음 (값은 계속 null)
+        remaining = FoodResult.objects.filter(
+            response_data__isnull=False,
+            **{f"{field}__isnull": True for field in NUTRITION_FIELDS},
+        )
+        total = remaining.count()
+        self.stdout.write(f"백필 대상: {total}건")
+
+        done, filled, last_id = 0, 0, None
+        while limit is None or done < limit:
+            chunk = remaining.order_by("id")
+            if last_id is not None:
+                chunk = chunk.filter(id__gt=last_id)
+            size = batch_size if limit is None else min(batch_size, limit - done)
+            results = list(chunk.only("id", "request_type", "response_data")[:size])
+            if not results:
+                break
+
+            for result in results:
+                nutrition = get_nutrition(result.request_type, result.response_data)
+                for field, value in nutrition.items():
+                    setattr(result, field, value)
+                filled += any(value is not None for value in nutrition.values())
+            FoodResult.objects.bulk_update(results, list(NUTRITION_FIELDS))
+            done += len(results)
+            last_id = results[-1].id
+            self.stdout.write(f"{done}/{total}")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(f"완료: {done}건 (영양 정보 있음 {filled}건)")
@@ -0,0 +1,67 @@
+import time
+from collections import defaultdict
+
+from apps.ai.models import FoodResult
+from apps.ai.utils import get_request_snapshot
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "기존 FoodResult 에 요청 입력 스냅샷(request_snapshot) 채우기 "
+        "(청크 단위, 중단 후 다시 실행하면 남은 행부터 이어서 처리)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--limit", type=int, help="이번 실행에서 처리할 최대 행 수")
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="청크 사이 대기 시간(초, DB 부하 조절)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size, limit = options["batch_size"], options["limit"]
+        remaining = FoodResult.objects.filter(request_snapshot__isnull=True)
+        total = remaining.count()
+        self.stdout.write(f"백필 대상: {total}건")
+
+        done, last_id = 0, None
+        while limit is None or done < limit:
+            chunk = remaining.order_by("id")
+            if last_id is not None:
+                chunk = chunk.filter(id__gt=last_id)
+            size = batch_size if limit is None else min(batch_size, limit - done)
+            results = list(
+                chunk.only("id", "content_type_id", "object_id", "request_type")[:size]
+            )
+            if not results:
+                break
+
+            self.fill(results)
+            FoodResult.objects.bulk_update(results, ["request_snapshot"])
+            done += len(results)
+            last_id = results[-1].id
+            self.stdout.write(f"{done}/{total}")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(f"완료: {done}건")
+
+    def fill(self, results):
+        """요청 타입(content type)별로 요청 객체를 한 번에 조회해 스냅샷 생성"""
+        by_content_type = defaultdict(list)
+        for result in results:
+            by_content_type[result.content_type_id].append(result)
+
+        for content_type_id, group in by_content_type.items():
+            model = ContentType.objects.get_for_id(content_type_id).model_class()
+            requests = model.objects.in_bulk([result.object_id for result in group])
+            for result in group:
+                # 요청이 삭제된 결과는 빈 스냅샷으로 표시해 다시 처리하지 않음
+                result.request_snapshot = get_request_snapshot(
+                    result.request_type, requests.get(result.object_id)
+                )
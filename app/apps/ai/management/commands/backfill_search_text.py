@@ -0,0 +1,53 @@
+import time
+
+from apps.ai.models import FoodResult
+from apps.ai.search import get_search_text
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = (
+        "기존 FoodResult 에 검색용 텍스트(search_text) 채우기 "
+        "(청크 단위, 중단 후 다시 실행하면 남은 행부터 이어서 처리)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument("--limit", type=int, help="이번 실행에서 처리할 최대 행 수")
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="청크 사이 대기 시간(초, DB 부하 조절)",
+        )
+
+    def handle(self, *args, **options):
+        batch_size, limit = options["batch_size"], options["limit"]
+        remaining = FoodResult.objects.filter(
+            search_text="", response_data__isnull=False
+        )
+        total = remaining.count()
+        self.stdout.write(f"백필 대상: {total}건")
+
+        done, last_id = 0, None
+        while limit is None or done < limit:
+            chunk = remaining.order_by("id")
+            if last_id is not None:
+                chunk = chunk.filter(id__gt=last_id)
+            size = batch_size if limit is None else min(batch_size, limit - done)
+            results = list(chunk.only("id", "response_data", "request_snapshot")[:size])
+            if not results:
+                break
+
+            for result in results:
+                result.search_text = get_search_text(
+                    result.response_data, result.request_snapshot
+                )
+            FoodResult.objects.bulk_update(results, ["search_text"])
+            done += len(results)
+            last_id = results[-1].id
+            self.stdout.write(f"{done}/{total}")
+            if options["sleep"]:
+                time.sleep(options["sleep"])
+
+        self.stdout.write(f"완료: {done}건")
@@ -0,0 +1,87 @@
+import time
+
+from apps.ai.recording import STREAM, load_corpus
+from apps.ai.utils import REQUEST_TYPE_MAP, stream_response
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "녹화된 Gemini 스트리밍 응답으로 stream_response(파싱 + 결과 저장) 처리량 측정 "
+        "(DB 변경은 마지막에 롤백)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--corpus", help="녹화 디렉터리 (기본: AI_RECORD_DIR)")
+        parser.add_argument(
+            "--speed",
+            type=float,
+            default=0,
+            help="재생 속도 (1 = 녹화 당시 속도, 0 = 지연 없이 처리 비용만 측정)",
+        )
+        parser.add_argument("--repeat", type=int, default=1)
+        parser.add_argument("--type", choices=["RECIPE", "HEALTH", "FOOD"])
+
+    def handle(self, *args, **options):
+        records = [
+            record
+            for record in load_corpus(options["corpus"])
+            if record["mode"] == STREAM
+            and record["request_type"] != "INGREDIENT"
+            and options["type"] in (None, record["request_type"])
+        ]
+        if not records:
+            raise CommandError("측정할 스트리밍 녹화 기록이 없습니다.")
+
+        request_models = {value[0]: model for model, value in REQUEST_TYPE_MAP.items()}
+        durations, failures = [], 0
+
+        # 재생 백엔드로 교체 (같은 프롬프트의 single-flight 합치기는 측정에서 제외)
+        # 결과는 대기열 대신 바로 저장해 저장 비용까지 측정 (측정 후 롤백)
+        with (
+            override_settings(
+                AI_JOB_BACKEND="local",
+                AI_LLM_BACKEND="replay",
+                AI_RECORD_DIR=options["corpus"] or settings.AI_RECORD_DIR,
+                AI_REPLAY_SPEED=options["speed"],
+                AI_SINGLE_FLIGHT_ENABLED=False,
+            ),
+            transaction.atomic(),
+        ):
+            user = User.objects.create_user(
+                email="bench-replay@example.com", nickname="bench", password=None
+            )
+            for _ in range(options["repeat"]):
+                for record in records:
+                    request = RequestFactory().post("/")
+                    request.user = user
+                    ai_request = request_models[record["request_type"]].objects.create(
+                        user=user
+                    )
+
+                    started = time.perf_counter()
+                    frames = list(
+                        stream_response(record["prompt"], request, ai_request)
+                    )
+                    durations.append(time.perf_counter() - started)
+                    if not any(
+                        frame.startswith("data: FINAL_JSON:") for frame in frames
+                    ):
+                        failures += 1
+            transaction.set_rollback(True)
+
+        durations.sort()
+        total = sum(durations)
+        self.stdout.write(
+            f"responses={len(durations)} failures={failures} total={total:.3f}s "
+            f"throughput={len(durations) / total:.1f}/s "
+            f"p50={durations[len(durations) // 2] * 1000:.2f}ms "
+            f"p95={durations[int(len(durations) * 0.95) - 1] * 1000:.2f}ms"
+        )
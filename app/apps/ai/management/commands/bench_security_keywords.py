@@ -0,0 +1,75 @@
+import random
+import string
+import time
+
+from apps.ai.security import DEFAULT_SECURITY_KEYWORDS
+from apps.utils.aho_corasick import AhoCorasick
+from django.core.management.base import BaseCommand
+
+SAMPLE_INGREDIENTS = [
+    "계란",
+    "양파",
+    "대파",
+    "돼지고기 앞다리살",
+    "soy sauce",
+    "고춧가루",
+]
+
+
+def naive_search(items, keywords):
+    """기존 방식: 항목마다, 키워드마다 lower() 후 부분 문자열 검사"""
+    for item in items:
+        if any(keyword in item.lower() for keyword in keywords):
+            return True
+    return False
+
+
+def random_keywords(count, seed=0):
+    rng = random.Random(seed)
+    letters = string.ascii_lowercase + "가나다라마바사아자차카타파하"
+    keywords = list(DEFAULT_SECURITY_KEYWORDS)
+    while len(keywords) < count:
+        keywords.append("".join(rng.choices(letters, k=rng.randint(4, 12))))
+    return keywords[:count]
+
+
+def measure(func, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    return (time.perf_counter() - start) / repeat * 1_000_000
+
+
+class Command(BaseCommand):
+    help = "보안 키워드 사전 검사 마이크로벤치마크 (키워드 수에 따른 검사 비용)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            default="23,100,200,400,800",
+            help="비교할 키워드 개수 (쉼표 구분)",
+        )
+        parser.add_argument("--repeat", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        items = SAMPLE_INGREDIENTS * 3
+        self.stdout.write(f"ingredients={len(items)} repeat={options['repeat']}")
+        self.stdout.write(
+            f"{'keywords':>9} {'build(ms)':>10} {'naive(us)':>10} {'automaton(us)':>14}"
+        )
+
+        for size in [int(value) for value in options["sizes"].split(",")]:
+            keywords = random_keywords(size)
+
+            start = time.perf_counter()
+            matcher = AhoCorasick(keywords)
+            build_ms = (time.perf_counter() - start) * 1000
+
+            naive_us = measure(lambda: naive_search(items, keywords), options["repeat"])
+            automaton_us = measure(
+                lambda: matcher.search("\n".join(items).lower()), options["repeat"]
+            )
+
+            self.stdout.write(
+                f"{size:>9} {build_ms:>10.2f} {naive_us:>10.1f} {automaton_us:>14.1f}"
+            )
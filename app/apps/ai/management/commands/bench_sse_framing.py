@@ -0,0 +1,125 @@
+import time
+
+from apps.ai.service import stream_food_prompt, stream_recipe_prompt
+from apps.ai.sse import HEARTBEAT
+from apps.ai.utils import REQUEST_TYPE_MAP, stream_response
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.test.utils import override_settings
+
+User = get_user_model()
+
+# 요청 종류별 입력 (stub 엔진은 스트리밍 프롬프트에 대화형 설명 + ###JSON### 으로 응답)
+BENCH_DATA = {
+    "FOOD": {
+        "cuisine_type": "한식",
+        "food_base": "밥",
+        "taste": "매운맛",
+        "dietary_type": "자극적",
+        "last_meal": "라면",
+    },
+    "RECIPE": {
+        "ingredients": ["계란", "대파"],
+        "serving_size": 2,
+        "cooking_time": 20,
+        "difficulty": "쉬움",
+    },
+}
+
+
+def get_wire_bytes(payload):
+    """HTTP chunked 전송 기준 바이트 (쓰기마다 <16진수 길이>\\r\\n ... \\r\\n)"""
+    return payload + len(f"{payload:x}\r\n\r\n")
+
+
+class Command(BaseCommand):
+    help = (
+        "stub 엔진 스트림으로 SSE 프레임 합치기 전/후의 쓰기 횟수(frames/s)와 "
+        "전송 바이트 비교 (DB 변경은 마지막에 롤백)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--streams", type=int, default=10)
+        parser.add_argument("--type", choices=list(BENCH_DATA), default="FOOD")
+        parser.add_argument("--typed", action="store_true", help="event: 형식 사용")
+        parser.add_argument(
+            "--chunk-size", type=int, default=4, help="stub 청크 글자 수"
+        )
+        parser.add_argument(
+            "--interval-ms", type=float, default=5, help="stub 청크 간격"
+        )
+        parser.add_argument(
+            "--first-chunk-ms", type=float, default=0, help="stub 첫 청크 지연"
+        )
+
+    def handle(self, *args, **options):
+        engine = {
+            "FIRST_CHUNK": {"distribution": "fixed", "ms": options["first_chunk_ms"]},
+            "CHUNK_SIZE": options["chunk_size"],
+            "CHUNK_INTERVAL_MS": options["interval_ms"],
+            "ERROR_RATE": 0,
+            "SEED": 0,
+        }
+        # 합치기 끄기 = 텍스트 청크마다 바로 전송 (기존 동작)
+        modes = [("off", {"AI_SSE_COALESCE_BYTES": 0}), ("coalesced", {})]
+        request_model = {value[0]: model for model, value in REQUEST_TYPE_MAP.items()}[
+            options["type"]
+        ]
+        data = BENCH_DATA[options["type"]]
+        if options["type"] == "FOOD":
+            prompt = stream_food_prompt(**data)
+        else:
+            prompt = stream_recipe_prompt(data)
+
+        results = {}
+        for mode, overrides in modes:
+            with (
+                override_settings(
+                    AI_JOB_BACKEND="local",
+                    AI_LLM_BACKEND="stub",
+                    AI_STUB_ENGINE=engine,
+                    AI_SINGLE_FLIGHT_ENABLED=False,
+                    **overrides,
+                ),
+                transaction.atomic(),
+            ):
+                results[mode] = self.measure(prompt, request_model, options)
+                transaction.set_rollback(True)
+
+            stats = results[mode]
+            self.stdout.write(
+                f"mode={mode} streams={options['streams']} frames={stats['frames']} "
+                f"frames/s={stats['frames'] / stats['seconds']:.1f} "
+                f"bytes={stats['bytes']} wire_bytes={stats['wire_bytes']} "
+                f"heartbeats={stats['heartbeats']} total={stats['seconds']:.3f}s"
+            )
+
+        off, coalesced = results["off"], results["coalesced"]
+        self.stdout.write(
+            f"frames -{1 - coalesced['frames'] / off['frames']:.1%} "
+            f"wire_bytes -{1 - coalesced['wire_bytes'] / off['wire_bytes']:.1%}"
+        )
+
+    def measure(self, prompt, request_model, options):
+        user = User.objects.create_user(
+            email="bench-sse@example.com", nickname="bench-sse", password=None
+        )
+        query = "?events=typed" if options["typed"] else ""
+        stats = {"frames": 0, "bytes": 0, "wire_bytes": 0, "heartbeats": 0}
+        started = time.perf_counter()
+        for _ in range(options["streams"]):
+            request = RequestFactory().post("/" + query)
+            request.user = user
+            ai_request = request_model.objects.create(
+                user=user, **BENCH_DATA[options["type"]]
+            )
+            for frame in stream_response(prompt, request, ai_request):
+                size = len(frame.encode("utf-8"))
+                stats["frames"] += 1
+                stats["bytes"] += size
+                stats["wire_bytes"] += get_wire_bytes(size)
+                stats["heartbeats"] += frame == HEARTBEAT
+        stats["seconds"] = time.perf_counter() - started
+        return stats
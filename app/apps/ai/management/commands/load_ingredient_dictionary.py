@@ -0,0 +1,22 @@
+from apps.ai.ingredients import get_ingredient_stats, load_dictionary_verdicts
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "번들된 식재료 사전을 식재료 판정 저장소에 적재합니다."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--stats",
+            action="store_true",
+            help="적재 대신 Gemini 호출 생략 통계를 출력",
+        )
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            for name, value in get_ingredient_stats().items():
+                self.stdout.write(f"{name}: {value}")
+            return
+
+        created = load_dictionary_verdicts()
+        self.stdout.write(self.style.SUCCESS(f"{created}개 식재료 판정 추가"))
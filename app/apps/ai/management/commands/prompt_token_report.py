@@ -0,0 +1,52 @@
+import json
+from pathlib import Path
+from string import Template
+
+from apps.ai.prompts import estimate_tokens
+from apps.ai.service import TEMPLATES
+from django.core.management.base import BaseCommand
+
+# 압축 전 프롬프트 (들여쓰기 + 끼니별 스키마 반복, 비교 기준)
+BASELINE_PATH = Path(__file__).resolve().parents[2] / "data" / "prompts_v1.json"
+
+SAMPLE_VALUES = {
+    "ingredients": "계란, 대파, 양파, 두부",
+    "serving_size": 2,
+    "cooking_time": 20,
+    "difficulty": "쉬움",
+    "weight": 70,
+    "goal": "다이어트",
+    "exercise_frequency": "주2~3회",
+    "allergies": "땅콩",
+    "disliked_foods": "없음",
+    "cuisine_type": "한식",
+    "food_base": "밥",
+    "taste": "매운맛",
+    "dietary_type": "자극적",
+    "last_meal": "라면",
+    "names": "계란, 대파, 양파, 두부",
+}
+
+
+class Command(BaseCommand):
+    help = "프롬프트 템플릿별 예상 입력 토큰 비교 (압축 전 → 현재)"
+
+    def handle(self, *args, **options):
+        baseline = json.loads(BASELINE_PATH.read_text(encoding="utf-8"))
+        total_before = total_after = 0
+
+        self.stdout.write(f"{'template':<14} {'before':>7} {'after':>7} {'saved':>7}")
+        for name, template in TEMPLATES.items():
+            after = estimate_tokens(template.render(**SAMPLE_VALUES))
+            before = estimate_tokens(
+                Template(baseline[name]).safe_substitute(SAMPLE_VALUES)
+            )
+            total_before += before
+            total_after += after
+            self.stdout.write(
+                f"{name:<14} {before:>7} {after:>7} {1 - after / before:>7.1%}"
+            )
+        self.stdout.write(
+            f"{'total':<14} {total_before:>7} {total_after:>7} "
+            f"{1 - total_after / total_before:>7.1%}"
+        )
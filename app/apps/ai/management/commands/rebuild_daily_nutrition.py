@@ -0,0 +1,28 @@
+from apps.ai.models import DailyNutrition, FoodResult
+from apps.ai.nutrition import get_daily_totals
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+
+class Command(BaseCommand):
+    help = (
+        "FoodResult 영양 정보 컬럼으로 일일 영양 합계(DailyNutrition) 다시 만들기 "
+        "(backfill_nutrition 실행 후 사용)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="특정 사용자 id 만 다시 만들기")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        results, rows = FoodResult.objects.all(), DailyNutrition.objects.all()
+        if options["user"]:
+            results = results.filter(user_id=options["user"])
+            rows = rows.filter(user_id=options["user"])
+
+        # 사용자/일자별 합계는 DB GROUP BY 로 계산
+        totals = [DailyNutrition(**values) for values in get_daily_totals(results)]
+        with transaction.atomic():
+            rows.delete()
+            DailyNutrition.objects.bulk_create(totals, batch_size=options["batch_size"])
+        self.stdout.write(f"완료: {len(totals)}일")
@@ -0,0 +1,71 @@
+import time
+
+from apps.ai.jobs import RedisJobQueue, get_option, run_job
+from apps.utils.db import close_stale_connections
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "Redis 큐에 등록된 AI 추천 작업(?async=true)을 처리하는 워커"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="대기 중인 작업이 없으면 종료 (배치 실행용)",
+        )
+        parser.add_argument("--timeout", type=int, default=5, help="큐 대기 시간(초)")
+        parser.add_argument(
+            "--requeue-dead",
+            action="store_true",
+            help="재시도 횟수를 넘긴 작업을 대기열로 되돌리고 종료",
+        )
+        parser.add_argument("--stats", action="store_true", help="큐 상태 출력")
+
+    def handle(self, *args, **options):
+        queue = RedisJobQueue()
+        if options["stats"]:
+            self.stdout.write(str(queue.stats()))
+            return
+        if options["requeue_dead"]:
+            self.stdout.write(f"대기열로 되돌림: {queue.requeue_dead()}건")
+            return
+
+        recovered = queue.recover()
+        self.stdout.write(f"AI 작업 워커 시작 (복구 {recovered}건)")
+        try:
+            while True:
+                item = queue.pop(timeout=options["timeout"])
+                if item is None:
+                    if options["once"]:
+                        break
+                    continue
+
+                raw, payload = item
+                # 오래 대기하는 동안 끊겼거나 CONN_MAX_AGE 가 지난 연결 정리
+                close_stale_connections()
+                try:
+                    result = run_job(payload, raise_errors=True)
+                except Exception as e:
+                    # 오류가 난 연결은 다음 작업에서 다시 쓰지 않음
+                    close_stale_connections()
+                    retrying = queue.retry(raw, payload, error=str(e))
+                    self.stderr.write(
+                        f"{payload['job_id']} 실패 "
+                        f"({'재시도' if retrying else 'dead'}): {e}"
+                    )
+                    # 장애 중 재시도를 연달아 소모하지 않도록 대기
+                    time.sleep(
+                        get_option("RETRY_DELAY", 1) * (payload.get("attempts", 0) + 1)
+                    )
+                    continue
+                queue.ack(raw)
+                if not result:
+                    close_stale_connections()
+                self.stdout.write(
+                    f"{payload['job_id']} {'SUCCESS' if result else 'FAILED'}"
+                )
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write("AI 작업 워커 종료")
@@ -0,0 +1,67 @@
+import time
+
+from apps.ai.writebehind import RedisResultQueue, get_option, save_queued_result
+from apps.utils.db import close_stale_connections
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "스트리밍 응답 결과(FoodResult/활동 로그)를 대기열에서 꺼내 저장하는 워커"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="대기 중인 결과가 없으면 종료 (배치 실행용)",
+        )
+        parser.add_argument(
+            "--timeout", type=int, default=5, help="대기열 대기 시간(초)"
+        )
+        parser.add_argument(
+            "--requeue-dead",
+            action="store_true",
+            help="재시도 횟수를 넘긴 결과를 대기열로 되돌리고 종료",
+        )
+        parser.add_argument("--stats", action="store_true", help="대기열 상태 출력")
+
+    def handle(self, *args, **options):
+        queue = RedisResultQueue()
+        if options["stats"]:
+            self.stdout.write(str(queue.stats()))
+            return
+        if options["requeue_dead"]:
+            self.stdout.write(f"대기열로 되돌림: {queue.requeue_dead()}건")
+            return
+
+        recovered = queue.recover()
+        self.stdout.write(f"결과 저장 워커 시작 (복구 {recovered}건)")
+        try:
+            while True:
+                item = queue.pop(timeout=options["timeout"])
+                if item is None:
+                    if options["once"]:
+                        break
+                    continue
+
+                raw, payload = item
+                # 오래 대기하는 동안 끊겼거나 CONN_MAX_AGE 가 지난 연결 정리
+                close_stale_connections()
+                try:
+                    save_queued_result(payload)
+                except Exception as e:
+                    # 오류가 난 연결은 다음 결과에서 다시 쓰지 않음
+                    close_stale_connections()
+                    retrying = queue.retry(raw, payload)
+                    self.stderr.write(
+                        f"{payload['result_id']} 저장 실패 "
+                        f"({'재시도' if retrying else 'dead'}): {e}"
+                    )
+                    # DB 장애 중 재시도를 연달아 소모하지 않도록 대기
+                    time.sleep(get_option("RETRY_DELAY", 1) * (payload["attempts"] + 1))
+                    continue
+                queue.ack(raw)
+                self.stdout.write(f"{payload['result_id']} SAVED")
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write("결과 저장 워커 종료")
@@ -0,0 +1,48 @@
+import time
+
+from apps.ai.pool import get_pool_stats, warm_pool
+from django.core.management.base import BaseCommand
+
+
+class Command(BaseCommand):
+    help = "음식 추천 선택지 조합별 응답 풀 미리 생성 (비어 있거나 오래된 조합만)"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--size", type=int, help="조합당 응답 수 (기본: AI_FOOD_POOL_SIZE)"
+        )
+        parser.add_argument("--limit", type=int, help="한 번에 갱신할 최대 조합 수")
+        parser.add_argument("--force", action="store_true", help="모든 조합 다시 생성")
+        parser.add_argument(
+            "--interval",
+            type=int,
+            help="지정하면 N초마다 반복 실행 (스케줄러 없이 상시 워머로 사용)",
+        )
+        parser.add_argument("--stats", action="store_true", help="풀 상태만 출력")
+
+    def handle(self, *args, **options):
+        if options["stats"]:
+            self.write_stats()
+            return
+
+        try:
+            while True:
+                summary = warm_pool(options["size"], options["force"], options["limit"])
+                self.stdout.write(
+                    f"refreshed={summary['refreshed']} skipped={summary['skipped']} "
+                    f"failed={summary['failed']}"
+                )
+                self.write_stats()
+                if not options["interval"]:
+                    break
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+    def write_stats(self):
+        stats = get_pool_stats()
+        self.stdout.write(
+            " ".join(
+                f"{name.rsplit(':', 1)[-1]}={value}" for name, value in stats.items()
+            )
+        )
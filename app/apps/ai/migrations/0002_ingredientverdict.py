@@ -0,0 +1,40 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngredientVerdict",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=100, unique=True)),
+                ("is_food", models.BooleanField()),
+                (
+                    "source",
+                    models.CharField(
+                        choices=[("DICTIONARY", "사전"), ("MODEL", "AI 판정")],
+                        max_length=10,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "db_table": "ai_ingredientverdict",
+            },
+        ),
+    ]
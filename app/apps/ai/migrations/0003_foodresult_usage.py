@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai", "0002_ingredientverdict"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="foodresult",
+            name="usage",
+            field=models.JSONField(blank=True, default=list),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai", "0003_foodresult_usage"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="foodrequest",
+            name="last_meal",
+            field=models.CharField(blank=True, max_length=200),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:31
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai", "0004_foodrequest_last_meal_optional"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="foodresult",
+            name="request_snapshot",
+            field=models.JSONField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="foodresult",
+            index=models.Index(
+                fields=["content_type", "object_id"],
+                name="ai_foodresu_content_e7dc49_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai", "0005_foodresult_request_snapshot"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="foodresult",
+            index=models.Index(
+                fields=["created_at", "id"], name="ai_foodresu_created_34b510_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:39
+
+from django.db import migrations, models
+
+INDEX_NAME = "ai_foodresult_search_trgm"
+
+
+def create_search_index(apps, schema_editor):
+    # trigram 인덱스는 PostgreSQL 에서만 생성 (그 외 DB 는 인덱스 없이 LIKE 검색)
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    schema_editor.execute(
+        f"CREATE INDEX IF NOT EXISTS {INDEX_NAME} "
+        "ON ai_foodresult USING gin (search_text gin_trgm_ops)"
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    schema_editor.execute(f"DROP INDEX IF EXISTS {INDEX_NAME}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai", "0006_cursor_pagination_index"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="foodresult",
+            name="search_text",
+            field=models.TextField(blank=True, default=""),
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai", "0007_foodresult_search_text"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="foodresult",
+            name="calories",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="foodresult",
+            name="carbs",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="foodresult",
+            name="fat",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="foodresult",
+            name="protein",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="foodresult",
+            index=models.Index(
+                fields=["calories"], name="ai_foodresu_calorie_ab1315_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="foodresult",
+            index=models.Index(
+                fields=["protein"], name="ai_foodresu_protein_008fc9_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:42
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai", "0008_foodresult_nutrition"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DailyNutrition",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("date", models.DateField()),
+                ("calories", models.FloatField(default=0)),
+                ("protein", models.FloatField(default=0)),
+                ("carbs", models.FloatField(default=0)),
+                ("fat", models.FloatField(default=0)),
+                ("meals", models.PositiveIntegerField(default=0)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "ai_dailynutrition",
+                "ordering": ("-date",),
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("user", "date"), name="unique_user_date"
+                    )
+                ],
+            },
+        ),
+    ]
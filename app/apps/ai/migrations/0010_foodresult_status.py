@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai", "0009_dailynutrition"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="foodresult",
+            name="status",
+            field=models.CharField(
+                choices=[("COMPLETED", "완료"), ("ABORTED", "중단")],
+                default="COMPLETED",
+                max_length=10,
+            ),
+        ),
+    ]
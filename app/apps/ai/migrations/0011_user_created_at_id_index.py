@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("ai", "0010_foodresult_status"),
+        ("contenttypes", "0002_remove_content_type_name"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="foodresult",
+            index=models.Index(
+                fields=["user", "-created_at", "-id"],
+                name="ai_foodresu_user_id_93cbc6_idx",
+            ),
+        ),
+    ]
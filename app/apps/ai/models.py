@@ -12,6 +12,9 @@ User = get_user_model()
 class FoodResult(models.Model):
 
     request_type_choice = (("RECIPE", "레시피"), ("HEALTH", "건강"), ("FOOD", "음식"))
+    COMPLETED = "COMPLETED"
+    ABORTED = "ABORTED"
+    status_choice = ((COMPLETED, "완료"), (ABORTED, "중단"))
 
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     user = models.ForeignKey(User, on_delete=models.CASCADE)
@@ -21,18 +24,63 @@ class FoodResult(models.Model):
     object_id = models.UUIDField()
     request_object = GenericForeignKey("content_type", "object_id")
     request_type = models.CharField(choices=request_type_choice, max_length=8)
+    # 스트리밍 중 클라이언트가 끊겨 생성을 중단한 결과는 ABORTED (응답 = 받은 부분까지)
+    status = models.CharField(choices=status_choice, max_length=10, default=COMPLETED)
 
     response_data = models.JSONField(null=True, blank=True)
+    # 결과 생성에 사용된 Gemini 호출 기록 (토큰/지연/결과, 캐시 히트면 빈 목록)
+    usage = models.JSONField(default=list, blank=True)
+    # 요청 입력 스냅샷 (목록 조회 시 요청 테이블 조회 없이 사용, null = 백필 전)
+    request_snapshot = models.JSONField(null=True, blank=True)
+    # 검색용 텍스트 (이름/설명/재료, 소문자, PostgreSQL 에서는 trigram 인덱스)
+    search_text = models.TextField(blank=True, default="")
+    # 영양 정보 (응답에서 추출, 건강 식단은 끼니 합계, null = 정보 없음/백필 전)
+    calories = models.FloatField(null=True, blank=True)
+    protein = models.FloatField(null=True, blank=True)
+    carbs = models.FloatField(null=True, blank=True)
+    fat = models.FloatField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
         db_table = "ai_foodresult"
         ordering = ("-created_at",)
+        indexes = [
+            models.Index(fields=["content_type", "object_id"]),
+            # 커서 페이지네이션 (created_at, id) 순서 조회
+            models.Index(fields=["created_at", "id"]),
+            # 사용자별 목록 커서 페이지네이션
+            models.Index(fields=["user", "-created_at", "-id"]),
+            # 영양 정보 범위 필터 / 정렬
+            models.Index(fields=["calories"]),
+            models.Index(fields=["protein"]),
+        ]
 
     def __str__(self):
         return f"{self.user.email}의 결과"
 
 
+# 사용자별 일일 영양 섭취 합계 (레시피/음식 추천 결과 저장 시 누적, apps.ai.nutrition)
+class DailyNutrition(models.Model):
+    user = models.ForeignKey(User, on_delete=models.CASCADE)
+    date = models.DateField()
+    calories = models.FloatField(default=0)
+    protein = models.FloatField(default=0)
+    carbs = models.FloatField(default=0)
+    fat = models.FloatField(default=0)
+    meals = models.PositiveIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "ai_dailynutrition"
+        ordering = ("-date",)
+        constraints = [
+            models.UniqueConstraint(fields=["user", "date"], name="unique_user_date")
+        ]
+
+    def __str__(self):
+        return f"{self.user.email}의 {self.date} 영양 섭취"
+
+
 # 음식 요청
 class FoodRequest(models.Model):
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
@@ -41,7 +89,7 @@ class FoodRequest(models.Model):
     food_base = models.CharField(max_length=100)
     taste = models.CharField(max_length=100)
     dietary_type = models.CharField(max_length=100)
-    last_meal = models.CharField(max_length=200)
+    last_meal = models.CharField(max_length=200, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
     def __str__(self):
@@ -87,3 +135,19 @@ class RecipeRequest(models.Model):
 
     def __str__(self):
         return f"{self.user.email}의 레시피 요청"
+
+
+# 식재료 판정 저장소 (사전/Gemini 판정 결과 재사용)
+class IngredientVerdict(models.Model):
+    source_choice = (("DICTIONARY", "사전"), ("MODEL", "AI 판정"))
+
+    name = models.CharField(max_length=100, unique=True)
+    is_food = models.BooleanField()
+    source = models.CharField(choices=source_choice, max_length=10)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        db_table = "ai_ingredientverdict"
+
+    def __str__(self):
+        return f"{self.name}: {'식재료' if self.is_food else '식재료 아님'}"
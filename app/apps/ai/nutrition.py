@@ -0,0 +1,193 @@
+import re
+from datetime import timedelta
+
+from apps.ai.models import DailyNutrition, FoodResult
+from django.db.models import (
+    Avg,
+    Count,
+    F,
+    FloatField,
+    OuterRef,
+    Q,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+# FoodResult 영양 정보 컬럼 (응답 JSON 의 키와 같은 이름)
+NUTRITION_FIELDS = ("calories", "protein", "carbs", "fat")
+# 섭취로 집계하는 결과 타입 (건강 식단은 계획이라 제외, 목표 칼로리로만 사용)
+INTAKE_TYPES = ("RECIPE", "FOOD")
+PERIOD_DAYS = {"week": 7, "month": 30}
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+
+def to_number(value):
+    """숫자 또는 "450kcal", "1,200" 같은 문자열에서 숫자 추출 (없으면 None)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        match = _NUMBER.search(value.replace(",", ""))
+        if match:
+            return float(match.group())
+    return None
+
+
+def read_nutrition(info):
+    if not isinstance(info, dict):
+        return {field: None for field in NUTRITION_FIELDS}
+    return {field: to_number(info.get(field)) for field in NUTRITION_FIELDS}
+
+
+def get_nutrition(request_type, response_data):
+    """
+    응답에서 영양 정보 추출 (FoodResult 영양 컬럼, 저장 시 계산)
+
+    - RECIPE: nutrition_info
+    - FOOD: recommendation.nutritional_info
+    - HEALTH: 끼니별 nutritional_info 합계 (값이 있는 끼니만 합산)
+
+    Returns:
+        dict: {"calories", "protein", "carbs", "fat"} (값이 없으면 None)
+    """
+    data = response_data if isinstance(response_data, dict) else {}
+    if request_type == "RECIPE":
+        return read_nutrition(data.get("nutrition_info"))
+    if request_type == "FOOD":
+        recommendation = data.get("recommendation")
+        if not isinstance(recommendation, dict):
+            return read_nutrition(None)
+        return read_nutrition(recommendation.get("nutritional_info"))
+    if request_type == "HEALTH":
+        meals = data.get("meals") if isinstance(data.get("meals"), list) else []
+        totals = read_nutrition(None)
+        for meal in meals:
+            if not isinstance(meal, dict):
+                continue
+            for field, value in read_nutrition(meal.get("nutritional_info")).items():
+                if value is not None:
+                    totals[field] = (totals[field] or 0) + value
+        return totals
+    return read_nutrition(None)
+
+
+def record_daily_nutrition(results):
+    """
+    저장된 결과의 영양 정보를 사용자/일자별 합계(DailyNutrition)에 누적
+
+    같은 날짜 행은 F() 증가 UPDATE 로 더해 동시 저장에도 합계가 맞습니다.
+    """
+    totals = {}
+    for result in results:
+        if (
+            result.request_type not in INTAKE_TYPES
+            or result.status == FoodResult.ABORTED
+        ):
+            continue
+        key = (result.user_id, timezone.localdate(result.created_at))
+        day = totals.setdefault(
+            key, {**dict.fromkeys(NUTRITION_FIELDS, 0.0), "meals": 0}
+        )
+        for field in NUTRITION_FIELDS:
+            day[field] += getattr(result, field) or 0
+        day["meals"] += 1
+
+    for (user_id, date), values in totals.items():
+        row, created = DailyNutrition.objects.get_or_create(
+            user_id=user_id, date=date, defaults=values
+        )
+        if not created:
+            DailyNutrition.objects.filter(pk=row.pk).update(
+                updated_at=timezone.now(),
+                **{field: F(field) + value for field, value in values.items()},
+            )
+
+
+def get_daily_totals(results):
+    """결과 queryset 을 DB 에서 사용자/일자별로 집계 (DailyNutrition 재생성용, 중단된 결과 제외)"""
+    return (
+        results.filter(request_type__in=INTAKE_TYPES)
+        .exclude(status=FoodResult.ABORTED)
+        .annotate(date=TruncDate("created_at"))
+        .values("user_id", "date")
+        .annotate(
+            meals=Count("id"),
+            **{field: Sum(field, default=0.0) for field in NUTRITION_FIELDS},
+        )
+        .order_by()
+    )
+
+
+def get_calorie_target(user, end):
+    """end 날짜까지의 가장 최근 건강 식단의 daily_calorie_target (없으면 None)"""
+    target = (
+        FoodResult.objects.filter(
+            user=user, request_type="HEALTH", created_at__date__lte=end
+        )
+        .order_by("-created_at")
+        .values_list("response_data__daily_calorie_target", flat=True)
+        .first()
+    )
+    return to_number(target)
+
+
+def get_nutrition_summary(user, period="week", end=None, window=7):
+    """
+    기간별 영양 섭취 분석 (일일 합계 테이블에서 DB 집계)
+
+    - days: 기록이 있는 날짜별 합계, 최근 window 일(달력 기준) 이동 평균, 목표 칼로리 대비 차이
+    - summary: 기간 합계 / 기록일 평균 / 목표 대비 평균 차이 / 목표 초과 일수
+
+    이동 평균은 날짜별 상관 서브쿼리, 합계/평균은 aggregate 로 DB 에서 계산하며
+    Python 에서는 결과 행을 읽기만 합니다.
+    """
+    end = end or timezone.localdate()
+    start = end - timedelta(days=PERIOD_DAYS[period] - 1)
+    target = get_calorie_target(user, end)
+    rows = DailyNutrition.objects.filter(user=user, date__range=(start, end))
+
+    moving = {
+        f"{field}_moving_avg": Subquery(
+            DailyNutrition.objects.filter(
+                user=OuterRef("user"),
+                date__lte=OuterRef("date"),
+                date__gt=OuterRef("date") - timedelta(days=window),
+            )
+            .values("user")
+            .annotate(value=Avg(field))
+            .values("value"),
+            output_field=FloatField(),
+        )
+        for field in NUTRITION_FIELDS
+    }
+    aggregates = {
+        "days_recorded": Count("id"),
+        "meals": Sum("meals", default=0),
+        **{f"{field}_total": Sum(field, default=0.0) for field in NUTRITION_FIELDS},
+        **{f"{field}_avg": Avg(field) for field in NUTRITION_FIELDS},
+    }
+    if target is None:
+        deviation = Value(None, output_field=FloatField())
+    else:
+        deviation = F("calories") - Value(target)
+        aggregates["calorie_deviation_avg"] = Avg(deviation)
+        aggregates["over_target_days"] = Count("id", filter=Q(calories__gt=target))
+
+    days = rows.order_by("date").values(
+        "date", "meals", *NUTRITION_FIELDS, **moving, calorie_deviation=deviation
+    )
+    summary = rows.aggregate(**aggregates)
+    return {
+        "period": period,
+        "start": start,
+        "end": end,
+        "window": window,
+        "daily_calorie_target": target,
+        "days": list(days),
+        "summary": summary,
+    }
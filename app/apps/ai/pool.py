@@ -0,0 +1,188 @@
+import json
+import logging
+import time
+from itertools import product
+
+from apps.ai.client import AICircuitOpenError
+from apps.ai.service import food_prompt
+from apps.ai.utils import AIResponseParseError, GeminiClient, parse_ai_response
+from apps.utils import metrics
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+POOL_KEY_PREFIX = "ai:pool:FOOD"
+REFRESHED_KEY = f"{POOL_KEY_PREFIX}:refreshed"
+
+# 음식 추천 선택지 (이 조합 안의 요청만 미리 만든 응답으로 처리)
+FOOD_OPTIONS = {
+    "cuisine_type": ("한식", "중식", "일식", "양식", "동남아"),
+    "food_base": ("면", "밥", "빵"),
+    "taste": ("단맛", "고소한맛", "매운맛", "상큼한맛"),
+    "dietary_type": ("자극적", "건강한 맛"),
+}
+
+
+def get_option(name, default):
+    return getattr(settings, f"AI_FOOD_POOL_{name}", default)
+
+
+def get_combinations():
+    return list(product(*FOOD_OPTIONS.values()))
+
+
+def get_pool_key(combination):
+    return f"{POOL_KEY_PREFIX}:{':'.join(combination)}"
+
+
+def get_combination(validated_data):
+    """
+    미리 만든 응답을 쓸 수 있는 요청이면 선택지 조합 반환 (아니면 None)
+
+    최근 식사(last_meal)는 자유 입력이라 값이 있으면 실시간 생성합니다.
+    """
+    if (validated_data.get("last_meal") or "").strip():
+        return None
+    combination = tuple(
+        " ".join((validated_data.get(field) or "").split()) for field in FOOD_OPTIONS
+    )
+    for value, options in zip(combination, FOOD_OPTIONS.values()):
+        if value not in options:
+            return None
+    return combination
+
+
+def take_food(validated_data):
+    """
+    풀에서 응답 1개를 꺼냅니다. (리스트를 회전시켜 사용자마다 다른 항목 제공)
+
+    Returns:
+        dict | None: 응답 데이터 (풀 대상이 아니거나 비어 있으면 None)
+    """
+    if not get_option("ENABLED", True):
+        return None
+    combination = get_combination(validated_data)
+    if combination is None:
+        metrics.incr("ai_pool:FOOD:skip")
+        return None
+
+    key = get_pool_key(combination)
+    try:
+        # 마지막 항목을 맨 앞으로 옮기며 반환 (원자적 round-robin)
+        entry = get_redis_connection("default").rpoplpush(key, key)
+    except Exception:
+        logger.warning("음식 추천 풀 조회 실패", exc_info=True)
+        entry = None
+    if entry is None:
+        metrics.incr("ai_pool:FOOD:miss")
+        return None
+    metrics.incr("ai_pool:FOOD:hit")
+    return json.loads(entry)
+
+
+def generate_entries(combination, size):
+    """
+    조합 1개에 대한 응답 size 개 생성
+
+    앞서 만든 음식 이름을 최근 식사로 넣어 서로 다른 음식이 나오게 합니다.
+    """
+    entries, names = [], []
+    for _ in range(size):
+        prompt = food_prompt(*combination, ", ".join(names))
+        try:
+            data = parse_ai_response(GeminiClient.generate("FOOD", prompt))
+            name = data["recommendation"]["food_name"]
+        except (AIResponseParseError, KeyError, TypeError):
+            metrics.incr("ai_pool:FOOD:invalid")
+            continue
+        if name in names:
+            continue
+        names.append(name)
+        entries.append(data)
+    return entries
+
+
+def refresh_combination(combination, size=None):
+    """조합 1개의 풀을 새로 생성한 응답으로 교체 (생성 실패 시 기존 풀 유지)"""
+    entries = generate_entries(combination, size or get_option("SIZE", 5))
+    if not entries:
+        return 0
+
+    key = get_pool_key(combination)
+    pipe = get_redis_connection("default").pipeline()
+    pipe.delete(key)
+    pipe.rpush(key, *[json.dumps(entry, ensure_ascii=False) for entry in entries])
+    pipe.expire(key, get_option("TTL", 60 * 60 * 48))
+    pipe.hset(REFRESHED_KEY, key, int(time.time()))
+    pipe.execute()
+    return len(entries)
+
+
+def get_refreshed_at():
+    """{풀 키: 마지막 갱신 시각(unix time)}"""
+    return {
+        key.decode("utf-8"): int(value)
+        for key, value in get_redis_connection("default").hgetall(REFRESHED_KEY).items()
+    }
+
+
+def warm_pool(size=None, force=False, limit=None):
+    """
+    비어 있거나 오래된(AI_FOOD_POOL_REFRESH 경과) 조합의 풀을 채웁니다.
+
+    Gemini 서킷 브레이커가 열리면 중단합니다.
+
+    Returns:
+        dict: {"refreshed", "skipped", "failed"}
+    """
+    refreshed_at = get_refreshed_at()
+    stale_before = time.time() - get_option("REFRESH", 60 * 60 * 12)
+    summary = {"refreshed": 0, "skipped": 0, "failed": 0}
+
+    for combination in get_combinations():
+        key = get_pool_key(combination)
+        if not force and refreshed_at.get(key, 0) > stale_before:
+            summary["skipped"] += 1
+            continue
+        if limit is not None and summary["refreshed"] + summary["failed"] >= limit:
+            break
+        try:
+            count = refresh_combination(combination, size)
+        except AICircuitOpenError:
+            logger.warning("Gemini 서킷 브레이커가 열려 풀 갱신 중단")
+            summary["failed"] += 1
+            break
+        except Exception:
+            logger.exception("음식 추천 풀 갱신 실패: %s", key)
+            count = 0
+        summary["refreshed" if count else "failed"] += 1
+    return summary
+
+
+def get_pool_stats():
+    """풀 적중률 / 채워진 조합 수 / 갱신 후 경과 시간"""
+    counters = metrics.get_counters(
+        "ai_pool:FOOD:hit",
+        "ai_pool:FOOD:miss",
+        "ai_pool:FOOD:skip",
+        "ai_pool:FOOD:invalid",
+    )
+    served = counters["ai_pool:FOOD:hit"] + counters["ai_pool:FOOD:miss"]
+
+    now = time.time()
+    ttl = get_option("TTL", 60 * 60 * 48)
+    ages = [
+        now - refreshed
+        for refreshed in get_refreshed_at().values()
+        if now - refreshed < ttl
+    ]
+    stale_after = get_option("REFRESH", 60 * 60 * 12)
+    return {
+        **counters,
+        "hit_rate": round(counters["ai_pool:FOOD:hit"] / served, 4) if served else None,
+        "combinations": len(get_combinations()),
+        "filled": len(ages),
+        "stale": sum(1 for age in ages if age > stale_after),
+        "oldest_age_seconds": round(max(ages)) if ages else None,
+    }
@@ -0,0 +1,118 @@
+import math
+import re
+from string import Template
+
+from django.conf import settings
+
+# 응답 JSON 스키마 조각 (여러 프롬프트에서 공유, 한 줄로 작성해 토큰 절약)
+NUTRITION_SCHEMA = (
+    '{"calories": 칼로리, "protein": 단백질(g), "carbs": 탄수화물(g), "fat": 지방(g)}'
+)
+RECIPE_SCHEMA = (
+    '{"name": "요리이름", "description": "간단한 요리 설명", '
+    '"cuisine_type": "요리 종류(한식/중식 등)", "meal_type": "식사 종류(아침/점심/저녁)", '
+    '"preparation_time": 준비시간(분), "cooking_time": 조리시간(분), '
+    '"serving_size": 제공인원, "difficulty": "$difficulty", '
+    '"ingredients": [{"name": "재료명", "amount": "양"}], '
+    '"instructions": [{"step": 1, "description": "조리 단계 설명"}], '
+    f'"nutrition_info": {NUTRITION_SCHEMA}}}'
+)
+# 끼니 스키마는 한 번만 쓰고 끼니 수/순서는 문장으로 지시
+HEALTH_SCHEMA = (
+    '{"daily_calorie_target": 하루 권장 칼로리, "protein_target": 하루 단백질 목표(g), '
+    '"meals": [{"type": "아침|점심|저녁", "food_name": "음식명", "food_type": "음식 종류", '
+    f'"description": "설명", "nutritional_info": {NUTRITION_SCHEMA}}}], '
+    '"recommendation_reason": "추천 이유 및 설명"}'
+)
+FOOD_SCHEMA = (
+    '{"recommendation": {"food_name": "음식명", "food_type": "음식 종류", '
+    f'"description": "음식 설명", "nutritional_info": {NUTRITION_SCHEMA}, '
+    '"recommendation_reason": "추천 이유"}}'
+)
+
+FRAGMENTS = {
+    "RECIPE_SCHEMA": RECIPE_SCHEMA,
+    "HEALTH_SCHEMA": HEALTH_SCHEMA,
+    "FOOD_SCHEMA": FOOD_SCHEMA,
+    "JSON_ONLY": "JSON 형식으로만 반환하고 다른 텍스트나 설명은 포함하지 마세요.",
+    "STREAM_JSON": "그 후 ###JSON### 줄 다음에 아래 형식의 JSON을 제공해주세요:",
+}
+
+_ASCII = re.compile(r"[\x00-\x7f]")
+
+
+def get_option(name, default):
+    return getattr(settings, f"AI_PROMPT_{name}", default)
+
+
+def estimate_tokens(text):
+    """
+    대략적인 토큰 수 (한글 등 약 2글자당 1토큰, 영문/숫자/공백 약 4글자당 1토큰)
+
+    정확한 값은 Gemini 응답의 usage_metadata 로 집계됩니다. (apps.ai.usage)
+    """
+    ascii_chars = len(_ASCII.findall(text))
+    return max(1, math.ceil((len(text) - ascii_chars) / 2 + ascii_chars / 4))
+
+
+def compact(text):
+    """줄 앞뒤 공백과 빈 줄 제거"""
+    return "\n".join(line.strip() for line in text.splitlines() if line.strip())
+
+
+class PromptTemplate:
+    """
+    프롬프트 템플릿 (모듈 로드 시 한 번 컴파일)
+
+    $이름 자리에 공유 스키마 조각(FRAGMENTS)을 먼저 채우고 공백을 정리해 둔 뒤,
+    render() 에서 사용자 입력만 채웁니다. (JSON 중괄호 이스케이프 불필요)
+    """
+
+    def __init__(self, name, text):
+        self.name = name
+        self.source = text
+        self.template = Template(compact(Template(text).safe_substitute(FRAGMENTS)))
+
+    def render(self, **values):
+        return self.template.substitute(values)
+
+    def estimate(self, **values):
+        return estimate_tokens(self.render(**values))
+
+
+def clean_items(items):
+    """목록 입력 정리 (공백/중복 제거, 항목 길이와 개수 제한)"""
+    max_chars = get_option("MAX_ITEM_CHARS", 30)
+    cleaned = []
+    for item in items or []:
+        item = str(item).strip()[:max_chars]
+        if item and item not in cleaned:
+            cleaned.append(item)
+    return cleaned[: get_option("MAX_LIST_ITEMS", 30)]
+
+
+def join_items(items, empty="없음"):
+    return ", ".join(clean_items(items)) or empty
+
+
+def check_input_budget(values):
+    """
+    사용자 입력 토큰 예산 확인 (시리얼라이저 검증 단계에서 호출)
+
+    Returns:
+        str | None: 초과 시 오류 메시지
+    """
+    max_items = get_option("MAX_LIST_ITEMS", 30)
+    for name, value in values.items():
+        if isinstance(value, (list, tuple)) and len(value) > max_items:
+            return f"{name} 항목은 최대 {max_items}개까지 입력할 수 있습니다."
+
+    text = " ".join(
+        ", ".join(map(str, value)) if isinstance(value, (list, tuple)) else str(value)
+        for value in values.values()
+        if value not in (None, "")
+    )
+    max_tokens = get_option("MAX_INPUT_TOKENS", 400)
+    if estimate_tokens(text) > max_tokens:
+        return f"입력 내용이 너무 깁니다. (약 {max_tokens}토큰 이하)"
+    return None
@@ -0,0 +1,222 @@
+import asyncio
+import glob
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from itertools import count
+
+from apps.ai.backends import LLMBackend, TextResponse, get_backend
+from apps.ai.stub import UsageMetadata, detect_request_type
+from apps.ai.usage import get_token_counts
+from django.conf import settings
+from django.utils import timezone
+from google.api_core import exceptions as google_exceptions
+
+GENERATE = "generate"
+STREAM = "stream"
+
+
+def get_corpus_dir(directory=None):
+    return str(directory or settings.AI_RECORD_DIR)
+
+
+def get_prompt_key(prompt):
+    return hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def load_corpus(directory=None):
+    """
+    녹화 파일(*.jsonl.gz)의 모든 기록을 읽습니다.
+
+    기록 형식:
+        {"key", "request_type", "mode", "prompt", "chunks": [[직전 청크 이후 ms, 텍스트], ...],
+         "usage": {"prompt_tokens", "output_tokens"}, "recorded_at"}
+    """
+    records = []
+    for path in sorted(
+        glob.glob(os.path.join(get_corpus_dir(directory), "*.jsonl.gz"))
+    ):
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            records += [json.loads(line) for line in f if line.strip()]
+    return records
+
+
+class CorpusWriter:
+    """프로세스별 gzip JSONL 파일에 기록 추가 (gzip 멤버를 이어 붙이는 방식)"""
+
+    def __init__(self, directory=None):
+        self.directory = get_corpus_dir(directory)
+        self._lock = threading.Lock()
+
+    def get_path(self):
+        name = f"{timezone.localdate():%Y%m%d}-{os.getpid()}.jsonl.gz"
+        return os.path.join(self.directory, name)
+
+    def write(self, prompt, mode, chunks, response):
+        prompt_tokens, output_tokens = get_token_counts(response)
+        record = {
+            "key": get_prompt_key(prompt),
+            "request_type": detect_request_type(prompt),
+            "mode": mode,
+            "prompt": prompt,
+            "chunks": chunks,
+            "usage": {"prompt_tokens": prompt_tokens, "output_tokens": output_tokens},
+            "recorded_at": timezone.now().isoformat(),
+        }
+        line = json.dumps(record, ensure_ascii=False) + "\n"
+        with self._lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with gzip.open(self.get_path(), "at", encoding="utf-8") as f:
+                f.write(line)
+
+
+def elapsed_ms(since):
+    return round((time.monotonic() - since) * 1000)
+
+
+class RecordingBackend(LLMBackend):
+    """
+    녹화 모드 (settings.AI_LLM_BACKEND = "record")
+
+    실제 백엔드(settings.AI_RECORD_TARGET)를 그대로 호출하면서 프롬프트, 청크와
+    청크 사이 시간을 녹화 파일에 남깁니다. 끝까지 받은 응답만 기록합니다.
+    """
+
+    def __init__(self, target=None, directory=None):
+        self.target = target or get_backend(
+            getattr(settings, "AI_RECORD_TARGET", "gemini")
+        )
+        self.writer = CorpusWriter(directory)
+
+    def generate(self, prompt, timeout):
+        started = time.monotonic()
+        response = self.target.generate(prompt, timeout)
+        self.writer.write(
+            prompt, GENERATE, [[elapsed_ms(started), response.text]], response
+        )
+        return response
+
+    def stream(self, prompt, timeout):
+        started = time.monotonic()
+        chunks = self.target.stream(prompt, timeout)
+        return self._record(prompt, chunks, started)
+
+    def _record(self, prompt, chunks, started):
+        recorded, last, previous = [], None, started
+        for chunk in chunks:
+            recorded.append([elapsed_ms(previous), getattr(chunk, "text", "")])
+            previous, last = time.monotonic(), chunk
+            yield chunk
+        self.writer.write(prompt, STREAM, recorded, last)
+
+    async def stream_async(self, prompt, timeout):
+        recorded, last, previous = [], None, time.monotonic()
+        async for chunk in self.target.stream_async(prompt, timeout):
+            recorded.append([elapsed_ms(previous), getattr(chunk, "text", "")])
+            previous, last = time.monotonic(), chunk
+            yield chunk
+        self.writer.write(prompt, STREAM, recorded, last)
+
+
+class ReplayBackend(LLMBackend):
+    """
+    재생 모드 (settings.AI_LLM_BACKEND = "replay")
+
+    녹화된 응답을 원래 청크/시간 간격대로 돌려줍니다. 같은 프롬프트 기록이 없으면
+    (프롬프트 템플릿이 바뀐 경우 등) 같은 요청 종류의 기록을 돌아가며 사용합니다.
+    AI_REPLAY_SPEED: 1 = 원래 속도, 2 = 2배 빠르게, 0 = 지연 없이
+    """
+
+    def __init__(self, directory=None, speed=None):
+        self.directory = directory
+        self.speed = speed
+        self._loaded_from = None
+        self._lock = threading.Lock()
+        self._counter = count()
+
+    def get_speed(self):
+        if self.speed is not None:
+            return self.speed
+        return getattr(settings, "AI_REPLAY_SPEED", 1.0)
+
+    def _load(self):
+        directory = get_corpus_dir(self.directory)
+        with self._lock:
+            if self._loaded_from != directory:
+                self.by_key, self.by_type = defaultdict(list), defaultdict(list)
+                for record in load_corpus(directory):
+                    self.by_key[record["key"]].append(record)
+                    self.by_type[record["request_type"]].append(record)
+                self._loaded_from = directory
+
+    def find(self, prompt, mode):
+        """같은 프롬프트 → 같은 요청 종류 순으로, 같은 모드 기록을 우선 선택"""
+        self._load()
+        for candidates in (
+            self.by_key.get(get_prompt_key(prompt), []),
+            self.by_type.get(detect_request_type(prompt), []),
+        ):
+            preferred = [r for r in candidates if r["mode"] == mode] or candidates
+            if preferred:
+                return preferred[next(self._counter) % len(preferred)]
+        raise LookupError(
+            f"재생할 녹화 기록이 없습니다: {get_corpus_dir(self.directory)}"
+        )
+
+    def _delay(self, ms):
+        speed = self.get_speed()
+        return ms / 1000 / speed if speed else 0
+
+    @staticmethod
+    def _usage(record, last):
+        usage = record.get("usage") or {}
+        if not last:
+            return None
+        return UsageMetadata(usage.get("prompt_tokens"), usage.get("output_tokens"))
+
+    def _responses(self, record):
+        chunks = record["chunks"]
+        return [
+            TextResponse(text, self._usage(record, i == len(chunks) - 1))
+            for i, (_, text) in enumerate(chunks)
+        ]
+
+    def _check_timeout(self, delay, timeout):
+        if delay > timeout:
+            raise google_exceptions.DeadlineExceeded("replay timeout")
+
+    def generate(self, prompt, timeout):
+        record = self.find(prompt, GENERATE)
+        delay = self._delay(sum(ms for ms, _ in record["chunks"]))
+        time.sleep(min(delay, timeout))
+        self._check_timeout(delay, timeout)
+        text = "".join(text for _, text in record["chunks"])
+        return TextResponse(text, self._usage(record, True))
+
+    def stream(self, prompt, timeout):
+        record = self.find(prompt, STREAM)
+        first_delay = self._delay(record["chunks"][0][0]) if record["chunks"] else 0
+        time.sleep(min(first_delay, timeout))
+        self._check_timeout(first_delay, timeout)
+        return self._replay(record)
+
+    def _replay(self, record):
+        for i, response in enumerate(self._responses(record)):
+            if i:
+                time.sleep(self._delay(record["chunks"][i][0]))
+            yield response
+
+    async def stream_async(self, prompt, timeout):
+        record = self.find(prompt, STREAM)
+        for i, response in enumerate(self._responses(record)):
+            delay = self._delay(record["chunks"][i][0])
+            if i == 0:
+                await asyncio.sleep(min(delay, timeout))
+                self._check_timeout(delay, timeout)
+            else:
+                await asyncio.sleep(delay)
+            yield response
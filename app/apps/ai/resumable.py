@@ -0,0 +1,272 @@
+import asyncio
+import threading
+import time
+import uuid
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+from django.http import StreamingHttpResponse
+from django_redis import get_redis_connection
+
+STREAM_KEY_PREFIX = "ai:sse"
+DONE = "__done__"
+
+# 연결이 끊긴 뒤 계속 기록 중인 비동기 작업 (GC 로 사라지지 않도록 보관)
+_background = set()
+
+
+def get_option(name, default):
+    return getattr(settings, f"AI_SSE_RESUME_{name}", default)
+
+
+def use_resumable(request):
+    """?resumable=true 면 이어받기 가능한 스트림 (이벤트 id 부여, Redis Stream 에 기록)"""
+    return request.GET.get("resumable", "").lower() == "true"
+
+
+def get_stream_key(generation_id):
+    return f"{STREAM_KEY_PREFIX}:{generation_id}"
+
+
+def _decode(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def is_comment(frame):
+    return frame.startswith(":")
+
+
+def format_id(frame, generation_id, seq):
+    """SSE 프레임 앞에 이벤트 id 추가 (id: <생성 id>:<순번>)"""
+    return f"id: {generation_id}:{seq}\n{frame}"
+
+
+def parse_last_event_id(value, generation_id):
+    """
+    Last-Event-ID 에서 마지막으로 받은 순번 추출 (없으면 0)
+
+    Raises:
+        ValueError: 형식이 잘못됐거나 다른 생성의 id
+    """
+    if not value:
+        return 0
+    event_generation, _, seq = value.strip().rpartition(":")
+    if event_generation != generation_id or not seq.isdigit():
+        raise ValueError(value)
+    return int(seq)
+
+
+class Generation:
+    """
+    생성 1건의 SSE 프레임 기록 (Redis Stream, 항목 id = 0-<순번>)
+
+    응답을 보내면서 프레임마다 순번을 붙여 기록하고, 재연결한 클라이언트는
+    replay() 로 놓친 프레임을 받은 뒤 진행 중인 생성을 이어서 받습니다.
+    """
+
+    def __init__(self, generation_id):
+        self.id = generation_id
+        self.key = get_stream_key(generation_id)
+        self.seq = 0
+        self.conn = get_redis_connection("default")
+
+    @classmethod
+    def start(cls, user):
+        generation = cls(uuid.uuid4().hex)
+        generation.conn.set(
+            f"{generation.key}:owner", str(user.pk), ex=get_option("TTL", 300)
+        )
+        return generation
+
+    @classmethod
+    def get_owner(cls, generation_id):
+        owner = get_redis_connection("default").get(
+            f"{get_stream_key(generation_id)}:owner"
+        )
+        return _decode(owner) if owner is not None else None
+
+    def append(self, frame, **fields):
+        self.seq += 1
+        ttl = get_option("TTL", 300)
+        pipe = self.conn.pipeline()
+        pipe.xadd(self.key, {"frame": frame, **fields}, id=f"0-{self.seq}")
+        pipe.expire(self.key, ttl)
+        pipe.expire(f"{self.key}:owner", ttl)
+        pipe.execute()
+        return format_id(frame, self.id, self.seq)
+
+    def finish(self):
+        """종료 표시 (재연결한 클라이언트가 끝을 알 수 있도록)"""
+        self.append("", **{DONE: "1"})
+
+    def record(self, frames):
+        """
+        프레임을 기록하면서 이벤트 id 를 붙여 내보냄
+
+        클라이언트 연결이 끊기면 남은 생성은 백그라운드 스레드에서 끝까지 기록해
+        재연결 시 이어받을 수 있게 합니다. (같은 생성을 다시 요청하지 않음)
+        """
+        detached = False
+        try:
+            for frame in frames:
+                # heartbeat(주석 프레임)는 기록하지 않음
+                yield frame if is_comment(frame) else self.append(frame)
+        except GeneratorExit:
+            detached = True
+            threading.Thread(target=self.drain, args=(frames,), daemon=True).start()
+            raise
+        finally:
+            if not detached:
+                self.finish()
+
+    def is_abandoned(self, detached_at):
+        """
+        연결이 끊긴 뒤 AI_SSE_RESUME_GRACE 초가 지나도록 이어받는 클라이언트가 없는지
+
+        버려진 생성은 끝까지 기록하지 않고 중단합니다. (업스트림 생성 비용 절약)
+        """
+        if time.monotonic() - detached_at < get_option("GRACE", 10):
+            return False
+        return not self.conn.exists(f"{self.key}:reader")
+
+    def drain(self, frames):
+        detached_at = time.monotonic()
+        try:
+            for frame in frames:
+                if is_comment(frame):
+                    continue
+                self.append(frame)
+                if self.is_abandoned(detached_at):
+                    frames.close()
+                    break
+        finally:
+            self.finish()
+            close_old_connections()
+
+    async def record_async(self, frames):
+        """
+        record 의 비동기 버전
+
+        생성은 별도 작업(task)이 기록하고 응답은 그 결과를 전달만 하므로,
+        응답이 취소(연결 끊김)되어도 생성은 끝까지 기록됩니다.
+        (이어받는 클라이언트가 없으면 drain 과 같이 중단)
+        """
+        queue = asyncio.Queue()
+        append = sync_to_async(self.append, thread_sensitive=False)
+        is_abandoned = sync_to_async(self.is_abandoned, thread_sensitive=False)
+        detached = {"at": None}
+
+        async def pump():
+            try:
+                async for frame in frames:
+                    if is_comment(frame):
+                        await queue.put(frame)
+                        continue
+                    await queue.put(await append(frame))
+                    if detached["at"] is not None and await is_abandoned(
+                        detached["at"]
+                    ):
+                        await frames.aclose()
+                        break
+            finally:
+                await sync_to_async(self.finish, thread_sensitive=False)()
+                await queue.put(None)
+
+        task = asyncio.create_task(pump())
+        _background.add(task)
+        task.add_done_callback(_background.discard)
+
+        try:
+            while True:
+                frame = await queue.get()
+                if frame is None:
+                    break
+                yield frame
+        except (GeneratorExit, asyncio.CancelledError):
+            detached["at"] = time.monotonic()
+            raise
+        await task
+
+
+def read_entries(conn, key, last_id):
+    """
+    이어받는 중 표시 후 last_id 이후 항목 조회 (새 항목이 없으면 최대 1초 대기)
+
+    Returns:
+        list: [(항목 id, 필드)], 기록이 만료됐으면 None
+    """
+    # 이어받는 중 표시 (연결이 끊긴 생성을 중단하지 않도록)
+    conn.set(f"{key}:reader", "1", ex=get_option("GRACE", 10))
+    entries = conn.xread({key: last_id}, block=1000, count=100)
+    if not entries:
+        return [] if conn.exists(key) else None
+    return [
+        (_decode(entry_id), {_decode(k): _decode(v) for k, v in fields.items()})
+        for entry_id, fields in entries[0][1]
+    ]
+
+
+def replay(generation_id, after=0):
+    """
+    after 순번 이후 프레임을 보내고, 생성이 진행 중이면 끝날 때까지 이어서 전송
+
+    기록이 만료됐거나 AI_SSE_RESUME_WAIT 초 동안 새 프레임이 없으면 종료합니다.
+    """
+    conn = get_redis_connection("default")
+    key = get_stream_key(generation_id)
+    last_id = f"0-{after}"
+    wait = get_option("WAIT", 30)
+    deadline = time.monotonic() + wait
+
+    while time.monotonic() < deadline:
+        entries = read_entries(conn, key, last_id)
+        if entries is None:
+            return
+        if not entries:
+            continue
+        for last_id, fields in entries:
+            if fields.get(DONE):
+                return
+            yield format_id(fields["frame"], generation_id, last_id.split("-")[1])
+        deadline = time.monotonic() + wait
+
+
+async def replay_async(generation_id, after=0):
+    """replay 의 비동기 버전 (Redis 대기는 스레드에서 실행해 이벤트 루프를 막지 않음)"""
+    conn = get_redis_connection("default")
+    key = get_stream_key(generation_id)
+    read = sync_to_async(read_entries, thread_sensitive=False)
+    last_id = f"0-{after}"
+    wait = get_option("WAIT", 30)
+    deadline = time.monotonic() + wait
+
+    while time.monotonic() < deadline:
+        entries = await read(conn, key, last_id)
+        if entries is None:
+            return
+        if not entries:
+            continue
+        for last_id, fields in entries:
+            if fields.get(DONE):
+                return
+            yield format_id(fields["frame"], generation_id, last_id.split("-")[1])
+        deadline = time.monotonic() + wait
+
+
+def sse_response(frames, generation=None):
+    """SSE 응답 (generation 이 있으면 X-Generation-Id 헤더로 생성 id 전달)"""
+    response = StreamingHttpResponse(frames, content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    if generation is not None:
+        response["X-Generation-Id"] = generation.id
+    return response
+
+
+def stream_with_resume(frames, request):
+    """스트리밍 추천 응답 (?resumable=true 면 기록하며 전송)"""
+    if not use_resumable(request):
+        return sse_response(frames)
+    generation = Generation.start(request.user)
+    return sse_response(generation.record(frames), generation)
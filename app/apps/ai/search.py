@@ -0,0 +1,67 @@
+from django.db import connections
+from django.db.models import F, Value
+
+# 검색 대상 키 (요리/음식 이름, 종류, 설명, 재료 이름)
+SEARCH_KEYS = ("name", "food_name", "food_type", "cuisine_type", "description")
+# 조리 단계 설명은 검색 대상에서 제외
+SKIP_KEYS = ("instructions",)
+
+
+def collect_text(data, values):
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key in SKIP_KEYS:
+                continue
+            if key in SEARCH_KEYS and isinstance(value, str):
+                values.append(value)
+            else:
+                collect_text(value, values)
+    elif isinstance(data, list):
+        for value in data:
+            collect_text(value, values)
+    return values
+
+
+def normalize(text):
+    return " ".join(str(text).split()).lower()
+
+
+def get_search_text(response_data, request_snapshot=None):
+    """
+    결과 검색용 텍스트 (FoodResult.search_text, 저장 시 생성)
+
+    응답의 이름/설명/재료 이름과 요청한 재료를 소문자로 정리해 이어 붙입니다.
+    """
+    values = collect_text(response_data, [])
+    values.extend((request_snapshot or {}).get("ingredients") or [])
+    seen = []
+    for value in map(normalize, values):
+        if value and value not in seen:
+            seen.append(value)
+    return " ".join(seen)
+
+
+def search_results(queryset, query):
+    """
+    검색어의 모든 단어가 포함된 결과만 반환 (PostgreSQL 이면 유사도 순 정렬)
+
+    PostgreSQL 에서는 search_text 의 trigram GIN 인덱스(마이그레이션 0007)로
+    LIKE '%단어%' 조건을 처리하고 단어별 TrigramWordSimilarity 합으로 정렬합니다.
+    그 외 DB 는 포함 여부만 확인하고 기본 정렬(최신순)을 유지합니다.
+    """
+    terms = normalize(query).split()
+    if not terms:
+        return queryset
+    for term in terms:
+        # 소문자로 저장해 두고 contains(LIKE) 사용 (icontains 의 UPPER() 는 인덱스 미사용)
+        queryset = queryset.filter(search_text__contains=term)
+
+    if connections[queryset.db].vendor != "postgresql":
+        return queryset
+
+    from django.contrib.postgres.search import TrigramWordSimilarity
+
+    rank = Value(0.0)
+    for term in terms:
+        rank = rank + TrigramWordSimilarity(term, F("search_text"))
+    return queryset.annotate(search_rank=rank).order_by("-search_rank", "-created_at")
@@ -0,0 +1,95 @@
+import os
+import threading
+
+from apps.utils.aho_corasick import AhoCorasick
+from django.conf import settings
+
+# 기본 프롬프트 인젝션 차단 키워드
+DEFAULT_SECURITY_KEYWORDS = [
+    "프롬프트 무시",
+    "무시해",
+    "prompt",
+    "ignore",
+    "system prompt",
+    "instructions",
+    "bypass",
+    "우회",
+    "명령어",
+    "지시사항",
+    "{",
+    "}",
+    "function",
+    "코드 실행",
+    "execute",
+    "eval",
+    "인젝션",
+    "injection",
+    "hack",
+    "해킹",
+    "<",
+    ">",
+    "$",
+]
+
+# 항목 구분자 (키워드에 포함될 수 없는 문자라 항목을 넘는 매칭이 생기지 않음)
+ITEM_SEPARATOR = "\n"
+
+_lock = threading.Lock()
+_matcher = None
+_matcher_source = None
+
+
+def load_security_keywords():
+    """
+    기본 키워드 + settings.AI_SECURITY_KEYWORDS + 키워드 파일을 합쳐 반환합니다.
+
+    키워드 파일(settings.AI_SECURITY_KEYWORDS_FILE)은 한 줄에 하나씩,
+    `#`으로 시작하는 줄은 주석으로 취급합니다.
+    """
+    keywords = list(DEFAULT_SECURITY_KEYWORDS)
+    keywords += getattr(settings, "AI_SECURITY_KEYWORDS", [])
+
+    path = getattr(settings, "AI_SECURITY_KEYWORDS_FILE", None)
+    if path and os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            keywords += [
+                line.strip()
+                for line in f
+                if line.strip() and not line.lstrip().startswith("#")
+            ]
+
+    return [keyword.lower() for keyword in keywords if ITEM_SEPARATOR not in keyword]
+
+
+def _get_source_version():
+    """키워드 파일이 바뀌었는지 판단하기 위한 값 (경로, 수정 시각)"""
+    path = getattr(settings, "AI_SECURITY_KEYWORDS_FILE", None)
+    try:
+        mtime = os.stat(path).st_mtime if path else None
+    except OSError:
+        mtime = None
+    return path, mtime, tuple(getattr(settings, "AI_SECURITY_KEYWORDS", []))
+
+
+def get_keyword_matcher():
+    """컴파일된 키워드 매처 (설정/파일이 바뀌면 다시 빌드)"""
+    global _matcher, _matcher_source
+
+    source = _get_source_version()
+    if _matcher is None or source != _matcher_source:
+        with _lock:
+            if _matcher is None or source != _matcher_source:
+                _matcher = AhoCorasick(load_security_keywords())
+                _matcher_source = source
+    return _matcher
+
+
+def find_security_keyword(items):
+    """
+    모든 항목을 한 번의 선형 탐색으로 검사합니다.
+
+    Returns:
+        str: 처음 발견된 위험 키워드 (없으면 None)
+    """
+    text = ITEM_SEPARATOR.join(item for item in items if isinstance(item, str))
+    return get_keyword_matcher().search(text.lower())
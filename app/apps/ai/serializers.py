@@ -4,11 +4,24 @@ from apps.ai.models import (
     RecipeRequest,
     UserHealthRequest,
 )
+from apps.ai.prompts import check_input_budget
+from apps.ai.utils import get_request_snapshot
 from rest_framework import serializers
 
 
+class PromptBudgetMixin:
+    """프롬프트에 들어갈 사용자 입력이 토큰 예산을 넘으면 모델 호출 전에 거절"""
+
+    def validate(self, attrs):
+        attrs = super().validate(attrs)
+        error = check_input_budget(attrs)
+        if error:
+            raise serializers.ValidationError(error, code="prompt_too_large")
+        return attrs
+
+
 # 레시피 추천 요청 시리얼라이저
-class RecipeRequestSerializer(serializers.ModelSerializer):
+class RecipeRequestSerializer(PromptBudgetMixin, serializers.ModelSerializer):
     class Meta:
         model = RecipeRequest
         fields = ["ingredients", "serving_size", "cooking_time", "difficulty"]
@@ -21,14 +34,14 @@ class RecipeRequestSerializer(serializers.ModelSerializer):
 
 
 # 건강식단 추천 요청 시리얼라이저
-class HealthRequestSerializer(serializers.ModelSerializer):
+class HealthRequestSerializer(PromptBudgetMixin, serializers.ModelSerializer):
     class Meta:
         model = UserHealthRequest
         fields = ["weight", "goal", "exercise_frequency", "allergies", "disliked_foods"]
 
 
 # 음식추천 요청 시리얼라이저
-class FoodRequestSerializer(serializers.ModelSerializer):
+class FoodRequestSerializer(PromptBudgetMixin, serializers.ModelSerializer):
     class Meta:
         model = FoodRequest
         fields = ["cuisine_type", "food_base", "taste", "dietary_type", "last_meal"]
@@ -89,35 +102,18 @@ class MenuListChecksSerializer(serializers.ModelSerializer):
             "request_type",
             "request_data",
             "response_data",
+            "calories",
+            "protein",
+            "carbs",
+            "fat",
             "created_at",
         ]
 
     def get_request_data(self, obj):
+        # 생성 시 저장한 스냅샷 사용 (백필 전 결과만 요청 테이블 조회)
+        if obj.request_snapshot is not None:
+            return obj.request_snapshot
         try:
-            request_obj = obj.request_object  # 3개 api 중 하나
-
-            if obj.request_type == "RECIPE" and hasattr(request_obj, "ingredients"):
-                return {
-                    "ingredients": request_obj.ingredients,
-                    "serving_size": request_obj.serving_size,
-                    "cooking_time": request_obj.cooking_time,
-                    "difficulty": request_obj.difficulty,
-                }
-            elif obj.request_type == "HEALTH" and hasattr(request_obj, "weight"):
-                return {
-                    "weight": request_obj.weight,
-                    "exercise_frequency": request_obj.exercise_frequency,
-                    "allergies": request_obj.allergies,
-                    "disliked_foods": request_obj.disliked_foods,
-                }
-            elif obj.request_type == "FOOD" and hasattr(request_obj, "cuisine_type"):
-                return {
-                    "cuisine_type": request_obj.cuisine_type,
-                    "food_base": request_obj.food_base,
-                    "taste": request_obj.taste,
-                    "dietary_type": request_obj.dietary_type,
-                    "last_meal": request_obj.last_meal,
-                }
-            return {}
+            return get_request_snapshot(obj.request_type, obj.request_object)
         except Exception:
             return {}
@@ -0,0 +1,224 @@
+import hashlib
+import logging
+import threading
+import time
+import uuid
+
+from apps.ai.backends import guard_upstream
+from apps.ai.client import AIUnavailableError
+from apps.utils import metrics
+from django.conf import settings
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+STREAM_DONE = "__done__"
+STREAM_ABORTED = "__aborted__"  # leader 가 생성을 끝내지 못함 (오류/중단)
+
+
+class SharedResponse:
+    """다른 요청이 생성한 결과 (Gemini 응답처럼 .text 로 접근)"""
+
+    def __init__(self, text):
+        self.text = text
+
+
+def get_prompt_key(prompt):
+    return "ai:singleflight:" + hashlib.sha256(prompt.encode("utf-8")).hexdigest()
+
+
+def get_option(name, default):
+    return getattr(settings, f"AI_SINGLE_FLIGHT_{name}", default)
+
+
+def is_enabled():
+    return get_option("ENABLED", True)
+
+
+def get_connection():
+    return get_redis_connection("default")
+
+
+def _decode(value):
+    return value.decode("utf-8") if isinstance(value, bytes) else value
+
+
+def release_lock(conn, lock_key, token):
+    """만료 후 다른 leader가 잡은 락은 지우지 않음"""
+    if _decode(conn.get(lock_key)) == token:
+        conn.delete(lock_key)
+
+
+def generate(prompt, call):
+    """
+    같은 프롬프트의 동시 호출을 하나로 합칩니다.
+
+    첫 호출자(leader)만 Gemini를 호출하고, 동시에 들어온 호출자는 Redis에 저장된
+    결과를 공유받습니다. 기다리는 시간이 초과되거나 leader가 실패하면 직접 호출합니다.
+
+    Args:
+        prompt: 프롬프트 (해시가 합치기 기준)
+        call: 실제 Gemini 호출 함수 (.text 를 가진 응답 반환)
+    """
+    if not is_enabled():
+        return call()
+
+    key = get_prompt_key(prompt)
+    lock_key, result_key = f"{key}:lock", f"{key}:result"
+    conn = get_connection()
+
+    token = uuid.uuid4().hex
+    if conn.set(lock_key, token, nx=True, ex=get_option("LOCK_TIMEOUT", 60)):
+        metrics.incr("singleflight:leader")
+        try:
+            response = call()
+            conn.set(result_key, response.text, ex=get_option("RESULT_TTL", 10))
+            return response
+        finally:
+            release_lock(conn, lock_key, token)
+
+    deadline = time.monotonic() + get_option("WAIT_TIMEOUT", 30)
+    while time.monotonic() < deadline:
+        text = conn.get(result_key)
+        if text is not None:
+            metrics.incr("singleflight:shared")
+            return SharedResponse(_decode(text))
+        if not conn.exists(lock_key):
+            # leader가 결과 없이 끝남 (실패) - 마지막으로 한 번 더 확인
+            text = conn.get(result_key)
+            if text is not None:
+                metrics.incr("singleflight:shared")
+                return SharedResponse(_decode(text))
+            break
+        time.sleep(0.1)
+
+    metrics.incr("singleflight:fallback")
+    return call()
+
+
+def end_stream(conn, lock_key, stream_key, token, completed):
+    """종료 표시 (붙어 있는 호출자가 정상 종료/중단을 구분할 수 있도록)"""
+    conn.xadd(
+        stream_key, {"text": "", (STREAM_DONE if completed else STREAM_ABORTED): "1"}
+    )
+    conn.expire(stream_key, get_option("RESULT_TTL", 10))
+    release_lock(conn, lock_key, token)
+
+
+def get_readers_key(stream_key):
+    return f"{stream_key}:readers"
+
+
+def continue_for_readers(conn, chunks, lock_key, stream_key, token):
+    """leader 의 클라이언트가 끊긴 뒤 붙어 있는 호출자를 위해 남은 생성을 기록"""
+    completed = False
+    try:
+        for chunk in chunks:
+            text = chunk.text if hasattr(chunk, "text") else ""
+            if text:
+                conn.xadd(stream_key, {"text": text})
+        completed = True
+    except Exception:
+        logger.warning("공유 스트림 생성 실패: %s", stream_key, exc_info=True)
+    finally:
+        end_stream(conn, lock_key, stream_key, token, completed)
+
+
+def stream(prompt, call):
+    """
+    스트리밍 호출 합치기
+
+    leader는 받은 청크를 Redis Stream에 기록하면서 그대로 내보내고,
+    동시에 같은 프롬프트로 들어온 호출자는 진행 중인 스트림에 붙어 처음부터 청크를 받습니다.
+
+    leader 의 클라이언트가 끊기면 붙어 있는 호출자가 있을 때만 생성을 백그라운드에서
+    계속하고, 없으면 업스트림을 닫습니다. leader 가 생성을 끝내지 못하면
+    아직 받은 청크가 없는 호출자는 직접 호출하고, 일부를 받은 호출자는
+    AIUnavailableError 를 받습니다. (잘린 응답을 완료로 처리하지 않도록)
+
+    Yields:
+        .text 를 가진 청크
+    """
+    if not is_enabled():
+        yield from call()
+        return
+
+    lock_key = f"{get_prompt_key(prompt)}:stream-lock"
+    conn = get_connection()
+
+    # 생성마다 별도의 Stream 키를 사용 (이전 생성의 청크와 섞이지 않도록)
+    token = uuid.uuid4().hex
+    if conn.set(lock_key, token, nx=True, ex=get_option("LOCK_TIMEOUT", 60)):
+        metrics.incr("singleflight:stream_leader")
+        stream_key = f"{lock_key}:{token}"
+        readers_key = get_readers_key(stream_key)
+        # 붙어 있는 호출자가 있으면 클라이언트가 끊겨도 업스트림을 닫지 않음 (아래 handoff)
+        guard_upstream(lambda: int(conn.get(readers_key) or 0) == 0)
+        chunks = iter(call())
+        completed = handed_off = False
+        try:
+            for chunk in chunks:
+                text = chunk.text if hasattr(chunk, "text") else ""
+                if text:
+                    conn.xadd(stream_key, {"text": text})
+                yield chunk
+            completed = True
+        except GeneratorExit:
+            if int(conn.get(readers_key) or 0) > 0:
+                handed_off = True
+                metrics.incr("singleflight:stream_handoff")
+                threading.Thread(
+                    target=continue_for_readers,
+                    args=(conn, chunks, lock_key, stream_key, token),
+                    daemon=True,
+                ).start()
+            raise
+        finally:
+            if not handed_off:
+                if not completed and hasattr(chunks, "close"):
+                    chunks.close()
+                end_stream(conn, lock_key, stream_key, token, completed)
+        return
+
+    yielded = False
+    outcome = None
+    leader_token = conn.get(lock_key)
+    if leader_token is not None:
+        stream_key = f"{lock_key}:{_decode(leader_token)}"
+        readers_key = get_readers_key(stream_key)
+        conn.incr(readers_key)
+        conn.expire(readers_key, get_option("LOCK_TIMEOUT", 60))
+        try:
+            last_id = "0"
+            deadline = time.monotonic() + get_option("WAIT_TIMEOUT", 30)
+            while outcome is None and time.monotonic() < deadline:
+                entries = conn.xread({stream_key: last_id}, block=1000, count=100)
+                if not entries:
+                    # leader가 종료 표시 없이 사라진 경우
+                    if not conn.exists(lock_key) and not conn.exists(stream_key):
+                        break
+                    continue
+                for entry_id, fields in entries[0][1]:
+                    last_id = entry_id
+                    fields = {_decode(k): _decode(v) for k, v in fields.items()}
+                    if fields.get(STREAM_DONE):
+                        outcome = STREAM_DONE
+                        break
+                    if fields.get(STREAM_ABORTED):
+                        outcome = STREAM_ABORTED
+                        break
+                    yielded = True
+                    deadline = time.monotonic() + get_option("WAIT_TIMEOUT", 30)
+                    yield SharedResponse(fields["text"])
+        finally:
+            conn.decr(readers_key)
+
+    if outcome == STREAM_DONE:
+        metrics.incr("singleflight:stream_shared")
+        return
+    if yielded:
+        # 이미 일부를 보낸 뒤라 새로 생성하면 내용이 섞임 - 잘린 응답으로 끝나지 않도록 오류
+        metrics.incr("singleflight:stream_aborted")
+        raise AIUnavailableError()
+    metrics.incr("singleflight:fallback")
+    yield from call()
@@ -0,0 +1,186 @@
+import asyncio
+import queue
+import threading
+import time
+
+from apps.ai.backends import UpstreamCancel
+from apps.ai.stream_parser import TEXT
+from django.conf import settings
+
+# 새 청크 없이 interval 이 지났음을 알리는 표시 (paced / paced_async)
+IDLE = object()
+# 주석 프레임 (클라이언트는 무시, 프록시 유휴 연결 종료 방지)
+HEARTBEAT = ": keep-alive\n\n"
+
+_END = object()
+
+
+def get_option(name, default):
+    return getattr(settings, f"AI_SSE_{name}", default)
+
+
+class _Raised:
+    def __init__(self, error):
+        self.error = error
+
+
+class StreamPacer:
+    """
+    스트리밍 이벤트 전송 시점 조절
+
+    - 텍스트 이벤트는 AI_SSE_COALESCE_BYTES(UTF-8) 가 모이거나 첫 텍스트를 담은 뒤
+      AI_SSE_COALESCE_DELAY 초가 지나면 한 이벤트로 합쳐 전송합니다.
+      직전 텍스트 전송 후 DELAY 가 지나 도착한 청크는 바로 보내므로
+      느린 스트림(첫 청크 포함)에는 지연을 더하지 않고 빠르게 몰려오는 청크만 합칩니다.
+    - 텍스트 외 이벤트는 모아 둔 텍스트를 먼저 보낸 뒤 바로 전송합니다.
+    - AI_SSE_HEARTBEAT 초 동안 보낸 것이 없으면 heartbeat() 가 주석 프레임을 반환합니다.
+
+    feed()/poll()/close() 는 지금 보낼 (종류, 값) 이벤트 목록을 반환합니다.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        self.clock = clock
+        self.max_bytes = get_option("COALESCE_BYTES", 512)
+        self.max_delay = get_option("COALESCE_DELAY", 0.05)
+        self.heartbeat_interval = get_option("HEARTBEAT", 15)
+        self._texts = []
+        self._size = 0
+        self._since = None  # 모으기 시작한 시각
+        self._text_sent_at = None
+        self._sent_at = clock()
+
+    @property
+    def interval(self):
+        """새 청크가 없을 때 poll()/heartbeat() 를 확인할 간격(초)"""
+        return self.max_delay if self.max_delay > 0 else self.heartbeat_interval
+
+    def feed(self, events):
+        now = self.clock()
+        ready = []
+        for kind, value in events:
+            if kind != TEXT:
+                ready += self._flush()
+                ready.append((kind, value))
+                continue
+            if not self._texts and (
+                self._text_sent_at is None or now - self._text_sent_at >= self.max_delay
+            ):
+                ready.append((kind, value))
+                self._text_sent_at = now
+                continue
+            self._texts.append(value)
+            self._size += len(value.encode("utf-8"))
+            if self._since is None:
+                self._since = now
+            if self._size >= self.max_bytes or now - self._since >= self.max_delay:
+                ready += self._flush()
+        return self._sent(ready)
+
+    def poll(self):
+        """모은 텍스트 중 DELAY 가 지난 것"""
+        if self._since is None or self.clock() - self._since < self.max_delay:
+            return []
+        return self._sent(self._flush())
+
+    def close(self):
+        return self._sent(self._flush())
+
+    def heartbeat(self):
+        """HEARTBEAT 초 동안 보낸 것이 없으면 주석 프레임 목록"""
+        if self.clock() - self._sent_at < self.heartbeat_interval:
+            return []
+        self._sent_at = self.clock()
+        return [HEARTBEAT]
+
+    def _flush(self):
+        if not self._texts:
+            return []
+        text = "".join(self._texts)
+        self._texts, self._size, self._since = [], 0, None
+        self._text_sent_at = self.clock()
+        return [(TEXT, text)]
+
+    def _sent(self, events):
+        if events:
+            self._sent_at = self.clock()
+        return events
+
+
+def paced(chunks, interval):
+    """
+    chunks 를 별도 스레드에서 읽어 전달하고, interval 초 동안 새 청크가 없으면 IDLE 전달
+
+    업스트림이 멈춰 있어도 호출한 쪽이 모은 텍스트 전송/heartbeat 를 할 수 있게 합니다.
+    닫히면(클라이언트 연결 끊김) 읽기 스레드가 연 업스트림 응답을 바로 닫고,
+    읽기 스레드가 chunks 를 닫을 때까지 최대 AI_SSE_CLOSE_WAIT 초 기다립니다.
+    (meter_stream 등 chunks 의 종료 처리가 호출한 쪽의 종료 처리보다 먼저 끝나도록)
+    """
+    items = queue.Queue()
+    stop = threading.Event()
+    upstream = UpstreamCancel()
+
+    def pump():
+        upstream.bind()
+        try:
+            for chunk in chunks:
+                if stop.is_set():
+                    break
+                items.put(chunk)
+        except BaseException as e:
+            items.put(_Raised(e))
+        finally:
+            if hasattr(chunks, "close"):
+                chunks.close()
+            items.put(_END)
+
+    thread = threading.Thread(target=pump, daemon=True)
+    thread.start()
+    try:
+        while True:
+            try:
+                item = items.get(timeout=interval)
+            except queue.Empty:
+                yield IDLE
+                continue
+            if item is _END:
+                return
+            if isinstance(item, _Raised):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        if thread.is_alive():
+            # 청크를 기다리며 막힌 읽기 스레드는 다음 청크까지 멈추지 않으므로 직접 닫음
+            upstream.cancel()
+            thread.join(get_option("CLOSE_WAIT", 5))
+
+
+async def paced_async(chunks, interval):
+    """paced 의 비동기 버전 (닫히면 읽기 작업을 취소해 업스트림도 바로 닫힘)"""
+    items = asyncio.Queue()
+
+    async def pump():
+        try:
+            async for chunk in chunks:
+                await items.put(chunk)
+        except Exception as e:
+            await items.put(_Raised(e))
+        finally:
+            await items.put(_END)
+
+    task = asyncio.create_task(pump())
+    try:
+        while True:
+            try:
+                item = await asyncio.wait_for(items.get(), interval)
+            except asyncio.TimeoutError:
+                yield IDLE
+                continue
+            if item is _END:
+                return
+            if isinstance(item, _Raised):
+                raise item.error
+            yield item
+    finally:
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
@@ -0,0 +1,212 @@
+import json
+import re
+
+JSON_MARKER = "###JSON###"
+
+# 이벤트 종류
+TEXT = "text"
+FIELD = "field"
+FINAL = "final"
+ERROR = "error"
+RESULT = "result"  # 저장될 FoodResult id (final 직후)
+
+# SSE 줄 구분자 (\r\n, \r, \n 모두 줄바꿈으로 해석됨)
+_LINE_BREAK = re.compile(r"\r\n|\r|\n")
+
+
+def use_typed_events(request):
+    """?events=typed 면 event: text/field/final 형식의 SSE 사용"""
+    return request.GET.get("events", "").lower() == "typed"
+
+
+class StreamJSONParser:
+    """
+    스트리밍 응답을 청크 단위로 파싱합니다.
+
+    ###JSON### 마커 이전은 대화형 텍스트로 바로 내보내고, 마커 이후는 클라이언트에
+    텍스트로 보내지 않고 JSON 객체를 점진적으로 스캔합니다.
+    객체 안의 필드가 완성될 때마다 field 이벤트를, 최상위 객체가 닫히면 final 이벤트를
+    만듭니다. (응답 전체를 모아 두지 않고 JSON 부분만 보관)
+
+    feed()/close()는 (종류, 값) 튜플 목록을 반환합니다.
+    fields=False 면 field 이벤트를 만들지 않습니다. (기존 형식 클라이언트)
+    """
+
+    def __init__(self, fields=True):
+        self.fields = fields
+        self._pending = ""  # 마커 일부일 수 있어 아직 내보내지 않은 텍스트
+        self._in_json = False
+        self._json = ""  # 마커 이후 텍스트
+        self._pos = 0  # self._json 에서 다음에 스캔할 위치
+        self._start = None  # 최상위 객체 시작 위치
+        self._stack = []  # 열린 객체/배열
+        self._in_string = False
+        self._escape = False
+        self._finished = False
+        self.final = None
+
+    def feed(self, text):
+        if not text or self._finished:
+            return []
+        if self._in_json:
+            self._json += text
+            return self._scan()
+
+        self._pending += text
+        index = self._pending.find(JSON_MARKER)
+        if index >= 0:
+            events = self._text_event(self._pending[:index])
+            self._in_json = True
+            self._json = self._pending[index + len(JSON_MARKER) :]
+            self._pending = ""
+            return events + self._scan()
+
+        # 청크 경계에 걸친 마커를 위해 마커의 앞부분과 일치하는 꼬리는 남겨 둠
+        keep = self._marker_prefix_length(self._pending)
+        cut = len(self._pending) - keep
+        events = self._text_event(self._pending[:cut])
+        self._pending = self._pending[cut:]
+        return events
+
+    def close(self):
+        """스트림 종료 시 호출 (마커가 없으면 남은 텍스트만 반환)"""
+        if not self._in_json:
+            events = self._text_event(self._pending)
+            self._pending = ""
+            return events
+        if self.final is not None or self._finished:
+            return []
+        # 마커 이후 JSON 객체가 끝나지 않은 채 스트림이 종료됨
+        return [(ERROR, "JSON 객체가 완성되지 않았습니다.")]
+
+    @staticmethod
+    def _marker_prefix_length(text):
+        for length in range(min(len(text), len(JSON_MARKER) - 1), 0, -1):
+            if JSON_MARKER.startswith(text[-length:]):
+                return length
+        return 0
+
+    @staticmethod
+    def _text_event(text):
+        return [(TEXT, text)] if text else []
+
+    def _scan(self):
+        events = []
+        buf = self._json
+        for i in range(self._pos, len(buf)):
+            char = buf[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if self._start is None:
+                # 코드 블록 표시(```json) 등은 건너뛰고 첫 { 부터 시작
+                if char == "{":
+                    self._start = i
+                    self._stack.append({"type": "{", "start": i + 1, "path": []})
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                parent = self._stack[-1]
+                path = None
+                if char == "{" and parent["type"] == "{" and parent["path"] is not None:
+                    key = self._member_key(buf[parent["start"] : i])
+                    if key is not None:
+                        path = parent["path"] + [key]
+                self._stack.append({"type": char, "start": i + 1, "path": path})
+            elif char == ",":
+                events += self._complete_member(buf, i)
+            elif char in "}]":
+                events += self._complete_member(buf, i)
+                self._stack.pop()
+                if not self._stack:
+                    events += self._finish(buf[self._start : i + 1])
+                    self._pos = len(buf)
+                    return events
+        self._pos = len(buf)
+        return events
+
+    @staticmethod
+    def _member_key(text):
+        """'"key": ' 형태의 텍스트에서 키 추출"""
+        key, _, _ = text.partition(":")
+        try:
+            key = json.loads(key)
+        except json.JSONDecodeError:
+            return None
+        return key if isinstance(key, str) else None
+
+    def _complete_member(self, buf, end):
+        """객체의 필드 하나가 끝났으면 field 이벤트 생성 (하위 객체는 필드별로 이미 전송)"""
+        frame = self._stack[-1]
+        member = buf[frame["start"] : end]
+        frame["start"] = end + 1
+        if not self.fields or frame["type"] != "{" or frame["path"] is None:
+            return []
+        if not member.strip():  # 빈 객체
+            return []
+        try:
+            ((key, value),) = json.loads("{" + member + "}").items()
+        except (json.JSONDecodeError, ValueError):
+            # 모델이 형식에 맞지 않는 값을 넣은 경우 final 에서 처리
+            return []
+        if isinstance(value, dict):
+            return []
+        return [(FIELD, {"path": ".".join(frame["path"] + [key]), "value": value})]
+
+    def _finish(self, text):
+        self._finished = True
+        try:
+            self.final = json.loads(text)
+        except json.JSONDecodeError as e:
+            return [(ERROR, str(e))]
+        return [(FINAL, self.final)]
+
+
+def format_data(value):
+    """
+    data 필드 프레임 (여러 줄이면 줄마다 data: 로 나눔)
+
+    줄바꿈을 그대로 넣으면 빈 줄에서 이벤트가 끊기거나 다음 줄이 다른 필드로
+    해석되므로, 줄마다 data: 를 붙여 클라이언트가 \n 으로 이어 붙인 원문을 받게 합니다.
+    """
+    return "".join(f"data: {line}\n" for line in _LINE_BREAK.split(value)) + "\n"
+
+
+def format_event(kind, value, typed=False):
+    """
+    이벤트를 SSE 프레임으로 변환합니다.
+
+    typed=False 면 기존 클라이언트용 형식(data: 텍스트 / FINAL_JSON: / RESULT_ID: /
+    JSON_ERROR:)을, typed=True 면 event: 이름과 JSON data를 사용합니다.
+    """
+    if typed:
+        if kind == TEXT:
+            value = {"text": value}
+        elif kind == ERROR:
+            value = {"detail": value}
+        elif kind == RESULT:
+            value = {"result_id": value}
+        return f"event: {kind}\n" + format_data(json.dumps(value, ensure_ascii=False))
+
+    if kind == TEXT:
+        return format_data(value)
+    if kind == FINAL:
+        return format_data(f"FINAL_JSON:{json.dumps(value)}")
+    if kind == RESULT:
+        return format_data(f"RESULT_ID:{value}")
+    return format_data(f"JSON_ERROR:{value}")
+
+
+def format_done(typed=False):
+    """스트리밍 완료 프레임"""
+    if typed:
+        return "event: done\ndata: [DONE]\n\n"
+    return "data: [DONE]\n\n"
@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+
+from apps.ai.backends import LLMBackend, TextResponse
+from apps.ai.prompts import estimate_tokens
+from django.conf import settings
+from google.api_core import exceptions as google_exceptions
+
+# settings.AI_STUB_ENGINE 으로 항목별 덮어쓰기
+DEFAULT_OPTIONS = {
+    # 일반 응답 전체 지연 / 스트리밍 첫 청크 지연 분포
+    # fixed: {"ms"} / uniform: {"min_ms", "max_ms"} / lognormal: {"median_ms", "sigma"}
+    "LATENCY": {"distribution": "lognormal", "median_ms": 1200, "sigma": 0.4},
+    "FIRST_CHUNK": {"distribution": "lognormal", "median_ms": 400, "sigma": 0.3},
+    "CHUNK_SIZE": 24,  # 스트리밍 청크 글자 수
+    "CHUNK_INTERVAL_MS": 30,
+    "ERROR_RATE": 0.0,  # 503(ServiceUnavailable) 비율
+    "SEED": None,  # 지연/오류 난수 시드 (None 이면 매번 다름)
+}
+
+# (음식명, 음식 종류, 기반, 설명, 칼로리, 단백질, 탄수화물, 지방)
+DISHES = [
+    (
+        "김치볶음밥",
+        "한식",
+        "밥",
+        "잘 익은 김치와 밥을 볶은 한 그릇 요리",
+        550,
+        15,
+        80,
+        18,
+    ),
+    ("된장찌개", "한식", "밥", "된장과 채소, 두부를 끓인 구수한 찌개", 320, 20, 25, 12),
+    ("비빔국수", "한식", "면", "새콤달콤한 양념에 비빈 소면", 480, 12, 85, 9),
+    (
+        "마파두부",
+        "중식",
+        "밥",
+        "두부와 다진 고기를 매콤하게 볶은 요리",
+        520,
+        25,
+        40,
+        28,
+    ),
+    ("연어덮밥", "일식", "밥", "간장 양념 연어를 올린 덮밥", 600, 32, 70, 20),
+    ("토마토 파스타", "양식", "면", "토마토 소스로 만든 기본 파스타", 580, 18, 90, 14),
+    ("닭가슴살 샐러드", "양식", "빵", "구운 닭가슴살과 채소 샐러드", 350, 35, 15, 14),
+    ("팟타이", "동남아", "면", "쌀국수를 새콤달콤하게 볶은 태국 요리", 620, 22, 88, 20),
+]
+
+INGREDIENTS = ["양파", "대파", "마늘", "간장", "참기름", "달걀", "두부", "애호박"]
+
+
+class UsageMetadata:
+    def __init__(self, prompt_token_count, candidates_token_count):
+        self.prompt_token_count = prompt_token_count
+        self.candidates_token_count = candidates_token_count
+
+
+def sample_ms(spec, rng):
+    distribution = spec.get("distribution", "fixed")
+    if distribution == "fixed":
+        return spec.get("ms", 0)
+    if distribution == "uniform":
+        return rng.uniform(spec["min_ms"], spec["max_ms"])
+    if distribution == "lognormal":
+        return spec["median_ms"] * math.exp(rng.gauss(0, spec.get("sigma", 0.5)))
+    raise ValueError(f"지원하지 않는 지연 분포입니다: {distribution}")
+
+
+def detect_request_type(prompt):
+    """프롬프트의 JSON 스키마 키로 요청 종류 판단"""
+    if "daily_calorie_target" in prompt:
+        return "HEALTH"
+    if "instructions" in prompt:
+        return "RECIPE"
+    if "food_name" in prompt:
+        return "FOOD"
+    return "INGREDIENT"
+
+
+def nutrition(dish):
+    return dict(zip(("calories", "protein", "carbs", "fat"), dish[4:]))
+
+
+def build_payload(request_type, rng):
+    """요청 종류별 스키마에 맞는 응답 (rng 가 같으면 같은 결과)"""
+    if request_type == "INGREDIENT":
+        # 판정 없음 (저장하지 않고 허용)
+        return {}
+
+    dish = rng.choice(DISHES)
+    if request_type == "RECIPE":
+        ingredients = rng.sample(INGREDIENTS, 3)
+        return {
+            "name": dish[0],
+            "description": dish[3],
+            "cuisine_type": dish[1],
+            "meal_type": rng.choice(["아침", "점심", "저녁"]),
+            "preparation_time": rng.choice([5, 10, 15]),
+            "cooking_time": rng.choice([10, 20, 30]),
+            "serving_size": rng.choice([1, 2, 4]),
+            "difficulty": rng.choice(["쉬움", "보통", "어려움"]),
+            "ingredients": [
+                {"name": name, "amount": f"{rng.randint(1, 3)}개"}
+                for name in ingredients
+            ],
+            "instructions": [
+                {"step": step, "description": f"{name}을(를) 손질해 넣고 익혀주세요."}
+                for step, name in enumerate(ingredients, start=1)
+            ],
+            "nutrition_info": nutrition(dish),
+        }
+    if request_type == "HEALTH":
+        meals = [
+            {
+                "type": meal_type,
+                "food_name": meal[0],
+                "food_type": meal[1],
+                "description": meal[3],
+                "nutritional_info": nutrition(meal),
+            }
+            for meal_type, meal in zip(["아침", "점심", "저녁"], rng.sample(DISHES, 3))
+        ]
+        return {
+            "daily_calorie_target": sum(
+                m["nutritional_info"]["calories"] for m in meals
+            ),
+            "protein_target": sum(m["nutritional_info"]["protein"] for m in meals),
+            "meals": meals,
+            "recommendation_reason": "목표에 맞춰 단백질과 탄수화물을 고르게 배분했습니다.",
+        }
+    return {
+        "recommendation": {
+            "food_name": dish[0],
+            "food_type": dish[1],
+            "description": dish[3],
+            "nutritional_info": nutrition(dish),
+            "recommendation_reason": f"{dish[2]} 기반의 {dish[1]} 요리를 추천합니다.",
+        }
+    }
+
+
+class StubBackend(LLMBackend):
+    """
+    로컬 부하 테스트용 가짜 LLM 엔진 (settings.AI_LLM_BACKEND = "stub")
+
+    응답 내용은 프롬프트로 결정되고(같은 프롬프트 = 같은 응답), 지연/오류는
+    AI_STUB_ENGINE 설정의 분포를 따릅니다. 유료 API 없이 전체 요청 경로를 측정할 수 있습니다.
+    """
+
+    def __init__(self, options=None):
+        self.overrides = options or {}
+        self._rng = random.Random(self.options["SEED"])
+        self._lock = threading.Lock()
+
+    @property
+    def options(self):
+        # 설정 변경이 바로 반영되도록 매번 합침
+        return {
+            **DEFAULT_OPTIONS,
+            **getattr(settings, "AI_STUB_ENGINE", {}),
+            **self.overrides,
+        }
+
+    def respond(self, prompt):
+        """프롬프트에 대한 응답 텍스트 (스트리밍 프롬프트면 대화형 설명 + ###JSON###)"""
+        seed = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:16], 16)
+        payload = build_payload(detect_request_type(prompt), random.Random(seed))
+        body = json.dumps(payload, ensure_ascii=False, indent=2)
+        if "###JSON###" not in prompt:
+            return body
+
+        name = (
+            payload.get("name")
+            or payload.get("recommendation", {}).get("food_name")
+            or "하루 식단"
+        )
+        return (
+            f"오늘은 {name}을(를) 추천드려요! 재료 준비부터 차근차근 설명해 드릴게요. "
+            "영양 균형을 고려해 구성했으니 맛있게 드세요.\n"
+            f"###JSON###\n```json\n{body}\n```"
+        )
+
+    def _sample_seconds(self, name):
+        with self._lock:
+            return sample_ms(self.options[name], self._rng) / 1000
+
+    def _should_fail(self):
+        with self._lock:
+            return self._rng.random() < self.options["ERROR_RATE"]
+
+    def _check(self, delay, timeout):
+        if delay > timeout:
+            raise google_exceptions.DeadlineExceeded("stub engine timeout")
+        if self._should_fail():
+            raise google_exceptions.ServiceUnavailable("stub engine error")
+
+    def _chunks(self, prompt):
+        text = self.respond(prompt)
+        size = self.options["CHUNK_SIZE"]
+        parts = [text[i : i + size] for i in range(0, len(text), size)]
+        usage = UsageMetadata(estimate_tokens(prompt), estimate_tokens(text))
+        # Gemini 와 같이 마지막 청크의 usage_metadata 로 토큰 수 확인
+        return [
+            TextResponse(part, usage if i == len(parts) - 1 else None)
+            for i, part in enumerate(parts)
+        ]
+
+    def generate(self, prompt, timeout):
+        delay = self._sample_seconds("LATENCY")
+        time.sleep(min(delay, timeout))
+        self._check(delay, timeout)
+        text = self.respond(prompt)
+        return TextResponse(
+            text, UsageMetadata(estimate_tokens(prompt), estimate_tokens(text))
+        )
+
+    def stream(self, prompt, timeout):
+        delay = self._sample_seconds("FIRST_CHUNK")
+        time.sleep(min(delay, timeout))
+        self._check(delay, timeout)
+        return self._iter_chunks(prompt)
+
+    def _iter_chunks(self, prompt):
+        interval = self.options["CHUNK_INTERVAL_MS"] / 1000
+        for i, chunk in enumerate(self._chunks(prompt)):
+            if i:
+                time.sleep(interval)
+            yield chunk
+
+    async def stream_async(self, prompt, timeout):
+        delay = self._sample_seconds("FIRST_CHUNK")
+        await asyncio.sleep(min(delay, timeout))
+        self._check(delay, timeout)
+        interval = self.options["CHUNK_INTERVAL_MS"] / 1000
+        for i, chunk in enumerate(self._chunks(prompt)):
+            if i:
+                await asyncio.sleep(interval)
+            yield chunk
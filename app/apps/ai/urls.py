@@ -1,7 +1,17 @@
+from apps.ai.async_views import (
+    AsyncFoodRecommendationView,
+    AsyncHealthBasedRecommendationView,
+    AsyncRecipeRecommendationView,
+    AsyncStreamResumeView,
+)
 from apps.ai.views import (
+    AIJobStatusView,
+    AIUsageStatsView,
+    BatchRecommendationView,
     FoodRecommendationView,
     HealthBasedRecommendationView,
     MenuRecommendListView,
+    NutritionSummaryView,
     RecipeRecommendationView,
 )
 from django.urls.conf import path
@@ -24,6 +34,48 @@ urlpatterns = [
         FoodRecommendationView.as_view(),
         name="food-recommendation",
     ),
+    # ASGI(비동기) 스트리밍 전용 엔드포인트
+    path(
+        "recipe-recommendation/stream/",
+        AsyncRecipeRecommendationView.as_view(),
+        name="recipe-recommendation-stream",
+    ),
+    path(
+        "health-recommendation/stream/",
+        AsyncHealthBasedRecommendationView.as_view(),
+        name="health-recommendation-stream",
+    ),
+    path(
+        "food-recommendation/stream/",
+        AsyncFoodRecommendationView.as_view(),
+        name="food-recommendation-stream",
+    ),
+    # 이어받기도 새 프레임을 기다리는 동안 워커를 점유하지 않도록 ASGI 에서 처리
+    path(
+        "streams/<str:generation_id>/",
+        AsyncStreamResumeView.as_view(),
+        name="stream-resume",
+    ),
+    path(
+        "batch-recommendation/",
+        BatchRecommendationView.as_view(),
+        name="batch-recommendation",
+    ),
+    path(
+        "jobs/<uuid:job_id>/",
+        AIJobStatusView.as_view(),
+        name="job-status",
+    ),
+    path(
+        "usage/",
+        AIUsageStatsView.as_view(),
+        name="usage-stats",
+    ),
+    path(
+        "nutrition-summary/",
+        NutritionSummaryView.as_view(),
+        name="nutrition-summary",
+    ),
     path(
         "food-result/",
         MenuRecommendListView.as_view(),
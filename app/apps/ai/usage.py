@@ -0,0 +1,313 @@
+import logging
+import math
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import timedelta
+
+from apps.ai.backends import UpstreamCancelled
+from apps.ai.client import AIUnavailableError
+from apps.ai.singleflight import SharedResponse
+from django.conf import settings
+from django.utils import timezone
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+USAGE_KEY_PREFIX = "ai:usage"
+REQUEST_TYPES = ("RECIPE", "HEALTH", "FOOD", "INGREDIENT")
+
+# 지연 히스토그램 구간 상한 (ms, 마지막 구간을 넘으면 마지막 구간에 포함)
+LATENCY_BUCKETS = (
+    50,
+    100,
+    200,
+    300,
+    500,
+    750,
+    1000,
+    1500,
+    2000,
+    3000,
+    5000,
+    7500,
+    10000,
+    15000,
+    20000,
+    30000,
+    60000,
+    120000,
+)
+
+# collect_usage() 안에서 기록된 호출 목록
+_collected_calls = ContextVar("ai_usage_calls", default=None)
+
+
+@contextmanager
+def collect_usage():
+    """블록 안에서 발생한 Gemini 호출 기록을 모아 FoodResult.usage 로 저장할 수 있게 함"""
+    calls = []
+    token = _collected_calls.set(calls)
+    try:
+        yield calls
+    finally:
+        _collected_calls.reset(token)
+
+
+def get_token_counts(response):
+    """응답의 usage_metadata 에서 (프롬프트 토큰, 출력 토큰) 추출 (없으면 None)"""
+    metadata = getattr(response, "usage_metadata", None)
+    counts = []
+    for name in ("prompt_token_count", "candidates_token_count"):
+        value = getattr(metadata, name, None)
+        counts.append(value if isinstance(value, int) else None)
+    return tuple(counts)
+
+
+def get_outcome(error):
+    if isinstance(error, AIUnavailableError):
+        return error.code
+    return "error"
+
+
+def meter(request_type, user, call):
+    """
+    Gemini 호출 1회를 계측합니다. (토큰/지연/결과)
+
+    다른 요청의 결과를 공유받은 경우(single-flight)는 outcome=shared, 토큰 0 으로 기록합니다.
+    """
+    started = time.monotonic()
+    try:
+        response = call()
+    except Exception as e:
+        record_call(request_type, user, started, outcome=get_outcome(e))
+        raise
+    outcome = "shared" if isinstance(response, SharedResponse) else "success"
+    record_call(request_type, user, started, response, time.monotonic(), outcome)
+    return response
+
+
+def meter_stream(request_type, user, chunks, records=None):
+    """스트리밍 호출 계측 (첫 청크까지의 시간 포함, 토큰은 마지막 청크 기준)"""
+    started = time.monotonic()
+    first_chunk_at, last_chunk = None, None
+    outcome = "aborted"  # 클라이언트가 중간에 끊은 경우
+    try:
+        for chunk in chunks:
+            if first_chunk_at is None:
+                first_chunk_at = time.monotonic()
+            last_chunk = chunk
+            yield chunk
+        outcome = "shared" if isinstance(last_chunk, SharedResponse) else "success"
+    except UpstreamCancelled:
+        # 소비하는 쪽(paced)이 업스트림을 직접 닫은 경우도 중단으로 기록
+        raise
+    except Exception as e:
+        outcome = get_outcome(e)
+        raise
+    finally:
+        # 중간에 닫힌 경우 업스트림 스트림도 바로 닫음
+        if hasattr(chunks, "close"):
+            chunks.close()
+        record_call(
+            request_type, user, started, last_chunk, first_chunk_at, outcome, records
+        )
+
+
+async def meter_stream_async(request_type, user, chunks, records=None):
+    """meter_stream 의 비동기 버전"""
+    started = time.monotonic()
+    first_chunk_at, last_chunk = None, None
+    outcome = "aborted"
+    try:
+        async for chunk in chunks:
+            if first_chunk_at is None:
+                first_chunk_at = time.monotonic()
+            last_chunk = chunk
+            yield chunk
+        outcome = "success"
+    except Exception as e:
+        outcome = get_outcome(e)
+        raise
+    finally:
+        if hasattr(chunks, "aclose"):
+            await chunks.aclose()
+        record_call(
+            request_type, user, started, last_chunk, first_chunk_at, outcome, records
+        )
+
+
+def record_call(
+    request_type,
+    user,
+    started,
+    response=None,
+    first_token_at=None,
+    outcome="success",
+    records=None,
+):
+    """호출 기록을 만들고 Redis 집계에 반영 (collect_usage / records 에도 추가)"""
+    now = time.monotonic()
+    prompt_tokens, output_tokens = get_token_counts(response)
+    record = {
+        "request_type": request_type,
+        "outcome": outcome,
+        "prompt_tokens": prompt_tokens,
+        "output_tokens": output_tokens,
+        "ttft_ms": (
+            round((first_token_at - started) * 1000) if first_token_at else None
+        ),
+        "latency_ms": round((now - started) * 1000),
+        "created_at": timezone.now().isoformat(),
+    }
+
+    if records is None:
+        records = _collected_calls.get()
+    if records is not None:
+        records.append(record)
+
+    user_id = str(user.pk) if getattr(user, "pk", None) else None
+    try:
+        aggregate_call(record, user_id)
+    except Exception:
+        # 계측 실패로 요청이 실패하지 않도록 함
+        logger.warning("AI 사용량 집계 실패", exc_info=True)
+    return record
+
+
+def get_bucket(value):
+    for bound in LATENCY_BUCKETS:
+        if value <= bound:
+            return bound
+    return LATENCY_BUCKETS[-1]
+
+
+def get_usage_key(day, kind, name):
+    return f"{USAGE_KEY_PREFIX}:{day}:{kind}:{name}"
+
+
+def aggregate_call(record, user_id=None):
+    """일자별로 요청 타입 / 사용자 단위 해시에 누적"""
+    day = timezone.localdate().isoformat()
+    ttl = getattr(settings, "AI_USAGE_RETENTION_DAYS", 35) * 60 * 60 * 24
+    keys = [get_usage_key(day, "type", record["request_type"])]
+    if user_id:
+        keys.append(get_usage_key(day, "user", user_id))
+
+    pipe = get_redis_connection("default").pipeline(transaction=False)
+    for key in keys:
+        pipe.hincrby(key, "calls", 1)
+        pipe.hincrby(key, f"outcome:{record['outcome']}", 1)
+        pipe.hincrby(key, "prompt_tokens", record["prompt_tokens"] or 0)
+        pipe.hincrby(key, "output_tokens", record["output_tokens"] or 0)
+        pipe.hincrby(key, f"latency:{get_bucket(record['latency_ms'])}", 1)
+        if record["ttft_ms"] is not None:
+            pipe.hincrby(key, f"ttft:{get_bucket(record['ttft_ms'])}", 1)
+        pipe.expire(key, ttl)
+    if user_id:
+        users_key = f"{USAGE_KEY_PREFIX}:{day}:users"
+        pipe.sadd(users_key, user_id)
+        pipe.expire(users_key, ttl)
+    pipe.execute()
+
+
+def percentiles(counter, prefix):
+    """히스토그램에서 p50/p95/p99 (구간 상한값, ms)"""
+    buckets = sorted(
+        (int(field.split(":", 1)[1]), count)
+        for field, count in counter.items()
+        if field.startswith(f"{prefix}:")
+    )
+    total = sum(count for _, count in buckets)
+    result = {}
+    for q in (50, 95, 99):
+        rank, seen = math.ceil(total * q / 100), 0
+        result[f"p{q}"] = None
+        for bound, count in buckets:
+            seen += count
+            if total and seen >= rank:
+                result[f"p{q}"] = bound
+                break
+    return result
+
+
+def summarize(counter):
+    return {
+        "calls": counter["calls"],
+        "outcomes": {
+            field.split(":", 1)[1]: count
+            for field, count in counter.items()
+            if field.startswith("outcome:")
+        },
+        "prompt_tokens": counter["prompt_tokens"],
+        "output_tokens": counter["output_tokens"],
+        "total_tokens": counter["prompt_tokens"] + counter["output_tokens"],
+        "latency_ms": percentiles(counter, "latency"),
+        "ttft_ms": percentiles(counter, "ttft"),
+    }
+
+
+def _to_counter(values):
+    return Counter(
+        {field.decode("utf-8"): int(value) for field, value in values.items()}
+    )
+
+
+def get_usage_stats(days=7, user_id=None):
+    """
+    최근 N일 사용량 통계 (요청 타입별 / 사용자별 / 일자별)
+
+    요청 타입별 집계에는 사용자 구분이 없으므로 user_id 로 조회하면 by_type 은 제외합니다.
+    Redis 조회는 파이프라인으로 묶어 보냅니다. (사용자 목록 1번 + 해시 1번)
+
+    Returns:
+        dict: {"by_type": {...}, "by_user": {...}, "days": [{"date", "by_type", "by_user"}]}
+    """
+    conn = get_redis_connection("default")
+    today = timezone.localdate()
+    dates = [(today - timedelta(days=offset)).isoformat() for offset in range(days)]
+
+    if user_id:
+        users_by_day = [[str(user_id)] for _ in dates]
+    else:
+        pipe = conn.pipeline(transaction=False)
+        for day in dates:
+            pipe.smembers(f"{USAGE_KEY_PREFIX}:{day}:users")
+        users_by_day = [
+            sorted(member.decode("utf-8") for member in members)
+            for members in pipe.execute()
+        ]
+    request_types = () if user_id else REQUEST_TYPES
+
+    pipe = conn.pipeline(transaction=False)
+    for day, user_ids in zip(dates, users_by_day):
+        for request_type in request_types:
+            pipe.hgetall(get_usage_key(day, "type", request_type))
+        for uid in user_ids:
+            pipe.hgetall(get_usage_key(day, "user", uid))
+    hashes = iter(pipe.execute())
+
+    type_totals, user_totals, daily = {}, {}, []
+    for day, user_ids in zip(dates, users_by_day):
+        by_type = {
+            request_type: _to_counter(next(hashes)) for request_type in request_types
+        }
+        by_user = {uid: _to_counter(next(hashes)) for uid in user_ids}
+
+        for totals, counters in ((type_totals, by_type), (user_totals, by_user)):
+            for name, counter in counters.items():
+                totals.setdefault(name, Counter()).update(counter)
+
+        entry = {"date": day}
+        if not user_id:
+            entry["by_type"] = {k: summarize(v) for k, v in by_type.items() if v}
+        entry["by_user"] = {k: summarize(v) for k, v in by_user.items() if v}
+        daily.append(entry)
+
+    stats = {}
+    if not user_id:
+        stats["by_type"] = {k: summarize(v) for k, v in type_totals.items() if v}
+    stats["by_user"] = {k: summarize(v) for k, v in user_totals.items() if v}
+    stats["days"] = daily
+    return stats
@@ -1,12 +1,16 @@
-import json
-import logging
-
-from apps.ai.models import (
-    FoodRequest,
-    FoodResult,
-    RecipeRequest,
-    UserHealthRequest,
-)
+import uuid
+from datetime import date
+
+from apps.ai.batch import get_max_items, run_batch
+from apps.ai.cache import use_response_cache
+from apps.ai.cancellation import get_cancellation_stats
+from apps.ai.client import AIUnavailableError
+from apps.ai.jobs import SUCCESS, enqueue_recommendation, get_job, use_job_mode
+from apps.ai.models import FoodRequest, FoodResult, RecipeRequest, UserHealthRequest
+from apps.ai.nutrition import PERIOD_DAYS, get_nutrition_summary
+from apps.ai.pool import get_pool_stats, take_food
+from apps.ai.resumable import stream_with_resume
+from apps.ai.search import search_results
 from apps.ai.serializers import (
     FoodRequestSerializer,
     HealthRequestSerializer,
@@ -14,41 +18,56 @@ from apps.ai.serializers import (
     RecipeRequestSerializer,
 )
 from apps.ai.service import (
-    food_prompt,
-    health_prompt,
-    recipe_prompt,
     stream_food_prompt,
     stream_health_prompt,
     stream_recipe_prompt,
 )
+from apps.ai.usage import collect_usage, get_usage_stats
 from apps.ai.utils import (
+    AIResponseParseError,
     GeminiClient,
-    clean_json_code_block,
-    model,
+    generate_recommendation,
+    save_ai_result,
     stream_response,
     validate_ingredients,
 )
-from apps.log.models import ActivityLog
 from apps.log.views import get_client_ip
 from apps.utils.authentication import IsAuthenticatedJWTAuthentication
 from apps.utils.pagination import Pagination
 from apps.utils.throttle import BurstRateThrottle, SustainedRateThrottle
 from django.contrib.auth import get_user_model
-from django.contrib.contenttypes.models import ContentType
-from django.http import StreamingHttpResponse
+from django.contrib.contenttypes.prefetch import GenericPrefetch
+from django.db.models import F, prefetch_related_objects
+from django.urls import reverse
 from django_filters import CharFilter, filters
 from django_filters.rest_framework import DjangoFilterBackend, FilterSet
 from drf_yasg import openapi
 from drf_yasg.utils import swagger_auto_schema
 from rest_framework import generics, status
 from rest_framework.exceptions import AuthenticationFailed, PermissionDenied
-from rest_framework.filters import SearchFilter
+from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 User = get_user_model()
 
 
+def enqueue_response(request_type, ai_request, request, use_cache):
+    """백그라운드 작업 등록 후 202 응답 (결과는 작업 조회 API로 확인)"""
+    job_id = enqueue_recommendation(
+        request_type, ai_request, request.user, get_client_ip(request), use_cache
+    )
+    return Response(
+        {
+            "success": True,
+            "job_id": job_id,
+            "request_id": ai_request.id,
+            "status_url": reverse("ai:job-status", kwargs={"job_id": job_id}),
+        },
+        status=status.HTTP_202_ACCEPTED,
+    )
+
+
 class RecipeRecommendationView(APIView):
     """
     메인 페이지: 보유 식재료 기반 요리 추천 AI 시스템
@@ -59,7 +78,11 @@ class RecipeRecommendationView(APIView):
 
     @swagger_auto_schema(
         security=[{"Bearer": []}],
-        description="사용자가 입력한 식재료를 기반으로 요리 레시피를 추천",
+        description=(
+            "사용자가 입력한 식재료를 기반으로 요리 레시피를 추천"
+            "\n- `?cache=false`: 캐시된 응답을 사용하지 않고 새로 생성"
+            "\n- `?async=true`: 작업 등록 후 202 + job_id 반환 (`jobs/<job_id>/`로 결과 조회)"
+        ),
         request_body=RecipeRequestSerializer,
         responses={
             200: openapi.Response(description="msg:레시피 추천 성공."),
@@ -92,7 +115,7 @@ class RecipeRecommendationView(APIView):
             validated_data = serializer.validated_data
             ingredients = validated_data.get("ingredients", [])
             # 식재료 유효성 검사
-            is_valid, invalid_items = validate_ingredients(ingredients)
+            is_valid, invalid_items = validate_ingredients(ingredients, request.user)
             if not is_valid:
                 return Response(
                     {
@@ -111,67 +134,66 @@ class RecipeRecommendationView(APIView):
                 request.query_params.get("streaming", "false").lower() == "true"
             )
 
+            # 백그라운드 작업 모드: 작업 등록 후 바로 202 응답
+            if not streaming_mode and use_job_mode(request):
+                return enqueue_response(
+                    "RECIPE", ai_request, request, use_response_cache(request)
+                )
+
             # Gemini API 요청 프롬프트 구성
             if streaming_mode:
                 prompt = stream_recipe_prompt(validated_data)
 
                 # 스트리밍 응답 반환
-                response = StreamingHttpResponse(
-                    stream_response(prompt, request, ai_request),
-                    content_type="text/event-stream",
+                return stream_with_resume(
+                    stream_response(prompt, request, ai_request), request
                 )
-                response["Cache-Control"] = "no-cache"
-                response["X-Accel-Buffering"] = "no"
-                return response
             else:
-                prompt = recipe_prompt(validated_data)
-
-                # Gemini API 호출
-                response = GeminiClient.generate_content_recipe_prompt(prompt)
-
                 try:
-                    # JSON 파싱 시도
-                    response_text = clean_json_code_block(response.text)
-
-                    # JSON 파싱
-                    ai_response_data = json.loads(response_text)
-
-                    # 결과 저장
-                    recipe = FoodResult.objects.create(
-                        user=request.user,
-                        content_type=ContentType.objects.get_for_model(RecipeRequest),
-                        object_id=ai_request.pk,
-                        response_data=ai_response_data,
-                        request_type="RECIPE",
-                    )
-
-                    ActivityLog.objects.create(
-                        user_id=request.user,
-                        action="RECIPE_REQUEST",
-                        ip_address=get_client_ip(request),
-                    )
-
-                    return Response(
-                        {
-                            "success": True,
-                            "recipe_id": str(recipe.id),
-                            "recipe": ai_response_data,
-                        },
-                        status=status.HTTP_200_OK,
-                    )
-
-                except json.JSONDecodeError:
+                    # 같은 입력의 최근 응답이 있으면 캐시 사용, 없으면 Gemini API 호출
+                    with collect_usage() as usage:
+                        ai_response_data = generate_recommendation(
+                            "RECIPE",
+                            validated_data,
+                            use_cache=use_response_cache(request),
+                            user=request.user,
+                        )
+                except AIResponseParseError as e:
                     # JSON 파싱 실패 시 원본 텍스트 반환
                     return Response(
                         {
                             "success": False,
                             "error": "AI 응답을 파싱할 수 없습니다.",
-                            "raw_response": response.text,
+                            "raw_response": e.raw_response,
                             "code": "internal_error",
                         },
                         status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     )
 
+                # 결과 저장 (캐시 히트여도 히스토리를 위해 저장)
+                recipe = save_ai_result(
+                    request.user,
+                    get_client_ip(request),
+                    ai_request,
+                    ai_response_data,
+                    usage=usage,
+                )
+
+                return Response(
+                    {
+                        "success": True,
+                        "recipe_id": str(recipe.id),
+                        "recipe": ai_response_data,
+                    },
+                    status=status.HTTP_200_OK,
+                )
+
+        except AIUnavailableError as e:
+            # Gemini 장애/시간 초과 (서킷 브레이커가 열리면 호출 없이 바로 응답)
+            return Response(
+                {"error": str(e), "code": e.code},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
         except Exception as e:
             return Response(
                 {"error": str(e), "code": "internal_error"},
@@ -189,7 +211,11 @@ class HealthBasedRecommendationView(APIView):
 
     @swagger_auto_schema(
         security=[{"Bearer": []}],
-        description="사용자의 건강 목표와 신체 정보를 기반으로 식단을 추천",
+        description=(
+            "사용자의 건강 목표와 신체 정보를 기반으로 식단을 추천"
+            "\n- `?cache=false`: 캐시된 응답을 사용하지 않고 새로 생성"
+            "\n- `?async=true`: 작업 등록 후 202 + job_id 반환 (`jobs/<job_id>/`로 결과 조회)"
+        ),
         request_body=HealthRequestSerializer,
         responses={
             200: openapi.Response(description="msg:건강 식단 추천 성공."),
@@ -226,6 +252,12 @@ class HealthBasedRecommendationView(APIView):
                 request.query_params.get("streaming", "false").lower() == "true"
             )
 
+            # 백그라운드 작업 모드: 작업 등록 후 바로 202 응답
+            if not streaming_mode and use_job_mode(request):
+                return enqueue_response(
+                    "HEALTH", ai_request, request, use_response_cache(request)
+                )
+
             # 알레르기, 비선호 음식, 목표
             allergies = validated_data.get("allergies", [])
             disliked_foods = validated_data.get("disliked_foods", [])
@@ -234,62 +266,55 @@ class HealthBasedRecommendationView(APIView):
                 # 스트리밍용 프롬프트
                 prompt = stream_health_prompt(validated_data, allergies, disliked_foods)
                 # 스트리밍 응답 반환
-                return StreamingHttpResponse(
-                    stream_response(prompt, request, ai_request),
-                    content_type="text/event-stream",
+                return stream_with_resume(
+                    stream_response(prompt, request, ai_request), request
                 )
             else:
-                # 일반 JSON 응답용 프롬프트
-                prompt = health_prompt(validated_data, allergies, disliked_foods)
-
-                # Gemini API 호출
-                response = GeminiClient.generate_content_health_prompt(prompt)
-
                 try:
-                    # JSON 파싱 시도
-                    response_text = clean_json_code_block(response.text)
-
-                    # JSON 파싱
-                    ai_response_data = json.loads(response_text)
-
-                    # 결과 저장
-                    health = FoodResult.objects.create(
-                        user=request.user,
-                        content_type=ContentType.objects.get_for_model(
-                            UserHealthRequest
-                        ),
-                        object_id=ai_request.pk,
-                        response_data=ai_response_data,
-                        request_type="HEALTH",
-                    )
-
-                    ActivityLog.objects.create(
-                        user_id=request.user,
-                        action="HEALTH_REQUEST",
-                        ip_address=get_client_ip(request),
-                    )
-
-                    return Response(
-                        {
-                            "success": True,
-                            "request_id": ai_request.id,
-                            "meal_plan": ai_response_data,
-                        },
-                        status=status.HTTP_200_OK,
-                    )
-
-                except json.JSONDecodeError:
+                    # 같은 입력의 최근 응답이 있으면 캐시 사용, 없으면 Gemini API 호출
+                    with collect_usage() as usage:
+                        ai_response_data = generate_recommendation(
+                            "HEALTH",
+                            validated_data,
+                            use_cache=use_response_cache(request),
+                            user=request.user,
+                        )
+                except AIResponseParseError as e:
                     # JSON 파싱 실패 시 원본 텍스트 반환
                     return Response(
                         {
                             "success": False,
                             "error": "AI 응답을 파싱할 수 없습니다.",
-                            "raw_response": response.text,
+                            "raw_response": e.raw_response,
                             "code": "internal_error",
                         },
                         status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     )
 
+                # 결과 저장 (캐시 히트여도 히스토리를 위해 저장)
+                save_ai_result(
+                    request.user,
+                    get_client_ip(request),
+                    ai_request,
+                    ai_response_data,
+                    usage=usage,
+                )
+
+                return Response(
+                    {
+                        "success": True,
+                        "request_id": ai_request.id,
+                        "meal_plan": ai_response_data,
+                    },
+                    status=status.HTTP_200_OK,
+                )
+
+        except AIUnavailableError as e:
+            # Gemini 장애/시간 초과 (서킷 브레이커가 열리면 호출 없이 바로 응답)
+            return Response(
+                {"error": str(e), "code": e.code},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
         except Exception as e:
             return Response(
                 {"error": str(e), "code": "internal_error"},
@@ -307,7 +332,12 @@ class FoodRecommendationView(APIView):
 
     @swagger_auto_schema(
         security=[{"Bearer": []}],
-        description="사용자의 음식 선호도를 기반으로 음식을 추천",
+        description=(
+            "사용자의 음식 선호도를 기반으로 음식을 추천"
+            "\n- `last_meal` 없이 정해진 선택지로만 요청하면 미리 생성해 둔 추천 중 하나를 돌아가며 응답"
+            "\n- `?cache=false`: 캐시/미리 생성된 응답을 사용하지 않고 새로 생성"
+            "\n- `?async=true`: 작업 등록 후 202 + job_id 반환 (`jobs/<job_id>/`로 결과 조회)"
+        ),
         request_body=FoodRequestSerializer,
         responses={
             200: openapi.Response(description="msg:음식 추천 성공."),
@@ -346,6 +376,12 @@ class FoodRecommendationView(APIView):
                 request.query_params.get("streaming", "false").lower() == "true"
             )
 
+            # 백그라운드 작업 모드: 작업 등록 후 바로 202 응답
+            if not streaming_mode and use_job_mode(request):
+                return enqueue_response(
+                    "FOOD", ai_request, request, use_response_cache(request)
+                )
+
             # 음식 선호도 정보 추출
             cuisine_type = validated_data.get("cuisine_type", "")
             food_base = validated_data.get("food_base", "")
@@ -364,64 +400,62 @@ class FoodRecommendationView(APIView):
                 )
 
                 # 스트리밍 응답 반환
-                return StreamingHttpResponse(
-                    stream_response(prompt, request, ai_request),
-                    content_type="text/event-stream",
+                return stream_with_resume(
+                    stream_response(prompt, request, ai_request), request
                 )
             else:
-                # 일반 JSON 응답용 프롬프트
-                prompt = food_prompt(
-                    cuisine_type, food_base, taste, dietary_type, last_meal
-                )
-
-                # Gemini API 호출
-                response = GeminiClient.generate_content_food_prompt(prompt)
-
                 try:
-                    # JSON 파싱 시도
-                    response_text = clean_json_code_block(response.text)
-
-                    # JSON 파싱
-                    ai_response_data = json.loads(response_text)
-
-                    # 결과 저장
-                    food = FoodResult.objects.create(
-                        user=request.user,
-                        content_type=ContentType.objects.get_for_model(FoodRequest),
-                        object_id=ai_request.pk,
-                        response_data=ai_response_data,
-                        request_type="FOOD",
-                    )
-
-                    ActivityLog.objects.create(
-                        user_id=request.user,
-                        action="FOOD_REQUEST",
-                        ip_address=get_client_ip(request),
-                    )
-
-                    return Response(
-                        {
-                            "success": True,
-                            "request_id": ai_request.id,
-                            "recommendation": ai_response_data,
-                        },
-                        status=status.HTTP_200_OK,
-                    )
-
-                except json.JSONDecodeError:
+                    # 선택지 조합 요청은 미리 만든 풀에서 응답 (최근 식사 입력/풀 미스 시 실시간 생성)
+                    # 같은 입력의 최근 응답이 있으면 캐시 사용, 없으면 Gemini API 호출
+                    with collect_usage() as usage:
+                        ai_response_data = None
+                        if use_response_cache(request):
+                            ai_response_data = take_food(validated_data)
+                        if ai_response_data is None:
+                            ai_response_data = generate_recommendation(
+                                "FOOD",
+                                validated_data,
+                                use_cache=use_response_cache(request),
+                                user=request.user,
+                            )
+                except AIResponseParseError as e:
                     # JSON 파싱 실패 시 원본 텍스트 반환
-                    ai_request.response_data = {"raw_response": response.text}
+                    ai_request.response_data = {"raw_response": e.raw_response}
                     ai_request.save()
                     return Response(
                         {
                             "success": False,
                             "error": "AI 응답을 파싱할 수 없습니다.",
-                            "raw_response": response.text,
+                            "raw_response": e.raw_response,
                             "code": "internal_error",
                         },
                         status=status.HTTP_500_INTERNAL_SERVER_ERROR,
                     )
 
+                # 결과 저장 (캐시 히트여도 히스토리를 위해 저장)
+                save_ai_result(
+                    request.user,
+                    get_client_ip(request),
+                    ai_request,
+                    ai_response_data,
+                    usage=usage,
+                )
+
+                return Response(
+                    {
+                        "success": True,
+                        "request_id": ai_request.id,
+                        "recommendation": ai_response_data,
+                    },
+                    status=status.HTTP_200_OK,
+                )
+
+        except AIUnavailableError as e:
+            # Gemini 장애/시간 초과 (서킷 브레이커가 열리면 호출 없이 바로 응답)
+            return Response(
+                {"error": str(e), "code": e.code},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+            )
         except Exception as e:
             return Response(
                 {"error": str(e), "code": "internal_error"},
@@ -432,10 +466,41 @@ class FoodRecommendationView(APIView):
 # foodreuslt 필터 정의 - MenuRecommendListView안
 class FoodResultFilter(FilterSet):
     request_type = CharFilter(field_name="request_type", lookup_expr="exact")
+    # 음식/요리 이름, 설명, 재료 검색 (관련도 순)
+    q = CharFilter(method="filter_search")
 
     class Meta:
         model = FoodResult
-        fields = ["request_type"]
+        # 영양 정보 범위 필터 (예: ?calories__lte=600&protein__gte=30)
+        fields = {
+            "request_type": ["exact"],
+            "status": ["exact"],
+            "calories": ["gte", "lte"],
+            "protein": ["gte", "lte"],
+            "carbs": ["gte", "lte"],
+            "fat": ["gte", "lte"],
+        }
+
+    def filter_search(self, queryset, name, value):
+        return search_results(queryset, value)
+
+
+class NullsLastOrderingFilter(OrderingFilter):
+    """?ordering 정렬 시 값이 없는(null) 결과는 항상 마지막 (최신순으로 동률 정리)"""
+
+    def filter_queryset(self, request, queryset, view):
+        ordering = self.get_ordering(request, queryset, view)
+        if not ordering:
+            return queryset
+        expressions = [
+            (
+                F(field[1:]).desc(nulls_last=True)
+                if field.startswith("-")
+                else F(field).asc(nulls_last=True)
+            )
+            for field in ordering
+        ]
+        return queryset.order_by(*expressions, "-created_at")
 
 
 class MenuRecommendListView(generics.ListAPIView):
@@ -446,13 +511,24 @@ class MenuRecommendListView(generics.ListAPIView):
 
     # 필터 설정 추가 (django_filters.rest_framework 사용)
 
-    filter_backends = [DjangoFilterBackend, SearchFilter]
+    filter_backends = [DjangoFilterBackend, SearchFilter, NullsLastOrderingFilter]
     filterset_class = FoodResultFilter
     search_fields = ["^user__email"]
+    ordering_fields = ["created_at", "calories", "protein", "carbs", "fat"]
+    # 기본 status 조건은 중단된 결과만 제외하므로 관리자 전체 목록은 통계 추정치로 count
+    count_estimate_filters = {"status": FoodResult.COMPLETED}
 
     @swagger_auto_schema(
         security=[{"Bearer": []}],
-        description="AI 추천 음식 유저별 리스트 조회 / admin일 경우 전체 리스트 조회",
+        description=(
+            "AI 추천 음식 유저별 리스트 조회 / admin일 경우 전체 리스트 조회"
+            "\n- `?q=김치 찌개`: 음식/요리 이름, 설명, 재료 검색 (모든 단어 포함, 관련도 순)"
+            "\n- `?calories__lte=600&protein__gte=30`: 영양 정보 범위 필터"
+            " (건강 식단은 끼니 합계)"
+            "\n- `?ordering=-protein`: 영양 정보 정렬 (값이 없는 결과는 마지막)"
+            "\n- `?status=ABORTED`: 스트리밍 중 연결이 끊겨 중단된 결과 조회"
+            " (기본은 완료된 결과만)"
+        ),
         responses={
             200: openapi.Response(description="조회 가능 메세지 출력 x"),
             401: openapi.Response(
@@ -466,6 +542,23 @@ class MenuRecommendListView(generics.ListAPIView):
             ),
         },
     )
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        # 백필 전(스냅샷 없음) 결과만 요청 객체(GenericForeignKey)를 요청 타입별로 한 번에 조회
+        if page is not None:
+            prefetch_related_objects(
+                [result for result in page if result.request_snapshot is None],
+                GenericPrefetch(
+                    "request_object",
+                    [
+                        RecipeRequest.objects.all(),
+                        UserHealthRequest.objects.all(),
+                        FoodRequest.objects.all(),
+                    ],
+                ),
+            )
+        return page
+
     def get_queryset(self):
         try:
             # 관리자는 전체 조회 일반 사용자는 자신의 결과만
@@ -473,8 +566,12 @@ class MenuRecommendListView(generics.ListAPIView):
                 queryset = FoodResult.objects.all()
             else:
                 queryset = FoodResult.objects.filter(user=self.request.user).all()
+            # 중단된(부분) 결과는 ?status 로 요청한 경우에만
+            if "status" not in self.request.query_params:
+                queryset = queryset.filter(status=FoodResult.COMPLETED)
             # 응답 데이터 - API 명세서에 맞게 결과 리스트만 반환
 
+            # 요청 입력은 결과에 저장된 스냅샷으로 표시 (요청 테이블 조회 없음)
             return queryset
 
         # 에러코드 401 / 403 / 500
@@ -493,3 +590,247 @@ class MenuRecommendListView(generics.ListAPIView):
                 {"error": "서버 내부 오류가 발생했습니다.", "code": "internal_error"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
+
+
+class BatchRecommendationView(APIView):
+    """여러 추천 요청(주간 식단 등)을 한 번에 처리"""
+
+    throttle_classes = [SustainedRateThrottle, BurstRateThrottle]
+    permission_classes = [IsAuthenticatedJWTAuthentication]
+
+    @swagger_auto_schema(
+        security=[{"Bearer": []}],
+        description=(
+            "`items`의 각 항목(`type`: FOOD/RECIPE/HEALTH, `data`: 해당 추천 API 요청 본문)을 "
+            "동시에 생성하고 항목별 결과 또는 오류를 입력 순서대로 반환"
+            "\n- 항목 수는 최대 `AI_BATCH_MAX_ITEMS`개"
+            "\n- `?cache=false`: 캐시된 응답을 사용하지 않고 새로 생성"
+        ),
+        request_body=openapi.Schema(
+            type=openapi.TYPE_OBJECT,
+            required=["items"],
+            properties={
+                "items": openapi.Schema(
+                    type=openapi.TYPE_ARRAY,
+                    items=openapi.Schema(
+                        type=openapi.TYPE_OBJECT,
+                        properties={
+                            "type": openapi.Schema(type=openapi.TYPE_STRING),
+                            "data": openapi.Schema(type=openapi.TYPE_OBJECT),
+                        },
+                    ),
+                )
+            },
+        ),
+        responses={
+            200: openapi.Response(
+                description=(
+                    "항목별 결과 (`results[].success`가 false면 `error`, `code` 포함)\n"
+                    "- `code`:`invalid_data` / `invalid_ingredients` / `no_type` / "
+                    "`ai_unavailable` / `internal_error`"
+                )
+            ),
+            400: openapi.Response(
+                description="- `code`:`invalid_data`, items 목록이 비었거나 너무 많습니다.\n"
+            ),
+            429: openapi.Response(
+                description="- `code`:429, `error`: Too Many Requests.\n"
+            ),
+        },
+    )
+    def post(self, request):
+        items = request.data.get("items") if isinstance(request.data, dict) else None
+        max_items = get_max_items()
+        if not isinstance(items, list) or not 0 < len(items) <= max_items:
+            return Response(
+                {
+                    "error": f"items 는 1~{max_items}개의 요청 목록이어야 합니다.",
+                    "code": "invalid_data",
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        try:
+            results = run_batch(
+                items,
+                request.user,
+                get_client_ip(request),
+                use_cache=use_response_cache(request),
+            )
+        except Exception as e:
+            return Response(
+                {"error": str(e), "code": "internal_error"},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            )
+
+        return Response(
+            {
+                "success": all(item["success"] for item in results),
+                "results": results,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class AIJobStatusView(APIView):
+    """백그라운드 추천 작업 상태 및 결과 조회"""
+
+    permission_classes = [IsAuthenticatedJWTAuthentication]
+
+    @swagger_auto_schema(
+        security=[{"Bearer": []}],
+        description="`?async=true`로 등록한 추천 작업의 상태(PENDING/RUNNING/SUCCESS/FAILED)와 결과 조회",
+        responses={
+            200: openapi.Response(description="작업 상태 조회 성공"),
+            401: openapi.Response(
+                description="- `code`:`unauthorized`, 인증되지 않은 사용자입니다\n"
+            ),
+            404: openapi.Response(
+                description="- `code`:`job_not_found`, 작업을 찾을 수 없습니다.\n"
+            ),
+        },
+    )
+    def get(self, request, job_id):
+        job = get_job(job_id)
+        # 다른 사용자의 작업은 존재 여부도 노출하지 않음
+        if job is None or (
+            job["user_id"] != str(request.user.id) and not request.user.is_superuser
+        ):
+            return Response(
+                {"error": "작업을 찾을 수 없습니다.", "code": "job_not_found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        data = {
+            "job_id": job["job_id"],
+            "status": job["status"],
+            "request_type": job["request_type"],
+            "request_id": job["request_id"],
+            "result_id": job.get("result_id"),
+            "error": job.get("error"),
+            "result": None,
+        }
+        if job["status"] == SUCCESS:
+            result = FoodResult.objects.filter(id=job["result_id"]).first()
+            data["result"] = result.response_data if result else None
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class AIUsageStatsView(APIView):
+    """AI 호출 사용량 통계 (관리자 전용)"""
+
+    permission_classes = [IsAuthenticatedJWTAuthentication]
+
+    @swagger_auto_schema(
+        security=[{"Bearer": []}],
+        description=(
+            "요청 타입별 / 사용자별 / 일자별 Gemini 호출 수, 토큰 사용량, 지연(p50/p95/p99, ms)"
+            "\n- `?days=7`: 조회 기간 (최대 90일)"
+            "\n- `?user_id=`: 특정 사용자만 조회 (요청 타입별 집계 `by_type` 은 제외)"
+            "\n- `streams`: 스트림 완료/중단 수, 중단으로 아낀 출력 토큰/시간 (추정치)"
+        ),
+        manual_parameters=[
+            openapi.Parameter("days", openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter("user_id", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: openapi.Response(description="사용량 통계 조회 성공"),
+            401: openapi.Response(
+                description="- `code`:`unauthorized`, 인증되지 않은 사용자입니다\n"
+            ),
+            403: openapi.Response(
+                description="- `code`:`forbidden`, 접근 권한이 없습니다.\n"
+            ),
+        },
+    )
+    def get(self, request):
+        if not request.user.is_superuser:
+            return Response(
+                {"error": "접근 권한이 없습니다.", "code": "forbidden"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        try:
+            days = min(max(int(request.query_params.get("days", 7)), 1), 90)
+        except ValueError:
+            return Response(
+                {"error": "days는 숫자여야 합니다.", "code": "invalid_data"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        stats = get_usage_stats(days, request.query_params.get("user_id"))
+        stats["food_pool"] = get_pool_stats()
+        stats["streams"] = get_cancellation_stats()
+        return Response(stats, status=status.HTTP_200_OK)
+
+
+class NutritionSummaryView(APIView):
+    """기간별 영양 섭취 분석 (일일 합계 테이블 기준)"""
+
+    permission_classes = [IsAuthenticatedJWTAuthentication]
+
+    @swagger_auto_schema(
+        security=[{"Bearer": []}],
+        description=(
+            "레시피/음식 추천 결과의 일자별 영양 합계, 이동 평균, 최근 건강 식단의"
+            " `daily_calorie_target` 대비 차이"
+            "\n- `?period=week|month`: 조회 기간 (7일 / 30일, 기본 week)"
+            "\n- `?end=YYYY-MM-DD`: 기간 마지막 날짜 (기본 오늘)"
+            "\n- `?window=7`: 이동 평균 기간(일, 최대 30)"
+            "\n- `?user_id=`: 특정 사용자 조회 (관리자 전용)"
+        ),
+        manual_parameters=[
+            openapi.Parameter("period", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter("end", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+            openapi.Parameter("window", openapi.IN_QUERY, type=openapi.TYPE_INTEGER),
+            openapi.Parameter("user_id", openapi.IN_QUERY, type=openapi.TYPE_STRING),
+        ],
+        responses={
+            200: openapi.Response(description="영양 섭취 분석 조회 성공"),
+            400: openapi.Response(
+                description="- `code`:`invalid_data`, 잘못된 조회 조건입니다.\n"
+            ),
+            401: openapi.Response(
+                description="- `code`:`unauthorized`, 인증되지 않은 사용자입니다\n"
+            ),
+            403: openapi.Response(
+                description="- `code`:`forbidden`, 접근 권한이 없습니다.\n"
+            ),
+            404: openapi.Response(
+                description="- `code`:`not_found`, 사용자를 찾을 수 없습니다.\n"
+            ),
+        },
+    )
+    def get(self, request):
+        params = request.query_params
+        period = params.get("period", "week")
+        try:
+            if period not in PERIOD_DAYS:
+                raise ValueError
+            window = min(max(int(params.get("window", 7)), 1), 30)
+            end = date.fromisoformat(params["end"]) if params.get("end") else None
+            user_id = uuid.UUID(params["user_id"]) if params.get("user_id") else None
+        except ValueError:
+            return Response(
+                {"error": "잘못된 조회 조건입니다.", "code": "invalid_data"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        user = request.user
+        if user_id is not None and user_id != user.id:
+            if not user.is_superuser:
+                return Response(
+                    {"error": "접근 권한이 없습니다.", "code": "forbidden"},
+                    status=status.HTTP_403_FORBIDDEN,
+                )
+            user = User.objects.filter(id=user_id).first()
+            if user is None:
+                return Response(
+                    {"error": "사용자를 찾을 수 없습니다.", "code": "not_found"},
+                    status=status.HTTP_404_NOT_FOUND,
+                )
+
+        return Response(
+            get_nutrition_summary(user, period, end, window),
+            status=status.HTTP_200_OK,
+        )
@@ -0,0 +1,169 @@
+import json
+import logging
+import uuid
+
+from apps.ai.models import FoodResult
+from apps.utils import metrics
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django_redis import get_redis_connection
+
+logger = logging.getLogger(__name__)
+
+RESULT_QUEUE_KEY = "ai:results:queue"
+RESULT_PROCESSING_KEY = "ai:results:processing"  # 처리 중 (워커 비정상 종료 시 복구)
+RESULT_DEAD_KEY = "ai:results:dead"  # 재시도 횟수 초과
+
+
+def get_option(name, default):
+    return getattr(settings, f"AI_RESULT_QUEUE_{name}", default)
+
+
+class RedisResultQueue:
+    """
+    스트리밍 결과 저장 대기열 (run_result_writer 커맨드가 소비)
+
+    꺼낸 항목은 처리 중 리스트로 옮겨 두었다가 저장 후 지우므로
+    워커가 중간에 죽어도 recover() 로 다시 처리할 수 있습니다.
+    """
+
+    def __init__(self):
+        self.conn = get_redis_connection("default")
+
+    def push(self, payload):
+        self.conn.lpush(RESULT_QUEUE_KEY, json.dumps(payload, ensure_ascii=False))
+
+    def pop(self, timeout=5):
+        """(원본 문자열, payload) 또는 None"""
+        raw = self.conn.brpoplpush(
+            RESULT_QUEUE_KEY, RESULT_PROCESSING_KEY, timeout=timeout
+        )
+        if raw is None:
+            return None
+        return raw, json.loads(raw)
+
+    def ack(self, raw):
+        self.conn.lrem(RESULT_PROCESSING_KEY, 1, raw)
+
+    def retry(self, raw, payload):
+        """재시도 횟수를 늘려 다시 넣음 (최대 횟수를 넘으면 dead 리스트로)"""
+        payload = {**payload, "attempts": payload.get("attempts", 0) + 1}
+        key = (
+            RESULT_QUEUE_KEY
+            if payload["attempts"] < get_option("MAX_ATTEMPTS", 5)
+            else RESULT_DEAD_KEY
+        )
+        pipe = self.conn.pipeline()
+        pipe.lrem(RESULT_PROCESSING_KEY, 1, raw)
+        pipe.lpush(key, json.dumps(payload, ensure_ascii=False))
+        pipe.execute()
+        return key == RESULT_QUEUE_KEY
+
+    def recover(self):
+        """처리 중으로 남은 항목을 대기열로 되돌림 (워커 시작 시, 저장은 멱등)"""
+        moved = 0
+        while self.conn.rpoplpush(RESULT_PROCESSING_KEY, RESULT_QUEUE_KEY):
+            moved += 1
+        return moved
+
+    def requeue_dead(self):
+        moved = 0
+        while True:
+            raw = self.conn.rpop(RESULT_DEAD_KEY)
+            if raw is None:
+                return moved
+            self.push({**json.loads(raw), "attempts": 0})
+            moved += 1
+
+    def stats(self):
+        return {
+            "queued": self.conn.llen(RESULT_QUEUE_KEY),
+            "processing": self.conn.llen(RESULT_PROCESSING_KEY),
+            "dead": self.conn.llen(RESULT_DEAD_KEY),
+        }
+
+
+class LocalResultQueue:
+    """테스트/로컬용: 넣는 즉시 같은 프로세스에서 저장"""
+
+    def push(self, payload):
+        try:
+            save_queued_result(payload)
+        except Exception:
+            logger.exception("스트리밍 결과 저장 실패: %s", payload["result_id"])
+
+
+def get_result_queue():
+    if getattr(settings, "AI_JOB_BACKEND", "redis") == "local":
+        return LocalResultQueue()
+    return RedisResultQueue()
+
+
+def enqueue_result(
+    user,
+    ip_address,
+    ai_request,
+    response_data,
+    result_id,
+    usage=None,
+    status=FoodResult.COMPLETED,
+):
+    """
+    결과 저장을 대기열에 넣습니다. (응답 스트림은 DB 저장을 기다리지 않음)
+
+    result_id 는 스트림에서 미리 발급해 클라이언트에 보낸 FoodResult id 입니다.
+    Redis 에 넣지 못하면 바로 저장합니다.
+    """
+    payload = {
+        "result_id": str(result_id),
+        "content_type_id": ContentType.objects.get_for_model(type(ai_request)).id,
+        "request_id": str(ai_request.pk),
+        "user_id": str(user.pk),
+        "ip_address": ip_address,
+        "response_data": response_data,
+        "usage": usage or [],
+        "status": status,
+        "attempts": 0,
+    }
+    try:
+        get_result_queue().push(payload)
+    except Exception:
+        logger.warning("결과 저장 대기열 사용 불가, 바로 저장", exc_info=True)
+        metrics.incr("ai_results:fallback")
+        save_queued_result(payload)
+
+
+def save_queued_result(payload):
+    """
+    대기열의 결과 1건 저장 (같은 result_id 는 한 번만 저장)
+
+    Returns:
+        FoodResult: 저장된 (또는 이미 있던) 결과
+    """
+    # utils 가 이 모듈을 사용하므로 함수 안에서 import
+    from apps.ai.utils import save_ai_result
+
+    result_id = uuid.UUID(payload["result_id"])
+    existing = FoodResult.objects.filter(pk=result_id).first()
+    if existing is not None:
+        return existing
+
+    request_model = ContentType.objects.get_for_id(
+        payload["content_type_id"]
+    ).model_class()
+    ai_request = request_model.objects.get(pk=payload["request_id"])
+    user = get_user_model().objects.get(pk=payload["user_id"])
+    with transaction.atomic():
+        result = save_ai_result(
+            user,
+            payload["ip_address"],
+            ai_request,
+            payload["response_data"],
+            usage=payload["usage"],
+            result_id=result_id,
+            status=payload.get("status", FoodResult.COMPLETED),
+        )
+    metrics.incr("ai_results:saved")
+    return result
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class LogConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.log"
+
+    def ready(self):
+        from apps.log.models import ActivityLog
+        from apps.utils.pagination import expire_counts
+
+        # 요청마다 추가되는 로그라 목록 개수 캐시는 무효화하지 않고 짧게만 사용
+        expire_counts(ActivityLog)
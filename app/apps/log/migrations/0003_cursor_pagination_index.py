@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("log", "0002_alter_activitylog_action"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="activitylog",
+            name="log_activit_created_e7bb46_idx",
+        ),
+        migrations.AddIndex(
+            model_name="activitylog",
+            index=models.Index(
+                fields=["created_at", "id"], name="log_activit_created_4b6e92_idx"
+            ),
+        ),
+    ]
@@ -1,7 +1,15 @@
+import time
+from urllib.parse import parse_qs, urlparse
+
 from apps.log.models import ActivityLog
 from apps.report.models import Report
+from apps.utils.pagination import get_count_version_key
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import override_settings
 from django.test.testcases import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls.base import reverse
 from rest_framework.test import APITestCase
 from rest_framework_simplejwt.tokens import RefreshToken
@@ -181,3 +189,118 @@ class ActivityLogAPITest(APITestCase):
         url = reverse("log:retrieve", kwargs={"pk": id})
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
+
+
+class CursorPaginationTest(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="cursor@test.com",
+            nickname="cursor",
+            password="test1234",
+            phone_number="5678",
+        )
+        self.client.force_authenticate(self.user)
+        ActivityLog.objects.bulk_create(
+            ActivityLog(user_id=self.user, action="LOGIN", ip_address="127.0.0.1")
+            for _ in range(25)
+        )
+        # 같은 created_at 이 많아도 id 로 순서가 정해져야 함
+        first_ids = ActivityLog.objects.values_list("id", flat=True)[:12]
+        ActivityLog.objects.filter(id__in=list(first_ids)).update(
+            created_at=ActivityLog.objects.first().created_at
+        )
+        self.url = reverse("log:list-create")
+
+    def test_walks_all_rows_without_count(self):
+        response = self.client.get(self.url, {"pagination": "cursor", "page_size": 10})
+        pages = [response.data]
+        while pages[-1]["next"]:
+            pages.append(self.client.get(pages[-1]["next"]).data)
+
+        ids = [row["id"] for page in pages for row in page["results"]]
+        expected = [
+            str(pk)
+            for pk in ActivityLog.objects.order_by("-created_at", "-id").values_list(
+                "id", flat=True
+            )
+        ]
+        self.assertEqual(len(pages), 3)
+        self.assertEqual(ids, expected)
+        self.assertNotIn("count", pages[0])
+        self.assertIsNone(pages[0]["previous"])
+
+        previous = self.client.get(pages[1]["previous"]).data
+        self.assertEqual(previous["results"], pages[0]["results"])
+        self.assertIsNone(previous["previous"])
+
+    def test_cursor_page_has_created_at_range_bound(self):
+        response = self.client.get(self.url, {"pagination": "cursor", "page_size": 10})
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(response.data["next"])
+        sql = next(
+            query["sql"]
+            for query in queries.captured_queries
+            if 'FROM "log_activitylog"' in query["sql"] and " OR " in query["sql"]
+        )
+        self.assertIn('"log_activitylog"."created_at" <= ', sql)
+
+    def test_tampered_cursor_is_rejected(self):
+        response = self.client.get(self.url, {"pagination": "cursor", "page_size": 5})
+        cursor = parse_qs(urlparse(response.data["next"]).query)["cursor"][0]
+        self.assertEqual(self.client.get(self.url, {"cursor": cursor}).status_code, 200)
+
+        response = self.client.get(self.url, {"cursor": cursor[:-2] + "xx"})
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["code"], "invalid_cursor")
+
+    def test_page_number_mode_is_default(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.data["count"], 25)
+        self.assertTrue(response.data["count_exact"])
+
+
+@override_settings(PAGINATION_EXACT_COUNT_THRESHOLD=5)
+class CountCacheTest(APITestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="count@test.com",
+            nickname="count",
+            password="test1234",
+            phone_number="9012",
+        )
+        self.client.force_authenticate(self.user)
+        ActivityLog.objects.bulk_create(
+            ActivityLog(user_id=self.user, action="LOGIN", ip_address="127.0.0.1")
+            for _ in range(8)
+        )
+        self.url = reverse("log:list-create")
+
+    @override_settings(PAGINATION_EXPIRING_COUNT_TTL=1)
+    def test_large_count_is_cached_until_ttl(self):
+        response = self.client.get(self.url, {"search": "LOGIN"})
+        self.assertEqual(response.data["count"], 8)
+        self.assertTrue(response.data["count_exact"])
+
+        # 로그는 추가될 때마다 무효화하지 않음 (Redis 호출 없음)
+        ActivityLog.objects.create(
+            user_id=self.user, action="LOGIN", ip_address="127.0.0.1"
+        )
+        self.assertIsNone(cache.get(get_count_version_key(ActivityLog)))
+        response = self.client.get(self.url, {"search": "LOGIN"})
+        self.assertEqual(response.data["count"], 8)
+
+        # TTL 이 지나면 다시 계산
+        time.sleep(1.1)
+        response = self.client.get(self.url, {"search": "LOGIN"})
+        self.assertEqual(response.data["count"], 9)
+
+    def test_small_count_is_not_cached(self):
+        response = self.client.get(self.url, {"search": "LOGOUT"})
+        self.assertEqual(response.data["count"], 0)
+        ActivityLog.objects.bulk_create(
+            [ActivityLog(user_id=self.user, action="LOGOUT", ip_address="127.0.0.1")]
+        )
+        response = self.client.get(self.url, {"search": "LOGOUT"})
+        self.assertEqual(response.data["count"], 1)
+        self.assertTrue(response.data["count_exact"])
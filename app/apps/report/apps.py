@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class ReportConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.report"
+
+    def ready(self):
+        from apps.report.models import Report
+        from apps.utils.pagination import track_counts
+
+        # 목록 개수 캐시 무효화
+        track_counts(Report)
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:34
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("report", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="report",
+            name="report_repo_created_be46cb_idx",
+        ),
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(
+                fields=["created_at", "id"], name="report_repo_created_0ebc28_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.2.18 on 2026-10-18 01:24
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("report", "0002_cursor_pagination_index"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="report",
+            index=models.Index(
+                fields=["user_id", "-created_at", "-id"],
+                name="report_repo_user_id_c6c99e_idx",
+            ),
+        ),
+    ]
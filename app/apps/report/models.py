@@ -57,7 +57,10 @@ class Report(models.Model):
             models.Index(fields=["user_id"]),
             models.Index(fields=["status"]),
             models.Index(fields=["type"]),
-            models.Index(fields=["created_at"]),
+            # 커서 페이지네이션 (created_at, id) 순서 조회
+            models.Index(fields=["created_at", "id"]),
+            # 사용자별 목록 커서 페이지네이션
+            models.Index(fields=["user_id", "-created_at", "-id"]),
         ]
 
     def __str__(self):
@@ -4,3 +4,10 @@ from django.apps import AppConfig
 class UserConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "apps.user"
+
+    def ready(self):
+        from apps.user.models import User
+        from apps.utils.pagination import track_counts
+
+        # 목록 개수 캐시 무효화
+        track_counts(User)
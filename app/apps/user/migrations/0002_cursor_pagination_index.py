@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 00:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("user", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="user",
+            index=models.Index(
+                fields=["created_at", "id"], name="user_user_created_effad8_idx"
+            ),
+        ),
+    ]
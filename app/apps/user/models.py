@@ -70,6 +70,8 @@ class User(AbstractBaseUser):
     class Meta:
         verbose_name = "유저"
         verbose_name_plural = f"{verbose_name} 목록"
+        # 커서 페이지네이션 (created_at, id) 순서 조회
+        indexes = [models.Index(fields=["created_at", "id"])]
 
     def get_full_name(self):
         return self.nickname
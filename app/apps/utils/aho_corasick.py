@@ -0,0 +1,67 @@
+from collections import deque
+
+
+class AhoCorasick:
+    """
+    여러 키워드를 한 번에 찾는 Aho-Corasick 오토마톤
+
+    생성 시 한 번만 트라이/실패 링크를 만들고, 검색은 텍스트 길이에 비례하는
+    단일 패스로 수행합니다. (키워드 개수와 무관)
+    """
+
+    def __init__(self, patterns):
+        self.patterns = tuple(dict.fromkeys(p for p in patterns if p))
+        # 노드별 전이 테이블 / 실패 링크 / 해당 노드에서 끝나는 키워드
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [()]
+
+        for pattern in self.patterns:
+            self._add(pattern)
+        self._build_links()
+
+    def _add(self, pattern):
+        node = 0
+        for char in pattern:
+            next_node = self._goto[node].get(char)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][char] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(())
+            node = next_node
+        self._output[node] = self._output[node] + (pattern,)
+
+    def _build_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self._goto[node].items():
+                queue.append(child)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[child] = self._goto[fail].get(char, 0)
+                # 실패 링크가 가리키는 노드의 키워드도 함께 매칭
+                self._output[child] = (
+                    self._output[child] + self._output[self._fail[child]]
+                )
+
+    def iter_matches(self, text):
+        """(끝 위치, 키워드) 를 등장 순서대로 반환"""
+        goto, fail, output = self._goto, self._fail, self._output
+        node = 0
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            for pattern in output[node]:
+                yield index, pattern
+
+    def search(self, text):
+        """첫 번째로 발견된 키워드 (없으면 None)"""
+        return next((pattern for _, pattern in self.iter_matches(text)), None)
+
+    def __len__(self):
+        return len(self.patterns)
@@ -0,0 +1,12 @@
+from django.db import close_old_connections, connection
+
+
+def close_stale_connections():
+    """
+    요청 사이클 밖에서 오래 실행되는 워커의 DB 연결 정리 (끊겼거나 CONN_MAX_AGE 가 지난 연결)
+
+    트랜잭션 안(atomic, 테스트의 TestCase 포함)에서는 연결을 닫으면 이후 쿼리가
+    모두 실패하므로 건너뜁니다.
+    """
+    if not connection.in_atomic_block:
+        close_old_connections()
@@ -0,0 +1,25 @@
+from django.core.cache import cache
+
+METRICS_PREFIX = "metrics"
+
+
+def get_metric_key(name):
+    return f"{METRICS_PREFIX}:{name}"
+
+
+def incr(name, amount=1):
+    """Redis 카운터 증가 (없으면 0에서 시작)"""
+    key = get_metric_key(name)
+    cache.add(key, 0, timeout=None)
+    try:
+        return cache.incr(key, amount)
+    except ValueError:
+        # add 직후 키가 만료/삭제된 경우
+        cache.set(key, amount, timeout=None)
+        return amount
+
+
+def get_counters(*names):
+    """여러 카운터 값을 한 번에 조회"""
+    values = cache.get_many([get_metric_key(name) for name in names])
+    return {name: int(values.get(get_metric_key(name), 0)) for name in names}
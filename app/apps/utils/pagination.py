@@ -1,7 +1,283 @@
+import hashlib
+
+from django.conf import settings
+from django.core import signing
+from django.core.cache import cache
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save
+from django.utils.dateparse import parse_datetime
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+CURSOR_SALT = "apps.utils.pagination.cursor"
+COUNT_KEY_PREFIX = "pagination:count"
+
+
+def get_count_version_key(model):
+    return f"{COUNT_KEY_PREFIX}:{model._meta.db_table}:version"
+
+
+def invalidate_counts(model, **kwargs):
+    """모델의 캐시된 개수 무효화 (테이블별 버전 증가)"""
+    key = get_count_version_key(model)
+    cache.add(key, 0, timeout=None)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, 1, timeout=None)
+
+
+def _invalidate(sender, **kwargs):
+    invalidate_counts(sender)
+
+
+def track_counts(*models):
+    """
+    저장/삭제 시 캐시된 개수를 무효화할 모델 등록 (각 앱 AppConfig.ready 에서 호출)
+
+    bulk_create / update() 는 시그널이 없으므로 호출한 쪽에서 invalidate_counts 호출
+    """
+    for model in models:
+        uid = f"count-invalidation:{model._meta.label}"
+        post_save.connect(_invalidate, sender=model, weak=False, dispatch_uid=uid)
+        post_delete.connect(_invalidate, sender=model, weak=False, dispatch_uid=uid)
+
+
+# 저장/삭제 때 무효화하지 않고 짧은 TTL 동안만 개수를 캐시하는 모델 (expire_counts)
+_expiring_counts = set()
+
+
+def expire_counts(*models):
+    """
+    개수 캐시를 무효화하지 않고 PAGINATION_EXPIRING_COUNT_TTL 초 동안만 쓸 모델 등록
+
+    추가만 계속되는 로그 테이블은 쓰기마다 무효화하면 캐시를 거의 쓰지 못하고
+    쓰기마다 Redis 호출만 늘어나므로, 짧은 TTL 동안의 오차를 허용합니다.
+    (각 앱 AppConfig.ready 에서 track_counts 대신 호출)
+    """
+    _expiring_counts.update(models)
+
+
+def get_count_cache_ttl(model):
+    if model in _expiring_counts:
+        return getattr(settings, "PAGINATION_EXPIRING_COUNT_TTL", 10)
+    return getattr(settings, "PAGINATION_COUNT_CACHE_TTL", 60)
+
+
+def get_estimated_count(queryset):
+    """PostgreSQL 통계의 테이블 행 수 추정치 (없으면 None)"""
+    connection = connections[queryset.db]
+    if connection.vendor != "postgresql":
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+            [queryset.model._meta.db_table],
+        )
+        row = cursor.fetchone()
+    # ANALYZE 전이면 -1
+    if not row or row[0] < 0:
+        return None
+    return int(row[0])
+
+
+def is_unfiltered(queryset, estimate_filters=None):
+    """조건이 없거나 estimate_filters 조건만 있는 조회인지"""
+    where = queryset.query.where
+    if not where:
+        return True
+    if not estimate_filters:
+        return False
+    default = queryset.model._default_manager.filter(**estimate_filters)
+    return where == default.query.where
+
+
+def get_count(queryset, estimate_filters=None):
+    """
+    목록 전체 개수 (개수, 정확한 값 여부)
+
+    - 기준(PAGINATION_EXACT_COUNT_THRESHOLD) 이하: LIMIT 을 건 COUNT 로 정확한 값
+    - 조건 없는 전체 조회(관리자): 기준을 넘으면 PostgreSQL 통계 추정치
+      (estimate_filters: 제외되는 행이 적어 이 조건만 있어도 추정치를 쓰는 기본 조건)
+    - 조건이 있는 조회: 정확한 COUNT 를 Redis 에 짧게 캐시
+      (track_counts 모델은 행 저장/삭제 시 무효화, expire_counts 모델은 TTL 만료까지 사용)
+    """
+    threshold = getattr(settings, "PAGINATION_EXACT_COUNT_THRESHOLD", 10000)
+    queryset = queryset.order_by()
+
+    if is_unfiltered(queryset, estimate_filters):
+        estimate = get_estimated_count(queryset)
+        if estimate is not None and estimate > threshold:
+            return estimate, False
+
+    count = queryset[: threshold + 1].count()
+    if count <= threshold:
+        return count, True
+
+    sql, params = queryset.query.sql_with_params()
+    digest = hashlib.sha256(f"{sql}{params!r}".encode("utf-8")).hexdigest()
+    version = cache.get(get_count_version_key(queryset.model), 0)
+    key = f"{COUNT_KEY_PREFIX}:{queryset.model._meta.db_table}:{version}:{digest}"
+    count = cache.get(key)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, timeout=get_count_cache_ttl(queryset.model))
+    return count, True
+
+
+class CountedPaginator(DjangoPaginator):
+    """count 를 get_count 전략으로 계산 (count_exact 로 정확한 값 여부 확인)"""
+
+    count_exact = True
+
+    def __init__(self, *args, estimate_filters=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.estimate_filters = estimate_filters
+
+    @cached_property
+    def count(self):
+        if not hasattr(self.object_list, "query"):
+            return super().count
+        count, self.count_exact = get_count(self.object_list, self.estimate_filters)
+        return count
 
 
 class Pagination(PageNumberPagination):
+    """
+    기본은 페이지 번호 방식, ?pagination=cursor 또는 ?cursor= 로 요청하면 커서 방식
+
+    페이지 번호 방식의 count 는 get_count 전략으로 계산합니다. (count_exact 포함)
+    뷰의 count_estimate_filters 는 get_count 의 estimate_filters 로 전달합니다.
+
+    커서 방식은 (created_at, id) 기준 최신순 keyset 조회라 OFFSET 과 COUNT(*) 없이
+    깊은 페이지도 같은 비용으로 조회합니다. 커서는 서명된 값이라 변조할 수 없습니다.
+    (커서 방식에서는 ?ordering 을 사용하지 않습니다)
+    """
+
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 50
+    estimate_filters = None
+
+    cursor_query_param = "cursor"
+    mode_query_param = "pagination"
+    cursor_ordering = ("created_at", "id")
+
+    def django_paginator_class(self, queryset, page_size):
+        return CountedPaginator(
+            queryset, page_size, estimate_filters=self.estimate_filters
+        )
+
+    def use_cursor(self, request):
+        return (
+            self.cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == "cursor"
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.use_cursor(request)
+        if not self.cursor_mode:
+            self.estimate_filters = getattr(view, "count_estimate_filters", None)
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+
+        field, tiebreaker = self.cursor_ordering
+        if reverse:
+            # 이전 페이지: 오래된 순으로 다음 행들을 읽은 뒤 뒤집음
+            queryset = queryset.order_by(field, tiebreaker)
+            if position:
+                queryset = queryset.filter(
+                    Q(**{f"{field}__gt": position[0]})
+                    | Q(**{field: position[0], f"{tiebreaker}__gt": position[1]}),
+                    **{f"{field}__gte": position[0]},
+                )
+        else:
+            queryset = queryset.order_by(f"-{field}", f"-{tiebreaker}")
+            if position:
+                # OR 조건은 인덱스 범위로 쓰이지 않으므로 created_at 범위를 함께 지정
+                queryset = queryset.filter(
+                    Q(**{f"{field}__lt": position[0]})
+                    | Q(**{field: position[0], f"{tiebreaker}__lt": position[1]}),
+                    **{f"{field}__lte": position[0]},
+                )
+
+        rows = list(queryset[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+
+        self.page_rows = rows
+        self.has_next = has_more if not reverse else bool(position)
+        self.has_previous = bool(position) if not reverse else has_more
+        return rows
+
+    def encode_cursor(self, row, reverse):
+        field, tiebreaker = self.cursor_ordering
+        return signing.dumps(
+            {
+                "p": [getattr(row, field).isoformat(), str(getattr(row, tiebreaker))],
+                "r": reverse,
+            },
+            salt=CURSOR_SALT,
+            compress=True,
+        )
+
+    def decode_cursor(self, request):
+        """(위치(created_at, id) | None, 이전 페이지 여부)"""
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+        try:
+            data = signing.loads(token, salt=CURSOR_SALT)
+            created_at, row_id = data["p"]
+            position = (parse_datetime(created_at), row_id)
+        except (signing.BadSignature, KeyError, TypeError, ValueError):
+            raise NotFound({"error": "잘못된 커서입니다.", "code": "invalid_cursor"})
+        if position[0] is None:
+            raise NotFound({"error": "잘못된 커서입니다.", "code": "invalid_cursor"})
+        return position, bool(data.get("r"))
+
+    def get_cursor_link(self, row, reverse):
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(row, reverse)
+        )
+
+    def get_next_link(self):
+        if not getattr(self, "cursor_mode", False):
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self.get_cursor_link(self.page_rows[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not getattr(self, "cursor_mode", False):
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self.get_cursor_link(self.page_rows[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        if not getattr(self, "cursor_mode", False):
+            response = super().get_paginated_response(data)
+            # count 가 통계 추정치면 false
+            response.data["count_exact"] = self.page.paginator.count_exact
+            return response
+        # 전체 개수(COUNT)는 계산하지 않음
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
@@ -264,3 +264,103 @@ swagger_settings = {
 
 # settings.py 에 추가해줘야 작동함
 SWAGGER_SETTINGS = swagger_settings
+
+# AI 응답 캐시 TTL (초, 0이면 캐시 사용 안 함)
+AI_RESPONSE_CACHE_TTL = {
+    "RECIPE": 60 * 60 * 6,
+    "HEALTH": 60 * 60,
+    "FOOD": 60 * 30,
+}
+AI_RESPONSE_CACHE_LOCK_TIMEOUT = 30  # 생성 중 락 유지 시간
+AI_RESPONSE_CACHE_WAIT_TIMEOUT = 15  # 다른 요청의 생성 결과를 기다리는 최대 시간
+
+# 프롬프트 인젝션 차단 키워드 추가 (기본 목록에 더해짐)
+AI_SECURITY_KEYWORDS = []
+# 한 줄에 하나씩 적은 키워드 파일 (수정하면 재배포 없이 반영)
+AI_SECURITY_KEYWORDS_FILE = os.getenv("AI_SECURITY_KEYWORDS_FILE")
+
+# 백그라운드 AI 작업 큐 (redis: run_ai_worker가 처리 / local: 요청 프로세스에서 즉시 실행)
+AI_JOB_BACKEND = os.getenv("AI_JOB_BACKEND", "redis")
+AI_JOB_QUEUE_MAX_ATTEMPTS = (
+    3  # 넘으면 dead 리스트로 이동하고 FAILED 처리 (--requeue-dead 로 재처리)
+)
+AI_JOB_QUEUE_RETRY_DELAY = 1  # 실패 후 대기 시간(초) x 재시도 횟수
+
+# 동일 프롬프트 동시 호출 합치기 (워커 간 Redis 락 + 결과 공유)
+AI_SINGLE_FLIGHT_ENABLED = True
+AI_SINGLE_FLIGHT_LOCK_TIMEOUT = 60  # leader 락 유지 시간
+AI_SINGLE_FLIGHT_WAIT_TIMEOUT = 30  # 대기 초과 시 직접 호출
+AI_SINGLE_FLIGHT_RESULT_TTL = 10  # 공유 결과 보관 시간
+
+# Gemini 호출 제한 시간/재시도/서킷 브레이커
+AI_CLIENT_REQUEST_BUDGET = 30  # 요청 1건의 전체 시간 예산 (재시도 포함, 초)
+AI_CLIENT_ATTEMPT_TIMEOUT = 20  # 시도 1회의 최대 시간 (스트리밍은 첫 청크까지)
+AI_CLIENT_STREAM_IDLE_TIMEOUT = 15  # 스트리밍 청크 사이 최대 대기 시간
+AI_CLIENT_STREAM_BUDGET = 120  # 스트리밍 호출 1회 전체 시간
+AI_CLIENT_MAX_RETRIES = 2
+AI_CLIENT_RETRY_BASE_DELAY = 0.5  # 지수 백오프 기준 (full jitter)
+AI_CLIENT_BREAKER_THRESHOLD = 5  # 연속 실패 횟수
+AI_CLIENT_BREAKER_RESET = 30  # 열린 상태 유지 시간
+# 응답이 최근 p95 지연보다 늦으면 같은 요청을 한 번 더 보냄 (토큰 사용량 증가)
+AI_CLIENT_HEDGE_ENABLED = os.getenv("AI_CLIENT_HEDGE_ENABLED", "false") == "true"
+AI_CLIENT_HEDGE_DELAY = 2.0  # 지연 표본이 적을 때 사용
+
+# Gemini 호출 사용량(토큰/지연) 일자별 집계 보관 기간
+AI_USAGE_RETENTION_DAYS = 35
+
+# LLM 백엔드 (gemini / stub: 유료 API 없이 부하 테스트하는 로컬 가짜 엔진 / 클래스 경로)
+AI_LLM_BACKEND = os.getenv("AI_LLM_BACKEND", "gemini")
+# stub 엔진 지연/청크/오류율 (기본값은 apps.ai.stub.DEFAULT_OPTIONS)
+AI_STUB_ENGINE = {
+    "LATENCY": {"distribution": "lognormal", "median_ms": 1200, "sigma": 0.4},
+    "FIRST_CHUNK": {"distribution": "lognormal", "median_ms": 400, "sigma": 0.3},
+    "CHUNK_SIZE": 24,
+    "CHUNK_INTERVAL_MS": 30,
+    "ERROR_RATE": float(os.getenv("AI_STUB_ERROR_RATE", "0")),
+}
+
+# Gemini 응답 녹화/재생 (AI_LLM_BACKEND=record: 녹화 / replay: 녹화본으로 응답)
+AI_RECORD_DIR = os.getenv("AI_RECORD_DIR", str(BASE_DIR / "var" / "ai_corpus"))
+AI_RECORD_TARGET = "gemini"  # 녹화할 실제 백엔드
+AI_REPLAY_SPEED = float(
+    os.getenv("AI_REPLAY_SPEED", "1")
+)  # 2 = 2배 빠르게, 0 = 지연 없이
+
+# 프롬프트 입력 예산 (초과 입력은 모델 호출 전에 400 응답, 목록 항목은 길이/개수 제한)
+AI_PROMPT_MAX_INPUT_TOKENS = 400  # 사용자 입력 예상 토큰 합계
+AI_PROMPT_MAX_LIST_ITEMS = 30  # 재료/알레르기/비선호 음식 개수
+AI_PROMPT_MAX_ITEM_CHARS = 30  # 목록 항목 1개 글자 수 (넘으면 잘라서 사용)
+
+# 배치 추천 (항목별 Gemini 호출을 스레드 풀에서 동시에 실행)
+AI_BATCH_MAX_ITEMS = 10
+AI_BATCH_WORKERS = 4
+
+# 음식 추천 응답 풀 (선택지 조합별로 미리 생성, warm_food_pool 커맨드로 갱신)
+AI_FOOD_POOL_ENABLED = True
+AI_FOOD_POOL_SIZE = 5  # 조합당 응답 수
+AI_FOOD_POOL_REFRESH = 60 * 60 * 12  # 이 시간이 지나면 워머가 다시 생성
+AI_FOOD_POOL_TTL = 60 * 60 * 48  # 갱신되지 않으면 풀 만료 (실시간 생성으로 대체)
+
+# 목록 전체 개수(count) 계산 (apps.utils.pagination.get_count)
+PAGINATION_EXACT_COUNT_THRESHOLD = 10000  # 이하면 매번 정확히 계산, 넘으면 추정치/캐시
+PAGINATION_COUNT_CACHE_TTL = 60  # 조건이 있는 목록 개수 캐시 시간(초)
+# 추가만 되는 로그 목록 개수 캐시 시간(초, 쓰기마다 무효화하지 않음)
+PAGINATION_EXPIRING_COUNT_TTL = 10
+
+# 스트리밍 결과 저장 대기열 (run_result_writer 커맨드가 저장, AI_JOB_BACKEND=local 이면 즉시 저장)
+AI_RESULT_QUEUE_MAX_ATTEMPTS = 5  # 넘으면 dead 리스트로 이동 (--requeue-dead 로 재처리)
+AI_RESULT_QUEUE_RETRY_DELAY = 1  # 저장 실패 후 대기 시간(초) x 재시도 횟수
+
+# 이어받기 가능한 스트리밍 (?resumable=true, 프레임을 Redis Stream 에 기록)
+AI_SSE_RESUME_TTL = 300  # 마지막 프레임 후 기록 보관 시간(초)
+AI_SSE_RESUME_WAIT = 30  # 이어받기 중 새 프레임을 기다리는 최대 시간(초)
+# 연결이 끊긴 생성을 이어받지 않으면 중단하기까지 기다리는 시간(초)
+AI_SSE_RESUME_GRACE = 10
+
+# SSE 전송 (빠르게 몰려오는 텍스트 청크 합치기 / 응답이 멈춘 동안 keep-alive 주석 프레임)
+AI_SSE_COALESCE_BYTES = 512  # 모은 텍스트가 이 크기(UTF-8 바이트)를 넘으면 전송
+AI_SSE_COALESCE_DELAY = 0.05  # 텍스트를 모으는 최대 시간(초)
+AI_SSE_HEARTBEAT = 15  # 보낸 프레임 없이 이 시간(초)이 지나면 heartbeat 전송
+# 클라이언트가 끊긴 뒤 업스트림 읽기 스레드가 끝나기를 기다리는 최대 시간(초)
+# (중단된 스트림의 사용량 기록이 결과 저장보다 먼저 끝나도록)
+AI_SSE_CLOSE_WAIT = 5